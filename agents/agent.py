@@ -10,6 +10,9 @@ from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.providers.openai import OpenAIProvider
 from services.process_text import _count_tokens
 from services.process_text import _batch_texts_by_tokens
+from services.llm_scheduler import get_llm_scheduler
+from services.llm_usage import get_usage_tracker
+from configs.config import get_settings
 from models.base import get_model
 
 # Add the parent directory to the Python path to allow imports from agent_output
@@ -22,6 +25,25 @@ from agents.schema.output import SummarizedContent
 
 model, model_settings = get_model()
 
+SUMMARIZER_SYSTEM_PROMPT = (
+    "You are a precise summarizer. Summarize the provided lines into a cohesive,"
+    " accurate markdown document while preserving key details, numbers, and entity names."
+)
+
+_summarizer_agent: Optional[Agent] = None
+
+def get_summarizer_agent() -> Agent:
+    """Get the shared summarizer agent, built on first use"""
+    global _summarizer_agent
+    if _summarizer_agent is None:
+        _summarizer_agent = Agent(
+            model=model,
+            system_prompt=SUMMARIZER_SYSTEM_PROMPT,
+            output_type=SummarizedContent,
+            model_settings=model_settings
+        )
+    return _summarizer_agent
+
 class Process_agent:
     def __init__(self, model = model):
         self.model = model
@@ -36,7 +58,9 @@ class Process_agent:
             return f"Error reading file: {str(e)}"
         
 
-    async def Summarize_agent(self, system_prompt: str)-> Agent:
+    async def Summarize_agent(self, system_prompt: str = SUMMARIZER_SYSTEM_PROMPT)-> Agent:
+        if system_prompt == SUMMARIZER_SYSTEM_PROMPT:
+            return get_summarizer_agent()
         agent = Agent(
             model=self.model,
             system_prompt= system_prompt,
@@ -59,20 +83,27 @@ class Process_agent:
 
         batches = _batch_texts_by_tokens(flattened_texts, max_tokens_per_batch, separator)
 
-        system_prompt = (
-            "You are a precise summarizer. Summarize the provided lines into a cohesive,"
-            " accurate markdown document while preserving key details, numbers, and entity names."
-        )
+        system_prompt = SUMMARIZER_SYSTEM_PROMPT
+        agent = get_summarizer_agent()
 
-        agent = await self.Summarize_agent(system_prompt=system_prompt)
+        scheduler = get_llm_scheduler()
+        output_estimate = get_settings().llm.output_token_estimate
 
         async def run_batch(batch: List[str]) -> str:
             user_input = separator.join(batch)
-            response = await agent.run(user_input)
+            estimated_tokens = _count_tokens(system_prompt) + _count_tokens(user_input) + output_estimate
+            response = await scheduler.run(lambda: agent.run(user_input), estimated_tokens=estimated_tokens)
+            get_usage_tracker().record("summarizer", response.usage())
             return response.output.content if hasattr(response.output, 'content') else str(response.output)
 
-        # Run all batches concurrently; gather preserves order
-        batch_markdowns = await asyncio.gather(*[run_batch(batch) for batch in batches])
+        # Batches share the process-wide LLM budget; a failed batch cancels its siblings
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(run_batch(batch)) for batch in batches]
+        except ExceptionGroup as e:
+            # Surface the batch's own error rather than "unhandled errors in a TaskGroup"
+            raise e.exceptions[0] from e
+        batch_markdowns = [task.result() for task in tasks]
 
         final_markdown = "\n\n".join(batch_markdowns)
 
@@ -1,110 +1,29 @@
 from pydantic_ai import Agent, RunContext
 from pydantic import Field, BaseModel
-from pydantic_ai.usage import Usage
 from pydantic_ai.models.openai import OpenAIModel
 from dataclasses import dataclass
-from typing import List
+from typing import Awaitable, Callable, Dict, List, Optional
 from datetime import datetime
-import os, json
+import os, json, time, asyncio
 from pathlib import Path
 from models.base import get_model
+from models.scheduled import ScheduledModel
 
-from agents.tools.webcrawl_tool import fetch_site, SiteDoc
-from agents.tools.search_tool import search_web, SearchResultItem, SearchResults
+from agents.tools.webcrawl_tool import SiteDoc, get_page_compactor
+from agents.tools.crawler import get_crawler
+from agents.tools.evidence_index import EvidenceResults, get_evidence_index
+from agents.tools.search_tool import search_web_async, SearchResultItem, SearchResults
 from agents.schema.output import FinalAgentOutput
+from services.llm_usage import get_usage_tracker
+from services.latency import get_latency_tracker
+from configs.config import get_settings
 
 model, model_settings = get_model()
 
 
-class Claim_radar_Deps(BaseModel):
-    resources: List[str] = Field(..., description="User-trusted resource URLs for fact-checking")
-
-
-class Claimradar_agent:
-    def __init__(self, model=model, m=model_settings):
-        self.model = model
-        self.m = m
-
-    def _read_markdown_file(self, file_path: str) -> str:
-        """Read markdown file safely."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        except Exception as e:
-            raise RuntimeError(f"Error reading file: {e}")
-
-    async def _create_context(self, resources: List[str]) -> RunContext:
-        """Create RunContext automatically (model + usage + deps)."""
-        ctx = RunContext(
-            model=self.model,
-            deps=Claim_radar_Deps(resources=resources),
-            usage=Usage()
-        )
-        return ctx
-
-    async def _create_agent(self, system_prompt: str) -> Agent:
-        """Internal method to define the agent + tools."""
-        agent = Agent(
-            model=self.model,
-            system_prompt=system_prompt,
-            deps_type=Claim_radar_Deps,
-            output_type=FinalAgentOutput,
-            model_settings=self.m
-        )
-
-        # Tool: fetch a site
-        @agent.tool
-        def fetch_site_tool(ctx: RunContext,url: str) -> SiteDoc:
-            """Crawl and return a site's markdown."""
-            return fetch_site(url)
-
-        # Tool: search the web
-        @agent.tool
-        def search_tool(ctx: RunContext, query: str, limit: int = 5) -> SearchResults:
-            """Perform web search and return structured results."""
-            try:
-                raw = search_web(query, limit=limit)
-                items = [
-                    SearchResultItem(
-                        url=r["url"],
-                        title=r.get("title"),
-                        snippet=r.get("snippet")
-                    ) for r in raw
-                ]
-                return SearchResults(query=query, results=items)
-            except Exception as e:
-                raise RuntimeError(f"search_tool failed: {e}")
-
-        return agent
-
-    async def claim_verifier(self, resources: List[str], sensitivity: int, input_id: str, md_path: str, raw_texts: List[str] = None):
-        """Main entrypoint — handles verification, caching, and context creation internally."""
-        from services.neo4j_service import neo4j_service, VerificationResult
-
-        # Step 1: Read input markdown
-        markdown_content = self._read_markdown_file(md_path)
-
-        # Step 2: Cache check
-        text_hash = neo4j_service.calculate_text_hash(markdown_content)
-        cached_result = neo4j_service.get_verification_by_hash(text_hash)
-        if cached_result:
-            print(f"🎯 Found cached match for {input_id}")
-            return cached_result
-
-        # Step 3: Keyword-based similarity cache
-        keywords = neo4j_service.extract_keywords(markdown_content)
-        similar_results = neo4j_service.find_similar_verifications(keywords, threshold=0.7)
-        if similar_results:
-            print(f"🎯 Found similar verification for {input_id}")
-            return similar_results[0]
-
-        print(f"🔄 No cache found — running agent for {input_id}")
-
-        # Step 4: Create context (automatically handles model + deps)
-        ctx = await self._create_context(resources)
-
-        # Step 5: Create agent
-        system_prompt = """
+# Static prompt text comes first and never varies between requests, so the
+# provider's prompt-prefix cache can reuse it; per-request content goes last.
+VERIFIER_SYSTEM_PROMPT = """
 You are a specialized fact-checker and misinformation detection agent focused exclusively on global crises domains. Your role is to verify the accuracy of information related to pandemics, geopolitical conflicts, and climate events by conducting comprehensive research using web search and site crawling tools.
 ## Domain Scope:
 You ONLY fact-check content related to these three critical domains:
@@ -114,6 +33,22 @@ You ONLY fact-check content related to these three critical domains:
 
 ## Tool Usage Instructions:
 
+### 0. Local Evidence Search Usage:
+- **Function**: `local_evidence_search(query: str, limit: int = 5)`
+- **Parameters**:
+  - `query`: Search string with relevant keywords for the claim you're verifying
+  - `limit`: Maximum number of passages to return (default: 5)
+- **Returns**: `EvidenceResults` object containing:
+  - `query`: The search query used
+  - `results`: List of `EvidenceHit` objects with:
+    - `url`: URL of the page the passage comes from
+    - `title`: Page title
+    - `text`: The matching passage from the page
+    - `score`: Relevance score (higher is more relevant)
+    - `fetched_at`: When the page was crawled
+    - `age_seconds`: How old the crawl is
+- **Notes**: Searches pages crawled earlier, answers in milliseconds and never touches the network. Use it before `search_tool` and `fetch_site_tool`; fall back to them when the local passages are missing, off-topic, or too old for the claim.
+
 ### 1. Search Tool Usage:
 - **Function**: `search_tool(query: str, limit: int = 5)`
 - **Parameters**:
@@ -131,13 +66,15 @@ You ONLY fact-check content related to these three critical domains:
   - `search_tool("climate change temperature rise IPCC", 6)`
 
 ### 2. Fetch Site Tool Usage:
-- **Function**: `fetch_site_tool(url: str)`
+- **Function**: `fetch_site_tool(url: str, query: str = "", token_budget: int = None)`
 - **Parameters**:
   - `url`: Complete URL of the webpage to crawl and analyze
+  - `query`: The claim or keywords you are checking; the page is cut down to the sections most relevant to it
+  - `token_budget`: Maximum tokens of page content to return (default is set by the server; 0 returns the whole page)
 - **Returns**: `SiteDoc` object containing:
   - `source_url`: The URL that was crawled
   - `title`: Page title
-  - `markdown`: Full content in markdown format
+  - `markdown`: The most relevant sections of the page in markdown format, in page order, separated by `[...]`
   - `fetched_at`: Timestamp of when content was fetched
   - `metadata`: Additional page metadata
 - **Usage Examples**:
@@ -163,6 +100,7 @@ You ONLY fact-check content related to these three critical domains:
    - Return: `sources: []`
 
 3. **In-Domain Verification**: If content IS related to the defined Domains:
+   - **Step 0**: Use `local_evidence_search` for each claim; if it returns relevant, recent passages, cite their URLs and skip the web for that claim
    - **Step 1**: Use `search_tool` with domain-specific keywords to find relevant sources
    - **Step 2**: Use `fetch_site_tool` to crawl the most relevant URLs from search results
    - **Step 3**: Prioritize crawling URLs from `ctx.deps.resources` using `fetch_site_tool`
@@ -172,7 +110,7 @@ You ONLY fact-check content related to these three critical domains:
 
 ## Data Collection and Analysis:
 - **From Search Results**: Extract URLs, titles, and snippets for initial assessment
-- **From Crawled Content**: Analyze full markdown content for detailed verification
+- **From Crawled Content**: Analyze the returned markdown sections for detailed verification; pass the claim as `query` so the relevant sections are kept
 - **From User-Trusted Sources**: Give higher weight to information from `ctx.deps.resources`
 - **Cross-Reference**: Compare findings across multiple sources to establish accuracy
 
@@ -212,12 +150,12 @@ For domain-relevant content, provide a structured response with:
 - Always cite your sources with specific URLs
 - Be objective and evidence-based in your assessments
 - If multiple sources contradict each other, note this in your analysis
-"""  
+"""
 
-        agent = await self._create_agent(system_prompt)
+# Floor for each group's share of the evidence budget when passages fan out
+MIN_GROUP_EVIDENCE_TOKENS = 500
 
-        # Step 6: Run agent
-        user_input = f"""TASK: Analyze each numbered passage below and classify them by index.
+VERIFIER_TASK_INSTRUCTIONS = """TASK: Analyze each numbered passage at the end of this message and classify them by index.
 
 REQUIRED OUTPUT FORMAT:
 - rightinfo_indices: List of 0-based indices of factually correct passages
@@ -233,28 +171,311 @@ Then output should be:
 - rightinfo_indices: [0, 2]
 - misinfo_indices: [1]
 
-NUMBERED PASSAGES TO ANALYZE:
-{markdown_content}
-
 MANDATORY RULES:
 1. Use 0-based indexing (first passage = 0, second = 1, etc.)
 2. Classify EVERY passage as either correct or misinformation
 3. Do NOT leave index lists empty
 4. All passages are within global crises domains (pandemics, geopolitical conflicts, climate events)
-5. Use search and fetch tools to verify each claim before categorizing"""
+5. Verify each claim before categorizing: try local_evidence_search first, then the search and fetch tools
+"""
+
+
+class Claim_radar_Deps(BaseModel):
+    resources: List[str] = Field(..., description="User-trusted resource URLs for fact-checking")
+    evidence: List[SiteDoc] = Field(default_factory=list, description="User-trusted resources already crawled before the run")
+
+
+def _build_verifier_agent() -> Agent:
+    """Define the verifier agent + tools; per-request state only travels through deps."""
+    agent = Agent(
+        # Each model request of a run shares the process-wide LLM budget with the summarizer and other requests
+        model=ScheduledModel(model),
+        system_prompt=VERIFIER_SYSTEM_PROMPT,
+        deps_type=Claim_radar_Deps,
+        output_type=FinalAgentOutput,
+        model_settings=model_settings
+    )
+
+    # Tool: fetch a site
+    @agent.tool
+    async def fetch_site_tool(ctx: RunContext, url: str, query: str = "", token_budget: Optional[int] = None) -> SiteDoc:
+        """Crawl a site and return the parts of its markdown most relevant to query, within token_budget."""
+        doc = await get_crawler().fetch(url)
+        return await asyncio.to_thread(get_page_compactor().compact, doc, query, token_budget)
+
+    # Tool: search pages crawled earlier, without network calls
+    @agent.tool
+    async def local_evidence_search(ctx: RunContext, query: str, limit: int = 5) -> EvidenceResults:
+        """Search previously crawled pages for passages relevant to a claim."""
+        if not get_settings().evidence.enabled:
+            return EvidenceResults(query=query, results=[])
+        hits = await asyncio.to_thread(get_evidence_index().search, query, limit)
+        return EvidenceResults(query=query, results=hits)
+
+    # Tool: search the web
+    @agent.tool
+    async def search_tool(ctx: RunContext, query: str, limit: int = 5) -> SearchResults:
+        """Perform web search and return structured results."""
+        try:
+            raw = await search_web_async(query, limit=limit)
+            items = [
+                SearchResultItem(
+                    url=r["url"],
+                    title=r.get("title"),
+                    snippet=r.get("snippet")
+                ) for r in raw
+            ]
+            return SearchResults(query=query, results=items)
+        except Exception as e:
+            raise RuntimeError(f"search_tool failed: {e}")
+
+    return agent
+
+
+_verifier_agent: Optional[Agent] = None
+
+def get_verifier_agent() -> Agent:
+    """Get the shared verifier agent, built on first use; Agent runs are safe to share"""
+    global _verifier_agent
+    if _verifier_agent is None:
+        _verifier_agent = _build_verifier_agent()
+    return _verifier_agent
+
+
+class Claimradar_agent:
+    def __init__(self, model=model, m=model_settings):
+        self.model = model
+        self.m = m
+
+    def _read_markdown_file(self, file_path: str) -> str:
+        """Read markdown file safely."""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+        except Exception as e:
+            raise RuntimeError(f"Error reading file: {e}")
+
+    def _format_evidence(self, docs: List[SiteDoc], query: str = "", token_budget: Optional[int] = None) -> str:
+        """Render prefetched resources for the prompt, compacted to what is relevant to query, skipping failed crawls."""
+        sections = []
+        compactor = get_page_compactor()
+        for doc in docs:
+            if not doc.markdown or (doc.metadata or {}).get("error"):
+                continue
+            body = compactor.compact(doc, query, token_budget).markdown
+            sections.append(f"### {doc.title or doc.source_url}\nSource: {doc.source_url}\n{body}")
+        return "\n\n".join(sections)
+
+    def _passage_groups(self, passages: Dict[int, str]) -> List[Dict[int, str]]:
+        """Split passages into contiguous groups for concurrent verification."""
+        verifier_settings = get_settings().verifier
+        if not verifier_settings.fanout_enabled or len(passages) < verifier_settings.fanout_min_passages:
+            return [passages]
+        items = list(passages.items())
+        size = max(1, verifier_settings.fanout_group_size)
+        return [dict(items[start:start + size]) for start in range(0, len(items), size)]
+
+    async def _verify_group(self, agent: Agent, group: Dict[int, str], deps: Claim_radar_Deps,
+                            request_context: str, evidence_text: str, events: Optional[Callable[[str, Dict], None]],
+                            duplicates: Dict[int, List[int]]) -> FinalAgentOutput:
+        """Run the agent on one group of distinct passages, numbered locally from 0, and return global indices.
+
+        duplicates maps a passage's index to the later indices holding the same passage; they share its verdict.
+        """
+        from services.async_neo4j_service import get_async_neo4j_service
+        from services.passage_verdicts import expand_indices, passage_hash, verdicts_from_output
+
+        local_to_global = list(group)
+        numbered_passages = "\n".join(
+            f"{local}. {group[index].strip()}" for local, index in enumerate(local_to_global)
+        )
+        user_input = f"""{VERIFIER_TASK_INSTRUCTIONS}{request_context}{f'''
+EVIDENCE ALREADY FETCHED FROM USER-TRUSTED RESOURCES (do not fetch these URLs again):
+{evidence_text}
+''' if evidence_text else ''}
+NUMBERED PASSAGES TO ANALYZE:
+{numbered_passages}"""
+
+        # Crawls still running when the agent finishes are cancelled
+        async with get_crawler().scope():
+            response = await agent.run(user_input, deps=deps)
+        get_usage_tracker().record("verifier", response.usage())
+        agent_output = response.output
+        # Map the agent's local indices back to positions in the full input
+        agent_output = agent_output.model_copy(update={
+            'misinfo_indices': [local_to_global[i] for i in agent_output.misinfo_indices if 0 <= i < len(local_to_global)],
+            'rightinfo_indices': [local_to_global[i] for i in agent_output.rightinfo_indices if 0 <= i < len(local_to_global)]
+        })
+
+        new_verdicts = verdicts_from_output(agent_output, group)
+        # group holds distinct passages, so each hash names exactly one index
+        index_by_hash = {passage_hash(text): index for index, text in group.items()}
+        for verdict in new_verdicts:
+            index = index_by_hash[verdict.passage_hash]
+            for position in [index] + duplicates.get(index, []):
+                self._emit(events, "passage", self._passage_event(position, verdict, cached=False))
+        await get_async_neo4j_service().store_passage_verdicts(new_verdicts)
+
+        return agent_output.model_copy(update={
+            'misinfo_indices': expand_indices(agent_output.misinfo_indices, duplicates),
+            'rightinfo_indices': expand_indices(agent_output.rightinfo_indices, duplicates)
+        })
+
+    def _emit(self, events: Optional[Callable[[str, Dict], None]], event: str, data: Dict):
+        """Report progress to a streaming caller, if there is one."""
+        if events is not None:
+            events(event, data)
+
+    def _passage_event(self, index: int, verdict, cached: bool) -> Dict:
+        return {
+            "index": index,
+            "text": verdict.text,
+            "is_misinfo": verdict.is_misinfo,
+            "out_of_domain": verdict.out_of_domain,
+            "confidence_score": verdict.confidence_score,
+            "sources": verdict.sources,
+            "cached": cached
+        }
+
+    async def _await_leads(self, preliminary_search: Optional[Awaitable[List[Dict]]]) -> List[Dict]:
+        """Result of the speculative search, or nothing if it is absent or failed."""
+        if preliminary_search is None:
+            return []
+        try:
+            return await preliminary_search
+        except Exception as e:
+            print(f"⚠️ Speculative search failed: {e}")
+            return []
+
+    async def _await_similarity_probe(self, similarity_probe: Awaitable[List]) -> List:
+        """Result of the pipeline's similarity probe, or no match if it failed."""
+        try:
+            return await similarity_probe
+        except Exception as e:
+            print(f"⚠️ Similarity probe failed: {e}")
+            return []
+
+    async def claim_verifier(self, resources: List[str], sensitivity: int, input_id: str, md_path: str, passages: List[str] = None, input_hash: str = None,
+                             prefetched_resources: Optional[Awaitable[List[SiteDoc]]] = None,
+                             preliminary_search: Optional[Awaitable[List[Dict]]] = None,
+                             keywords: Optional[List[str]] = None,
+                             similarity_probe: Optional[Awaitable[List]] = None,
+                             events: Optional[Callable[[str, Dict], None]] = None):
+        """Main entrypoint — handles verification, caching, and context creation internally.
+
+        passages are the cleaned input texts; verdict indices refer to positions in this list.
+        keywords and similarity_probe are the pipeline's keywords of those passages and its similarity
+        lookup on them, reused instead of repeated.
+        """
+        from services.neo4j_queries import VerificationResult
+        from services.async_neo4j_service import get_async_neo4j_service
+        from services.passage_verdicts import (
+            passage_hash, distinct_passages, merge_outputs, output_from_verdicts
+        )
+        neo4j_service = get_async_neo4j_service()
+
+        # Step 1: Read input markdown
+        markdown_content = self._read_markdown_file(md_path)
+
+        # Step 2: Cache check
+        text_hash = neo4j_service.calculate_text_hash(markdown_content)
+        cached_result = await neo4j_service.get_verification_by_hash(text_hash)
+        if cached_result:
+            print(f"🎯 Found cached match for {input_id}")
+            neo4j_service.remember_input_hash(input_hash, cached_result)
+            self._emit(events, "cache_hit", {"level": "summary"})
+            return cached_result
+
+        # Step 3: Keyword-based similarity cache
+        # Keywords come from the cleaned input, the same text the pipeline's raw-input probe uses,
+        # so stored verifications and probes are compared like for like
+        if keywords is None:
+            keywords = neo4j_service.extract_keywords("\n".join(passages) if passages else markdown_content)
+        if similarity_probe is not None:
+            similar_results = await self._await_similarity_probe(similarity_probe)
+        else:
+            similar_results = await neo4j_service.find_similar_verifications(keywords, threshold=0.7)
+        if similar_results:
+            print(f"🎯 Found similar verification for {input_id}")
+            neo4j_service.remember_input_hash(input_hash, similar_results[0])
+            self._emit(events, "cache_hit", {"level": "similarity"})
+            return similar_results[0]
+
+        # Step 4: Passage-level cache — only unseen passages reach the agent
+        if not passages:
+            # Fallback to splitting markdown if no passages were provided
+            passages = markdown_content.split('\n')
+        passage_hashes = [passage_hash(passage) for passage in passages]
+        known_verdicts = await neo4j_service.get_passage_verdicts(passage_hashes)
+        cached_verdicts = {
+            i: known_verdicts[h] for i, h in enumerate(passage_hashes) if h in known_verdicts
+        }
+        # Repeated passages are verified once; later copies share the first copy's verdict
+        unseen_passages, duplicates = distinct_passages(passages, skip=cached_verdicts)
+        if unseen_passages:
+            print(f"🔄 {len(unseen_passages)}/{len(passages)} passages not cached — running agent for {input_id}")
+        else:
+            print(f"🎯 All passages served from passage cache for {input_id}")
+        for index, verdict in cached_verdicts.items():
+            self._emit(events, "passage", self._passage_event(index, verdict, cached=True))
+
+        # Step 5: Create context (automatically handles model + deps)
+        # Resources crawled while the summary was being written go in as ready evidence
+        evidence_docs = await prefetched_resources if (prefetched_resources and unseen_passages) else []
+        deps = Claim_radar_Deps(resources=resources, evidence=evidence_docs)
+        leads = await self._await_leads(preliminary_search) if unseen_passages else []
+        leads_text = "\n".join(f"- {r.get('title') or r['url']}: {r['url']}\n  {r.get('snippet') or ''}" for r in leads)
+
+        # Step 6: Shared agent, built once per process
+        agent = get_verifier_agent()
+
+        # Shared by every passage group, so it sits first in each prompt; evidence is compacted per group
+        request_context = f"""
+SUMMARY OF THE FULL INPUT (context only; classify the numbered passages):
+{markdown_content.strip()}
+{f'''
+PRELIMINARY SEARCH RESULTS (leads only; verify before relying on them):
+{leads_text}
+''' if leads_text else ''}"""
 
         try:
-            response = await agent.run(user_input)
-            response_data = response.output
-
-            # Step 7: Store in Neo4j
-            # Filter passages based on agent's classification
-            if raw_texts is None:
-                # Fallback to splitting markdown if raw_texts not provided
-                passages = markdown_content.split('\n')
-            else:
-                passages = raw_texts
-                
+            parts, weights = [], []
+            if cached_verdicts:
+                parts.append(output_from_verdicts(cached_verdicts))
+                weights.append(len(cached_verdicts))
+
+            if unseen_passages:
+                # Step 7: Verify unseen passages, in concurrent groups when there are enough of them
+                groups = self._passage_groups(unseen_passages)
+                semaphore = asyncio.Semaphore(get_settings().verifier.fanout_concurrency)
+                # Groups split the evidence budget, so fanning out does not multiply evidence tokens
+                evidence_budget = get_page_compactor().token_budget
+                if evidence_budget > 0:
+                    evidence_budget = max(evidence_budget // len(groups), MIN_GROUP_EVIDENCE_TOKENS)
+
+                async def run_group(group: Dict[int, str]) -> FinalAgentOutput:
+                    async with semaphore:
+                        evidence_text = await asyncio.to_thread(
+                            self._format_evidence, evidence_docs, " ".join(group.values()), evidence_budget
+                        )
+                        return await self._verify_group(
+                            agent, group, deps, request_context, evidence_text, events, duplicates
+                        )
+
+                started = time.perf_counter()
+                async with asyncio.TaskGroup() as task_group:
+                    tasks = [task_group.create_task(run_group(group)) for group in groups]
+                get_latency_tracker().record("verifier", time.perf_counter() - started)
+
+                for group, task in zip(groups, tasks):
+                    parts.append(task.result())
+                    weights.append(len(group) + sum(len(duplicates.get(index, [])) for index in group))
+
+            # Correct only if every part is; confidence is the passage-weighted mean
+            response_data = parts[0] if len(parts) == 1 else merge_outputs(parts, weights)
+
+            # Step 8: Store in Neo4j
+            # Filter passages based on the merged classification
             misinfo_passages = [passages[i] for i in response_data.misinfo_indices if i < len(passages)]
             rightinfo_passages = [passages[i] for i in response_data.rightinfo_indices if i < len(passages)]
             
@@ -268,11 +489,12 @@ MANDATORY RULES:
                 confidence_score=response_data.confidence_score,
                 sources=response_data.sources,
                 created_at=datetime.now(),
-                raw_text_hash=text_hash
+                raw_text_hash=text_hash,
+                input_hash=input_hash
             )
-            neo4j_service.store_verification(verification_result)
+            await neo4j_service.store_verification(verification_result)
 
-            # Step 8: Save JSON response with filtered passages
+            # Step 9: Save JSON response with filtered passages
             responses_dir = Path(__file__).parent.parent / "responses"
             responses_dir.mkdir(parents=True, exist_ok=True)
             output_path = responses_dir / f"{input_id}_verification.json"
@@ -296,4 +518,6 @@ MANDATORY RULES:
             return response_data
 
         except Exception as e:
-            raise RuntimeError(f"Agent verification failed: {e}")
+            # A failed passage group arrives wrapped in the TaskGroup's ExceptionGroup; report its own error
+            cause = e.exceptions[0] if isinstance(e, ExceptionGroup) else e
+            raise RuntimeError(f"Agent verification failed: {cause}") from cause
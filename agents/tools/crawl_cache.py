@@ -0,0 +1,163 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that never change page content
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL so equivalent links share one cache entry"""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and str(parts.port) != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def domain_ttl(url: str, default_ttl: float, domain_ttls: Dict[str, float]) -> float:
+    """TTL of the most specific domain in domain_ttls that url's host belongs to, else default_ttl"""
+    host = (urlsplit(url).hostname or "").lower()
+    best_match, ttl = "", default_ttl
+    for domain, domain_ttl_seconds in domain_ttls.items():
+        if (host == domain or host.endswith("." + domain)) and len(domain) > len(best_match):
+            best_match, ttl = domain, domain_ttl_seconds
+    return ttl
+
+
+class CrawlCache:
+    """On-disk, gzip-compressed crawl cache keyed by the hash of the normalized URL.
+
+    Entries expire per domain (suffix match on the host, e.g. "who.int") and the
+    directory is kept under max_bytes by evicting the least recently used files.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 512 * 1024 * 1024,
+                 default_ttl: float = 24 * 3600, domain_ttls: Optional[Dict[str, float]] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.domain_ttls = {domain.lower(): float(ttl) for domain, ttl in (domain_ttls or {}).items()}
+        self._lock = threading.Lock()
+        self._total_bytes = sum(path.stat().st_size for path in self.directory.glob("*.json.gz"))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, normalized_url: str) -> Path:
+        digest = hashlib.sha256(normalized_url.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json.gz"
+
+    def ttl_for(self, normalized_url: str) -> float:
+        return domain_ttl(normalized_url, self.default_ttl, self.domain_ttls)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached document for url if present and fresh"""
+        normalized_url = normalize_url(url)
+        path = self._path(normalized_url)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if entry.get("url") != normalized_url or time.time() - entry["stored_at"] > self.ttl_for(normalized_url):
+            self.misses += 1
+            return None
+
+        # Touch the file so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["doc"]
+
+    def set(self, url: str, doc: Dict[str, Any]):
+        """Store a fetched document, evicting old entries if over the size budget"""
+        normalized_url = normalize_url(url)
+        path = self._path(normalized_url)
+        payload = gzip.compress(json.dumps({
+            "url": normalized_url,
+            "stored_at": time.time(),
+            "doc": doc
+        }).encode("utf-8"))
+
+        with self._lock:
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+            self._total_bytes += len(payload) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def entries(self) -> Iterator[Tuple[str, float, Dict[str, Any]]]:
+        """Yield (url, stored_at, doc) for fresh entries, most recently used first"""
+        paths = []
+        for path in self.directory.glob("*.json.gz"):
+            try:
+                paths.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        now = time.time()
+        for _, path in sorted(paths, reverse=True):
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if now - entry["stored_at"] <= self.ttl_for(entry["url"]):
+                yield entry["url"], entry["stored_at"], entry["doc"]
+
+    def _evict(self):
+        """Drop least recently used entries until 90% of the budget is free"""
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for path in self.directory.glob("*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,204 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+from configs.config import get_settings
+from agents.tools.crawl_cache import normalize_url
+from agents.tools.evidence_index import get_evidence_index
+from agents.tools.webcrawl_tool import (
+    SiteDoc,
+    get_crawl_cache,
+    _get_firecrawl_client,
+    _get_async_firecrawl_client,
+    site_doc_from_result,
+    error_site_doc,
+)
+
+# Fetch tasks started inside the current AsyncCrawler.scope(), if any
+_crawl_scope: ContextVar[Optional[Set[asyncio.Task]]] = ContextVar("crawl_scope", default=None)
+
+
+class AsyncCrawler:
+    """Async front end for Firecrawl with bounded concurrency.
+
+    At most max_concurrency scrapes run at once and at most max_per_host
+    against a single host. Every fetch has a hard deadline and returns an
+    error SiteDoc instead of hanging; fetches started inside scope() are
+    cancelled when the scope exits.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_per_host: int = 2,
+                 url_timeout: float = 30.0, batch_timeout: float = 90.0):
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.url_timeout = url_timeout
+        self.batch_timeout = batch_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.timeouts = 0
+        self.cancelled = 0
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(normalize_url(url)).hostname or ""
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    async def _scrape(self, url: str) -> Any:
+        client = _get_async_firecrawl_client()
+        if client is not None:
+            return await client.scrape(url, formats=["markdown"])
+        # Older SDKs only ship a blocking client; the thread finishes on its own after a timeout
+        return await asyncio.to_thread(_get_firecrawl_client().scrape, url, formats=["markdown"])
+
+    async def _index(self, site_doc: SiteDoc):
+        """Add a crawled page to the local evidence index; a no-op for pages already indexed"""
+        if get_settings().evidence.enabled:
+            await asyncio.to_thread(get_evidence_index().add, site_doc)
+
+    async def _fetch(self, url: str, timeout: float) -> SiteDoc:
+        cache = get_crawl_cache()
+        cached = await asyncio.to_thread(cache.get, url)
+        if cached:
+            site_doc = SiteDoc.model_validate(cached)
+            await self._index(site_doc)
+            return site_doc
+
+        try:
+            # The deadline covers queueing for a slot as well as the scrape itself
+            async with asyncio.timeout(timeout):
+                async with self._semaphore, self._host_semaphore(url):
+                    res = await self._scrape(url)
+        except TimeoutError:
+            self.timeouts += 1
+            print(f"⚠️ Crawl of {url} timed out after {timeout:g}s")
+            return error_site_doc(url, f"timed out after {timeout:g}s")
+        except Exception as e:
+            return error_site_doc(url, e)
+
+        site_doc = site_doc_from_result(res, url)
+        await asyncio.to_thread(cache.set, url, site_doc.model_dump())
+        await self._index(site_doc)
+        return site_doc
+
+    async def _run_scoped(self, coro) -> Any:
+        """Run coro as a task owned by the current scope so it can be cancelled with it"""
+        tasks = _crawl_scope.get()
+        if tasks is None:
+            return await coro
+        task = asyncio.ensure_future(coro)
+        tasks.add(task)
+        try:
+            return await task
+        finally:
+            tasks.discard(task)
+
+    async def fetch(self, url: str, timeout: Optional[float] = None) -> SiteDoc:
+        """Fetch one URL as markdown, from the crawl cache when possible"""
+        return await self._run_scoped(self._fetch(url, timeout or self.url_timeout))
+
+    async def fetch_many(self, urls: List[str], timeout: Optional[float] = None) -> List[SiteDoc]:
+        """Fetch several URLs, using Firecrawl batch scrape for the uncached ones when available.
+
+        Results keep the order of urls; duplicates (after normalization) are fetched once.
+        """
+        return await self._run_scoped(self._fetch_many(urls, timeout or self.batch_timeout))
+
+    async def _fetch_many(self, urls: List[str], timeout: float) -> List[SiteDoc]:
+        cache = get_crawl_cache()
+        unique: Dict[str, str] = {}
+        for url in urls:
+            unique.setdefault(normalize_url(url), url)
+
+        docs: Dict[str, SiteDoc] = {}
+        for key, url in unique.items():
+            cached = await asyncio.to_thread(cache.get, url)
+            if cached:
+                docs[key] = SiteDoc.model_validate(cached)
+                await self._index(docs[key])
+        missing = {key: url for key, url in unique.items() if key not in docs}
+
+        client = _get_async_firecrawl_client()
+        if len(missing) > 1 and client is not None and hasattr(client, "batch_scrape"):
+            try:
+                async with asyncio.timeout(timeout):
+                    async with self._semaphore:
+                        job = await client.batch_scrape(list(missing.values()), formats=["markdown"])
+                for res in self._batch_documents(job):
+                    source = self._source_url(res)
+                    key = normalize_url(source) if source else None
+                    if key in missing and key not in docs:
+                        site_doc = site_doc_from_result(res, missing[key])
+                        docs[key] = site_doc
+                        await asyncio.to_thread(cache.set, missing[key], site_doc.model_dump())
+                        await self._index(site_doc)
+            except TimeoutError:
+                self.timeouts += 1
+                print(f"⚠️ Batch crawl of {len(missing)} URLs timed out after {timeout:g}s")
+            except Exception as e:
+                print(f"⚠️ Batch crawl failed, fetching URLs individually: {e}")
+            missing = {key: url for key, url in missing.items() if key not in docs}
+
+        # Whatever the batch did not return (or all of it, without batch support)
+        if missing:
+            fetched = await asyncio.gather(*[self._fetch(url, self.url_timeout) for url in missing.values()])
+            docs.update(zip(missing.keys(), fetched))
+
+        return [docs[normalize_url(url)] for url in urls]
+
+    @staticmethod
+    def _batch_documents(job: Any) -> List[Any]:
+        data = job.get("data") if isinstance(job, dict) else getattr(job, "data", None)
+        return list(data or [])
+
+    @staticmethod
+    def _source_url(res: Any) -> Optional[str]:
+        metadata = res.get("metadata") if isinstance(res, dict) else getattr(res, "metadata", None)
+        if metadata is None:
+            return res.get("url") if isinstance(res, dict) else getattr(res, "url", None)
+        if isinstance(metadata, dict):
+            return metadata.get("sourceURL") or metadata.get("source_url") or metadata.get("url")
+        return getattr(metadata, "source_url", None) or getattr(metadata, "url", None)
+
+    @asynccontextmanager
+    async def scope(self):
+        """Cancel any fetch still running when the block (e.g. an agent run) ends"""
+        tasks: Set[asyncio.Task] = set()
+        token = _crawl_scope.set(tasks)
+        try:
+            yield
+        finally:
+            _crawl_scope.reset(token)
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.cancelled += len(pending)
+                await asyncio.gather(*pending, return_exceptions=True)
+                print(f"🔄 Cancelled {len(pending)} outstanding crawl(s)")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'max_concurrency': self.max_concurrency,
+            'max_per_host': self.max_per_host,
+            'timeouts': self.timeouts,
+            'cancelled': self.cancelled
+        }
+
+
+_crawler: Optional[AsyncCrawler] = None
+
+def get_crawler() -> AsyncCrawler:
+    """Get the process-wide async crawler"""
+    global _crawler
+    if _crawler is None:
+        crawl_settings = get_settings().crawl
+        _crawler = AsyncCrawler(
+            max_concurrency=crawl_settings.max_concurrency,
+            max_per_host=crawl_settings.max_per_host,
+            url_timeout=crawl_settings.url_timeout,
+            batch_timeout=crawl_settings.batch_timeout
+        )
+    return _crawler
@@ -0,0 +1,253 @@
+import asyncio
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from pydantic import BaseModel
+from configs.config import get_settings
+from agents.tools.crawl_cache import domain_ttl, normalize_url
+from agents.tools.webcrawl_tool import SiteDoc, bm25_idf, bm25_weight, chunk_markdown, tokenize
+
+# Seconds between full sweeps for expired pages; search skips them in between
+SWEEP_INTERVAL = 300
+
+
+class EvidenceHit(BaseModel):
+    url: str
+    title: Optional[str] = None
+    text: str
+    score: float
+    fetched_at: Optional[str] = None
+    age_seconds: float
+
+
+class EvidenceResults(BaseModel):
+    query: str
+    results: List[EvidenceHit]
+
+
+@dataclass
+class _Chunk:
+    url: str
+    text: str
+    length: int
+    terms: Dict[str, int]
+
+
+@dataclass
+class _Document:
+    title: Optional[str]
+    fetched_at: Optional[str]
+    indexed_at: float
+    chunk_ids: List[int] = field(default_factory=list)
+    size: int = 0
+
+
+class EvidenceIndex:
+    """In-memory BM25 inverted index over chunks of crawled pages.
+
+    Re-adding a URL replaces its chunks. Pages expire on the same per-domain
+    TTLs as the crawl cache, and the least recently used pages are pruned once
+    the index holds more than max_chunks chunks or max_bytes of text.
+    """
+
+    def __init__(self, max_chunks: int = 50000, max_bytes: int = 64 * 1024 * 1024, chunk_words: int = 200,
+                 default_ttl: float = 24 * 3600, domain_ttls: Optional[Dict[str, float]] = None,
+                 k1: float = 1.5, b: float = 0.75):
+        self.max_chunks = max_chunks
+        self.max_bytes = max_bytes
+        self.chunk_words = chunk_words
+        self.default_ttl = default_ttl
+        self.domain_ttls = {domain.lower(): float(ttl) for domain, ttl in (domain_ttls or {}).items()}
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._chunks: Dict[int, _Chunk] = {}
+        # Least recently used first
+        self._documents: "OrderedDict[str, _Document]" = OrderedDict()
+        self._next_id = 0
+        self._total_length = 0
+        self._total_bytes = 0
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.hits = 0
+        self.pruned = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def ttl_for(self, url: str) -> float:
+        return domain_ttl(url, self.default_ttl, self.domain_ttls)
+
+    @staticmethod
+    def _fetched_timestamp(fetched_at: Optional[str], default: float) -> float:
+        try:
+            return datetime.fromisoformat(fetched_at).timestamp()
+        except (TypeError, ValueError):
+            return default
+
+    def _expired(self, url: str, document: _Document, now: float) -> bool:
+        fetched = self._fetched_timestamp(document.fetched_at, document.indexed_at)
+        return now - fetched > self.ttl_for(url)
+
+    def add(self, doc: SiteDoc, indexed_at: Optional[float] = None) -> bool:
+        """Index a crawled page, replacing any earlier version; failed crawls are ignored"""
+        if not doc.source_url or not doc.markdown or (doc.metadata or {}).get("error"):
+            return False
+        url = normalize_url(doc.source_url)
+        existing = self._documents.get(url)
+        if existing and existing.fetched_at == doc.fetched_at:
+            return False
+
+        # Tokenize outside the lock; it is the expensive part
+        chunks = [(text, Counter(tokenize(text))) for text in chunk_markdown(doc.markdown, self.chunk_words)]
+        chunks = [(text, terms) for text, terms in chunks if terms]
+        if not chunks:
+            return False
+
+        with self._lock:
+            self._remove(url)
+            document = _Document(title=doc.title, fetched_at=doc.fetched_at, indexed_at=indexed_at or time.time())
+            for text, terms in chunks:
+                chunk_id = self._next_id
+                self._next_id += 1
+                length = sum(terms.values())
+                self._chunks[chunk_id] = _Chunk(url=url, text=text, length=length, terms=dict(terms))
+                for term, count in terms.items():
+                    self._postings.setdefault(term, {})[chunk_id] = count
+                document.chunk_ids.append(chunk_id)
+                document.size += len(text.encode("utf-8"))
+                self._total_length += length
+            self._documents[url] = document
+            self._total_bytes += document.size
+            self._prune()
+        return True
+
+    def _remove(self, url: str):
+        document = self._documents.pop(url, None)
+        if document is None:
+            return
+        for chunk_id in document.chunk_ids:
+            chunk = self._chunks.pop(chunk_id)
+            for term in chunk.terms:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(chunk_id, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_length -= chunk.length
+        self._total_bytes -= document.size
+
+    def _prune(self):
+        """Drop expired pages, then least recently used ones until within both budgets"""
+        now = time.time()
+        if now - self._last_sweep >= SWEEP_INTERVAL:
+            self._last_sweep = now
+            for url in [url for url, document in self._documents.items() if self._expired(url, document, now)]:
+                self._remove(url)
+                self.pruned += 1
+        while self._documents and (len(self._chunks) > self.max_chunks or self._total_bytes > self.max_bytes):
+            self._remove(next(iter(self._documents)))
+            self.pruned += 1
+
+    def search(self, query: str, limit: int = 5, max_age: Optional[float] = None) -> List[EvidenceHit]:
+        """Top BM25-scored chunks for query from fresh pages, at most one chunk per page"""
+        terms = set(tokenize(query))
+        now = time.time()
+        with self._lock:
+            self.searches += 1
+            if not terms or not self._chunks:
+                return []
+            n_chunks = len(self._chunks)
+            avg_length = self._total_length / n_chunks
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = bm25_idf(n_chunks, len(postings))
+                for chunk_id, count in postings.items():
+                    weight = bm25_weight(count, idf, self._chunks[chunk_id].length, avg_length, self.k1, self.b)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + weight
+
+            hits, seen_urls = [], set()
+            for chunk_id in sorted(scores, key=scores.get, reverse=True):
+                chunk = self._chunks[chunk_id]
+                if chunk.url in seen_urls:
+                    continue
+                document = self._documents[chunk.url]
+                age = now - self._fetched_timestamp(document.fetched_at, document.indexed_at)
+                if age > (max_age if max_age is not None else self.ttl_for(chunk.url)):
+                    continue
+                seen_urls.add(chunk.url)
+                self._documents.move_to_end(chunk.url)
+                hits.append(EvidenceHit(
+                    url=chunk.url,
+                    title=document.title,
+                    text=chunk.text,
+                    score=round(scores[chunk_id], 4),
+                    fetched_at=document.fetched_at,
+                    age_seconds=round(age, 1)
+                ))
+                if len(hits) >= limit:
+                    break
+            self.hits += bool(hits)
+            return hits
+
+    def warm(self, entries: Iterable[tuple]) -> int:
+        """Index (url, stored_at, doc) entries, newest first, until the size budget is reached"""
+        added = 0
+        for url, stored_at, doc in entries:
+            if len(self._chunks) >= self.max_chunks or self._total_bytes >= self.max_bytes:
+                break
+            site_doc = SiteDoc.model_validate(doc)
+            site_doc.source_url = site_doc.source_url or url
+            added += self.add(site_doc, indexed_at=stored_at)
+        return added
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            'documents': len(self._documents),
+            'chunks': len(self._chunks),
+            'terms': len(self._postings),
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'searches': self.searches,
+            'hit_ratio': self.hits / self.searches if self.searches else 0.0,
+            'pruned': self.pruned
+        }
+
+
+_evidence_index: Optional[EvidenceIndex] = None
+_evidence_index_lock = threading.Lock()
+
+def get_evidence_index() -> EvidenceIndex:
+    """Get the process-wide local evidence index"""
+    global _evidence_index
+    with _evidence_index_lock:
+        if _evidence_index is None:
+            evidence_settings = get_settings().evidence
+            cache_settings = get_settings().cache
+            _evidence_index = EvidenceIndex(
+                max_chunks=evidence_settings.max_chunks,
+                max_bytes=evidence_settings.max_bytes,
+                chunk_words=evidence_settings.chunk_words,
+                default_ttl=cache_settings.crawl_cache_ttl,
+                domain_ttls=cache_settings.crawl_domain_ttls
+            )
+    return _evidence_index
+
+
+async def warm_evidence_index():
+    """Index pages already in the on-disk crawl cache so local evidence survives restarts"""
+    from agents.tools.webcrawl_tool import get_crawl_cache
+    if not get_settings().evidence.enabled:
+        return
+    try:
+        added = await asyncio.to_thread(get_evidence_index().warm, get_crawl_cache().entries())
+        print(f"✅ Indexed {added} cached pages into the local evidence index")
+    except Exception as e:
+        print(f"Evidence index warm-up warning: {e}")
@@ -0,0 +1,148 @@
+import asyncio
+import re
+import threading
+import unicodedata
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from services.lru_cache import LRUTTLCache
+
+# Boolean operators that are only recognized in upper case
+SEARCH_OPERATORS = frozenset({"OR", "AND"})
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a search query so near-identical queries share one entry"""
+    text = unicodedata.normalize("NFKC", query or "")
+    # Only case and spacing are folded: order, quotes and operators such as
+    # site: and -term change the results. Upper-case OR/AND are operators too.
+    return " ".join(
+        token if token in SEARCH_OPERATORS else token.casefold()
+        for token in re.split(r"\s+", text.strip())
+    )
+
+
+class _Flight:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.event = threading.Event()
+        self.results: List[Dict] = []
+        self.error: Optional[BaseException] = None
+
+
+class SearchCache:
+    """TTL cache for search results with single-flight deduplication.
+
+    Entries are keyed by normalized query and remember the limit they were
+    fetched with, so a cached or in-flight larger-limit search answers any
+    smaller-limit request for the same query.
+    """
+
+    def __init__(self, maxsize: int = 5000, ttl: float = 6 * 3600):
+        self._cache = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[str, _Flight] = {}
+        # Async flights live on the event loop, so they need no lock
+        self._async_inflight: Dict[str, Tuple[int, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def lookup(self, query: str, limit: int) -> Optional[List[Dict]]:
+        entry: Optional[Tuple[int, List[Dict]]] = self._cache.get(normalize_query(query))
+        if entry is None:
+            return None
+        fetched_limit, results = entry
+        # A short result list means the engine had nothing more to give
+        if fetched_limit >= limit or len(results) < fetched_limit:
+            return results[:limit]
+        return None
+
+    def store(self, query: str, limit: int, results: List[Dict]):
+        key = normalize_query(query)
+        existing = self._cache.get(key, count=False)
+        if existing is None or limit >= existing[0]:
+            self._cache.set(key, (limit, results))
+
+    def get_or_fetch(self, query: str, limit: int, fetch: Callable[[str, int], List[Dict]]) -> List[Dict]:
+        """Serve from cache, join an identical in-flight search, or run fetch once"""
+        cached = self.lookup(query, limit)
+        if cached is not None:
+            return cached
+
+        key = normalize_query(query)
+        with self._lock:
+            # A leader may have finished between the lookup above and taking the lock
+            cached = self.lookup(query, limit)
+            if cached is not None:
+                return cached
+            flight = self._inflight.get(key)
+            leader = flight is None or flight.limit < limit
+            if leader:
+                flight = _Flight(limit)
+                self._inflight[key] = flight
+
+        if not leader:
+            self.coalesced += 1
+            flight.event.wait()
+            if flight.error:
+                raise flight.error
+            return flight.results[:limit]
+
+        try:
+            flight.results = fetch(query, limit)
+            # Empty lists are how failed searches come back; don't pin them in the cache
+            if flight.results:
+                self.store(query, limit, flight.results)
+            return flight.results
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.event.set()
+
+    async def get_or_fetch_async(self, query: str, limit: int,
+                                 fetch: Callable[[str, int], Awaitable[List[Dict]]]) -> List[Dict]:
+        """Async counterpart of get_or_fetch for coroutine fetchers"""
+        cached = self.lookup(query, limit)
+        if cached is not None:
+            return cached
+
+        key = normalize_query(query)
+        flight = self._async_inflight.get(key)
+        if flight is not None and flight[0] >= limit:
+            self.coalesced += 1
+            try:
+                # shield: a cancelled follower must not cancel the leader's request
+                results = await asyncio.shield(flight[1])
+            except asyncio.CancelledError:
+                # The leader was cancelled, not us: run the search ourselves
+                if flight[1].cancelled() and not asyncio.current_task().cancelling():
+                    return await self.get_or_fetch_async(query, limit, fetch)
+                raise
+            return results[:limit]
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_inflight[key] = (limit, future)
+        try:
+            results = await fetch(query, limit)
+            if results:
+                self.store(query, limit, results)
+            future.set_result(results)
+            return results
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure does not log a warning
+            future.exception()
+            raise
+        finally:
+            if self._async_inflight.get(key, (None, None))[1] is future:
+                del self._async_inflight[key]
+
+    def stats(self) -> Dict:
+        return {
+            **self._cache.stats(),
+            'coalesced': self.coalesced,
+            'in_flight': len(self._inflight) + len(self._async_inflight)
+        }
@@ -1,9 +1,14 @@
 import os
+import asyncio
+import random
+import threading
+import httpx
 import requests
 import json
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from pydantic import BaseModel
 from configs.config import get_settings
+from agents.tools.search_cache import SearchCache
 
 class SearchResultItem(BaseModel):
     url: str
@@ -14,20 +19,49 @@ class SearchResults(BaseModel):
     query: str
     results: List[SearchResultItem]
 
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search result cache"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            cache_settings = get_settings().cache
+            _search_cache = SearchCache(
+                maxsize=cache_settings.search_cache_size,
+                ttl=cache_settings.search_cache_ttl
+            )
+    return _search_cache
+
 def search_web(query: str, limit: int = 5) -> List[Dict]:
     """
     Search the web using Serper API.
     Returns a list of dicts with 'url', 'title', and 'snippet' keys.
+    Results are cached per normalized query, and concurrent identical
+    searches share a single Serper request.
     """
+    return get_search_cache().get_or_fetch(query, limit, _serper_search)
+
+async def search_web_async(query: str, limit: int = 5) -> List[Dict]:
+    """Async variant of search_web on the shared pooled Serper client"""
+    return await get_search_cache().get_or_fetch_async(query, limit, get_serper_client().search)
+
+async def search_many(queries: List[str], limit: int = 5) -> List[List[Dict]]:
+    """Run several searches concurrently; results keep the order of queries"""
+    return await get_serper_client().search_many(queries, limit=limit)
+
+# Serper API endpoint
+SERPER_URL = "https://google.serper.dev/search"
+
+def _serper_request(query: str, limit: int) -> Optional[Tuple[Dict, Dict]]:
+    """Build Serper headers and payload, or None when no API key is configured"""
     settings = get_settings()
     api_key = settings.api_keys.serp_api_key.get_secret_value()
     
     if not api_key or api_key == "SERP_API_KEY":
         print("Warning: Serper API key not configured. Returning empty results.")
-        return []
-    
-    # Serper API endpoint
-    url = "https://google.serper.dev/search"
+        return None
     
     # Request headers
     headers = {
@@ -40,29 +74,44 @@ def search_web(query: str, limit: int = 5) -> List[Dict]:
         'q': query,
         'num': min(limit, 10)  # Serper API max is 10
     }
+    return headers, payload
+
+def _parse_results(data: Dict, query: str, limit: int) -> List[Dict]:
+    """Extract search results from a Serper response body"""
+    results = []
+    organic_results = data.get('organic', [])
+    
+    for result in organic_results[:limit]:
+        search_item = {
+            'url': result.get('link', ''),
+            'title': result.get('title', ''),
+            'snippet': result.get('snippet', '')
+        }
+        results.append(search_item)
+    
+    print(f"✅ Serper API search successful: Found {len(results)} results for query: '{query}'")
+    return results
+
+_session = requests.Session()
+
+def _serper_search(query: str, limit: int) -> List[Dict]:
+    """Send one query to the Serper API"""
+    request = _serper_request(query, limit)
+    if request is None:
+        return []
+    headers, payload = request
+    search_settings = get_settings().search
     
     try:
         # Make the API request
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
+        response = _session.post(
+            SERPER_URL,
+            headers=headers,
+            data=json.dumps(payload),
+            timeout=(search_settings.connect_timeout, search_settings.read_timeout)
+        )
         response.raise_for_status()
-        
-        # Parse the response
-        data = response.json()
-        
-        # Extract search results
-        results = []
-        organic_results = data.get('organic', [])
-        
-        for result in organic_results[:limit]:
-            search_item = {
-                'url': result.get('link', ''),
-                'title': result.get('title', ''),
-                'snippet': result.get('snippet', '')
-            }
-            results.append(search_item)
-        
-        print(f"✅ Serper API search successful: Found {len(results)} results for query: '{query}'")
-        return results
+        return _parse_results(response.json(), query, limit)
         
     except requests.exceptions.RequestException as e:
         print(f"❌ Serper API request failed: {e}")
@@ -72,4 +121,97 @@ def search_web(query: str, limit: int = 5) -> List[Dict]:
         return []
     except Exception as e:
         print(f"❌ Unexpected error during search: {e}")
-        return []
\ No newline at end of file
+        return []
+
+
+class SerperClient:
+    """Async Serper client on a shared keep-alive connection pool.
+
+    Requests use explicit connect/read timeouts and are retried on transport
+    errors, 429 and 5xx responses with jittered exponential backoff.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self):
+        self.settings = get_settings().search
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.settings.read_timeout, connect=self.settings.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.settings.max_connections,
+                    max_keepalive_connections=self.settings.max_connections
+                )
+            )
+        return self._client
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.settings.max_backoff)
+            except ValueError:
+                pass
+        delay = self.settings.backoff_base * (2 ** attempt)
+        return min(delay * random.uniform(0.5, 1.5), self.settings.max_backoff)
+
+    async def search(self, query: str, limit: int = 5) -> List[Dict]:
+        """Send one query to the Serper API"""
+        request = _serper_request(query, limit)
+        if request is None:
+            return []
+        headers, payload = request
+        client = self._get_client()
+
+        for attempt in range(self.settings.max_retries + 1):
+            retry_after = None
+            try:
+                response = await client.post(SERPER_URL, headers=headers, json=payload)
+                if response.status_code not in self.RETRY_STATUSES:
+                    response.raise_for_status()
+                    return _parse_results(response.json(), query, limit)
+                retry_after = response.headers.get('Retry-After')
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+            except httpx.HTTPStatusError as e:
+                print(f"❌ Serper API request failed: {e}")
+                return []
+            except json.JSONDecodeError as e:
+                print(f"❌ Failed to parse Serper API response: {e}")
+                return []
+
+            if attempt < self.settings.max_retries:
+                delay = self._backoff(attempt, retry_after)
+                print(f"⚠️ Serper API attempt {attempt + 1} failed ({error}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        print(f"❌ Serper API request failed after {self.settings.max_retries + 1} attempts: {error}")
+        return []
+
+    async def search_many(self, queries: List[str], limit: int = 5) -> List[List[Dict]]:
+        """Run several searches concurrently, bounded by the configured concurrency"""
+        semaphore = asyncio.Semaphore(self.settings.concurrency)
+
+        async def run(query: str) -> List[Dict]:
+            async with semaphore:
+                return await get_search_cache().get_or_fetch_async(query, limit, self.search)
+
+        return list(await asyncio.gather(*[run(query) for query in queries]))
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_serper_client: Optional[SerperClient] = None
+
+def get_serper_client() -> SerperClient:
+    """Get the process-wide async Serper client"""
+    global _serper_client
+    if _serper_client is None:
+        _serper_client = SerperClient()
+    return _serper_client
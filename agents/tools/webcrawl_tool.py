@@ -1,7 +1,16 @@
+import math
 import os
-from typing import Optional, Dict, Any
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 from configs.config import get_settings
+from agents.tools.crawl_cache import CrawlCache
+from services.process_text import _count_tokens_batch, _split_text_by_tokens
 try:
     from firecrawl import FirecrawlApp
 except ImportError:
@@ -11,6 +20,10 @@ except ImportError:
     except ImportError:
         FirecrawlApp = None
         Firecrawl = None
+try:
+    from firecrawl import AsyncFirecrawl
+except ImportError:
+    AsyncFirecrawl = None
 
 class SiteDoc(BaseModel):
     source_url: str = None
@@ -19,8 +32,61 @@ class SiteDoc(BaseModel):
     fetched_at: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
+_firecrawl_client = None
+_async_firecrawl_client = None
+_firecrawl_client_lock = threading.Lock()
+_crawl_cache: Optional[CrawlCache] = None
+_crawl_cache_lock = threading.Lock()
+_page_compactor = None
+_page_compactor_lock = threading.Lock()
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:['.-][a-z0-9]+)*")
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_IMAGE_LINE_RE = re.compile(r"^\s*(?:[-*+]\s*)?(?:!\[[^\]]*\]\([^)]*\)\s*)+$")
+# Short lines containing these are site chrome, not article content
+_BOILERPLATE_PHRASES = (
+    "cookie", "subscribe", "sign in", "sign up", "log in", "newsletter", "privacy policy",
+    "terms of use", "terms of service", "all rights reserved", "advertisement", "share this",
+    "follow us", "skip to", "read more", "related articles", "back to top"
+)
+
+# 1) Shared on-disk crawl cache
+def get_crawl_cache() -> CrawlCache:
+    """Get the process-wide crawl cache"""
+    global _crawl_cache
+    with _crawl_cache_lock:
+        if _crawl_cache is None:
+            cache_settings = get_settings().cache
+            cache_dir = Path(cache_settings.crawl_cache_dir)
+            if not cache_dir.is_absolute():
+                cache_dir = Path(__file__).resolve().parents[2] / cache_dir
+            _crawl_cache = CrawlCache(
+                directory=cache_dir,
+                max_bytes=cache_settings.crawl_cache_max_bytes,
+                default_ttl=cache_settings.crawl_cache_ttl,
+                domain_ttls=cache_settings.crawl_domain_ttls
+            )
+    return _crawl_cache
+
 # 2) Firecrawl client initialization
 def _get_firecrawl_client():
+    """Return the shared Firecrawl client, creating it on first use"""
+    global _firecrawl_client
+    if _firecrawl_client is None:
+        with _firecrawl_client_lock:
+            if _firecrawl_client is None:
+                _firecrawl_client = _create_firecrawl_client()
+    return _firecrawl_client
+
+def _get_async_firecrawl_client():
+    """Return the shared async Firecrawl client, or None if the SDK has none"""
+    global _async_firecrawl_client
+    if _async_firecrawl_client is None and AsyncFirecrawl is not None:
+        api_key = get_settings().api_keys.firecrawl_api_key.get_secret_value()
+        _async_firecrawl_client = AsyncFirecrawl(api_key=api_key)
+    return _async_firecrawl_client
+
+def _create_firecrawl_client():
     """Initialize Firecrawl client with fallback for different package versions"""
     api_key = get_settings().api_keys.firecrawl_api_key.get_secret_value()
     
@@ -31,29 +97,197 @@ def _get_firecrawl_client():
     else:
         raise ImportError("Firecrawl package not found. Please install with: pip install firecrawl-py")
 
-# 3) helper that calls Firecrawl and returns validated model
-def fetch_site(url: str, formats: list[str] = ["markdown"]) -> SiteDoc:
-    try:
-        fc = _get_firecrawl_client()
-        # Firecrawl SDK: scrape returns a dict-like result (see docs)
-        res = fc.scrape(url, formats=formats)
-        
-        # extract fields safely (structure depends on requested formats)
-        # typical keys: 'markdown', 'metadata' etc. Adjust as needed.
-        doc = {
-            "source_url": res.get("url") or url,
-            "title": (res.get("title") or None),
-            "markdown": res.get("markdown") or res.get("html") or "",
-            "fetched_at": res.get("fetched_at") if "fetched_at" in res else None,
-            "metadata": res.get("metadata") or None,
+def site_doc_from_result(res: Any, url: str) -> SiteDoc:
+    """Build a SiteDoc from a Firecrawl result, which is a dict or a Document depending on SDK version"""
+    if not isinstance(res, dict):
+        res = res.model_dump() if hasattr(res, "model_dump") else vars(res)
+    metadata = res.get("metadata") or None
+    if metadata is not None and not isinstance(metadata, dict):
+        metadata = metadata.model_dump() if hasattr(metadata, "model_dump") else vars(metadata)
+
+    # extract fields safely (structure depends on requested formats)
+    # typical keys: 'markdown', 'metadata' etc. Adjust as needed.
+    doc = {
+        "source_url": res.get("url") or url,
+        "title": (res.get("title") or (metadata or {}).get("title") or None),
+        "markdown": res.get("markdown") or res.get("html") or "",
+        "fetched_at": res.get("fetched_at") or datetime.now(timezone.utc).isoformat(),
+        "metadata": metadata,
+    }
+    return SiteDoc.model_validate(doc)
+
+def error_site_doc(url: str, error: Any) -> SiteDoc:
+    """Return a basic SiteDoc with error information"""
+    return SiteDoc(
+        source_url=url,
+        title="Error",
+        markdown=f"Error fetching site: {str(error)}",
+        fetched_at=None,
+        metadata={"error": str(error)}
+    )
+
+# 3) Page compaction: only the parts of a page relevant to the claim reach the model
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall((text or "").lower()) if token not in ENGLISH_STOP_WORDS]
+
+def chunk_markdown(markdown: str, chunk_words: int = 200) -> List[str]:
+    """Split markdown into chunks of about chunk_words words along paragraph boundaries"""
+    chunks, current, size = [], [], 0
+    for paragraph in re.split(r"\n\s*\n", markdown or ""):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        words = paragraph.split()
+        # A single oversized paragraph is cut on word boundaries
+        while len(words) > chunk_words:
+            if current:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            chunks.append(" ".join(words[:chunk_words]))
+            words = words[chunk_words:]
+            paragraph = " ".join(words)
+        if size + len(words) > chunk_words and current:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        if words:
+            current.append(paragraph)
+            size += len(words)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def _is_boilerplate(line: str) -> bool:
+    stripped = line.strip()
+    if _IMAGE_LINE_RE.match(stripped):
+        return True
+    visible = _LINK_RE.sub(lambda m: m.group(1), stripped)
+    visible_chars = len(visible.replace(" ", ""))
+    link_chars = sum(len(m.group(1).replace(" ", "")) for m in _LINK_RE.finditer(stripped))
+    # Menus and link lists: almost all of the visible text is link text
+    if visible_chars and link_chars / visible_chars > 0.6:
+        return True
+    words = visible.split()
+    # "Home | World | Politics" style bars; markdown table rows start with a pipe and are kept
+    if not stripped.startswith("|") and visible.count("|") >= 3 and len(words) <= 4 * (visible.count("|") + 1):
+        return True
+    lowered = visible.lower()
+    return len(words) <= 12 and any(phrase in lowered for phrase in _BOILERPLATE_PHRASES)
+
+def strip_boilerplate(markdown: str) -> str:
+    """Drop navigation, link lists, image-only lines, site chrome and repeated link lines from page markdown"""
+    kept, seen = [], set()
+    for line in (markdown or "").splitlines():
+        key = " ".join(line.split()).lower()
+        if key and (key in seen or _is_boilerplate(line)):
+            continue
+        # Only short lines with links repeat as chrome (menus, share bars); repeated prose and list items are content
+        if _LINK_RE.search(line) and len(key.split()) <= 12:
+            seen.add(key)
+        kept.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+
+def bm25_idf(documents: int, containing: int) -> float:
+    return math.log(1 + (documents - containing + 0.5) / (containing + 0.5))
+
+def bm25_weight(tf: int, idf: float, length: int, avg_length: float, k1: float = 1.5, b: float = 0.75) -> float:
+    """BM25 contribution of one query term occurring tf times in a document of the given length"""
+    norm = k1 * (1 - b + b * length / avg_length)
+    return idf * tf * (k1 + 1) / (tf + norm)
+
+def rank_chunks(chunks: List[str], query: str, k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """BM25 score of each chunk against query, with IDF taken over the page's own chunks"""
+    terms = set(tokenize(query))
+    counts = [Counter(tokenize(chunk)) for chunk in chunks]
+    if not terms or not chunks:
+        return [0.0] * len(chunks)
+    lengths = [sum(count.values()) for count in counts]
+    avg_length = (sum(lengths) / len(lengths)) or 1.0
+    scores = [0.0] * len(chunks)
+    for term in terms:
+        containing = sum(1 for count in counts if term in count)
+        if not containing:
+            continue
+        idf = bm25_idf(len(chunks), containing)
+        for i, count in enumerate(counts):
+            tf = count.get(term, 0)
+            if tf:
+                scores[i] += bm25_weight(tf, idf, lengths[i], avg_length, k1, b)
+    return scores
+
+class PageCompactor:
+    """Shrinks crawled pages to the chunks most relevant to a query within a token budget.
+
+    Boilerplate is stripped first; chunks are then ranked with BM25 and taken
+    best first until the budget is spent, and returned in page order. The
+    counts of tokens saved are kept per call in the SiteDoc metadata and in total.
+    """
+
+    def __init__(self, token_budget: int = 3000, chunk_words: int = 120):
+        self.token_budget = token_budget
+        self.chunk_words = chunk_words
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.original_tokens = 0
+        self.returned_tokens = 0
+
+    def compact(self, doc: SiteDoc, query: str = "", token_budget: Optional[int] = None) -> SiteDoc:
+        """Return doc with its markdown compacted; a budget of 0 returns the page unchanged"""
+        budget = self.token_budget if token_budget is None else token_budget
+        if budget <= 0 or not doc.markdown or (doc.metadata or {}).get("error"):
+            return doc
+
+        # A page that is all chrome by these rules, like a short list of links, is kept rather than emptied
+        stripped = strip_boilerplate(doc.markdown) or doc.markdown.strip()
+        chunks = chunk_markdown(stripped, self.chunk_words)
+        original_tokens, stripped_tokens, *chunk_tokens = _count_tokens_batch([doc.markdown, stripped] + chunks)
+        if stripped_tokens <= budget:
+            selected = list(range(len(chunks)))
+        else:
+            scores = rank_chunks(chunks, query)
+            # Best first; among equal scores (e.g. no query) the page's own order, so the lede wins
+            order = sorted(range(len(chunks)), key=lambda i: (-scores[i], i))
+            selected, spent = [], 0
+            for i in order:
+                if spent + chunk_tokens[i] <= budget:
+                    selected.append(i)
+                    spent += chunk_tokens[i]
+            selected.sort()
+
+        markdown = "\n\n[...]\n\n".join(chunks[i] for i in selected)
+        returned_tokens = sum(chunk_tokens[i] for i in selected)
+        returned_chunks = len(selected)
+        if not selected and chunks:
+            # Every chunk is over budget on its own: return the best one cut to the budget, not nothing
+            markdown, returned_tokens = _split_text_by_tokens(chunks[order[0]], budget)[0]
+            returned_chunks = 1
+        with self._lock:
+            self.calls += 1
+            self.original_tokens += original_tokens
+            self.returned_tokens += returned_tokens
+        compaction = {
+            'query': query,
+            'token_budget': budget,
+            'original_tokens': original_tokens,
+            'returned_tokens': returned_tokens,
+            'tokens_saved': original_tokens - returned_tokens,
+            'chunks_total': len(chunks),
+            'chunks_returned': returned_chunks
         }
-        return SiteDoc.model_validate(doc)
-    except Exception as e:
-        # Return a basic SiteDoc with error information
-        return SiteDoc(
-            source_url=url,
-            title="Error",
-            markdown=f"Error fetching site: {str(e)}",
-            fetched_at=None,
-            metadata={"error": str(e)}
-        )
\ No newline at end of file
+        return doc.model_copy(update={'markdown': markdown, 'metadata': {**(doc.metadata or {}), 'compaction': compaction}})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'original_tokens': self.original_tokens,
+            'returned_tokens': self.returned_tokens,
+            'tokens_saved': self.original_tokens - self.returned_tokens,
+            'saved_ratio': 1 - self.returned_tokens / self.original_tokens if self.original_tokens else 0.0
+        }
+
+def get_page_compactor() -> PageCompactor:
+    """Get the process-wide page compactor"""
+    global _page_compactor
+    with _page_compactor_lock:
+        if _page_compactor is None:
+            _page_compactor = PageCompactor(token_budget=get_settings().crawl.compact_token_budget)
+    return _page_compactor
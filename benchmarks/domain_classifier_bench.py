@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Evaluate services.domain_classifier on synthetic labelled keyword lists: held-out
+report per threshold, plus per-input prediction latency
+
+Inputs are represented by their extracted keywords, as in production. The two
+topics share an ambiguous vocabulary and a few labels are flipped, so the data
+is not linearly separable and the report shows real threshold trade-offs; it
+still says nothing about accuracy on real traffic. The live report, trained on
+stored verifications, is returned by POST /domain_classifier/train and shown
+under domain_classifier in /cache_stats.
+
+Usage: python benchmarks/domain_classifier_bench.py [examples]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent))
+
+from services.domain_classifier import DomainClassifier
+
+IN_DOMAIN = ("vaccine outbreak pandemic hospital infections who quarantine variant ceasefire troops "
+             "missile sanctions border refugees invasion embassy drought wildfire flooding emissions "
+             "hurricane glacier temperature carbon ipcc heatwave casualties").split()
+OUT_OF_DOMAIN = ("football striker transfer league album concert celebrity smartphone launch recipe "
+                 "baking movie premiere fashion streaming gaming console season playoff startup "
+                 "cryptocurrency marathon restaurant").split()
+# Words common to both topics ("record", "season", "launch" ...) carry no label signal
+AMBIGUOUS = ("record season launch report crisis market fans deal players storm attack final "
+             "officials government city million people week").split()
+KEYWORDS_PER_INPUT = 10
+LABEL_NOISE = 0.05
+
+
+def synthetic_keywords(rng: random.Random, out_of_domain: bool) -> list:
+    topic, other = (OUT_OF_DOMAIN, IN_DOMAIN) if out_of_domain else (IN_DOMAIN, OUT_OF_DOMAIN)
+    keywords = []
+    for _ in range(KEYWORDS_PER_INPUT):
+        draw = rng.random()
+        keywords.append(rng.choice(topic if draw < 0.3 else other if draw < 0.4 else AMBIGUOUS))
+    return keywords
+
+
+def run(count: int):
+    rng = random.Random(count)
+    # Stored verifications are mostly in-domain
+    labels = [rng.random() < 0.25 for _ in range(count)]
+    keyword_lists = [synthetic_keywords(rng, label) for label in labels]
+    # Mislabelled verifications, as happen in stored data
+    labels = [label != (rng.random() < LABEL_NOISE) for label in labels]
+
+    classifier = DomainClassifier(threshold=0.9)
+    start = time.perf_counter()
+    report = classifier.fit(keyword_lists, labels, save=False)
+    print(f"\n📊 Trained on {count} inputs in {(time.perf_counter() - start) * 1000:.0f} ms")
+    roc_auc = f"{report['roc_auc']:.3f}" if report['roc_auc'] is not None else "n/a"
+    print(f"  held-out examples {report['examples']}, out-of-domain {report['out_of_domain']}, ROC AUC {roc_auc}")
+    print(f"  {'threshold':>9} {'skipped':>8} {'precision':>9} {'recall':>7} {'in-domain skipped':>18}")
+    for threshold, row in report['thresholds'].items():
+        precision = f"{row['precision']:.3f}" if row['precision'] is not None else "-"
+        recall = f"{row['recall']:.3f}" if row['recall'] is not None else "-"
+        print(f"  {threshold:>9} {row['skipped_fraction']:8.1%} {precision:>9} {recall:>7} "
+              f"{row['in_domain_skipped']:>9} ({row['in_domain_skipped_rate']:.2%})")
+
+    probes = [synthetic_keywords(rng, rng.random() < 0.5) for _ in range(500)]
+    start = time.perf_counter()
+    for keywords in probes:
+        classifier.predict(keywords)
+    elapsed = time.perf_counter() - start
+    print(f"  prediction latency {elapsed / len(probes) * 1000:.3f} ms per input")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
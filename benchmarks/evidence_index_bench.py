@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local evidence index: indexing throughput for synthetic crawled
+pages, BM25 search latency, and pruning under a size budget. The synthetic
+vocabulary is tiny, so posting lists are far longer than on real pages (worst case)
+
+Usage: python benchmarks/evidence_index_bench.py [pages]
+"""
+
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent))
+
+from agents.tools.evidence_index import EvidenceIndex
+from agents.tools.webcrawl_tool import SiteDoc
+
+TOPICS = {
+    "pandemic": "vaccine outbreak hospital infections variant quarantine booster mortality epidemiologists".split(),
+    "conflict": "ceasefire troops missile sanctions border refugees invasion embassy artillery".split(),
+    "climate": "drought wildfire flooding emissions hurricane glacier heatwave carbon ipcc".split(),
+}
+FILLER = ("the officials said on tuesday that according to reports new record people thousands "
+          "week year government city region minister agency data").split()
+BOILERPLATE = "Home | World | Politics | Business | Subscribe | Sign in | Cookie settings | Privacy policy"
+
+
+def page(rng: random.Random, number: int) -> SiteDoc:
+    topic = rng.choice(list(TOPICS))
+    paragraphs = [BOILERPLATE]
+    for _ in range(rng.randint(6, 25)):
+        words = [rng.choice(TOPICS[topic] if rng.random() < 0.3 else FILLER) for _ in range(rng.randint(30, 120))]
+        paragraphs.append(" ".join(words).capitalize() + ".")
+    return SiteDoc(
+        source_url=f"https://news{number % 50}.example.com/{topic}/{number}",
+        title=f"{topic.title()} report {number}",
+        markdown="\n\n".join(paragraphs),
+        fetched_at=datetime.now(timezone.utc).isoformat()
+    )
+
+
+def run(count: int):
+    rng = random.Random(count)
+    docs = [page(rng, i) for i in range(count)]
+    total_mb = sum(len(doc.markdown) for doc in docs) / 1e6
+
+    index = EvidenceIndex(max_bytes=int(total_mb * 1e6 / 2))
+    start = time.perf_counter()
+    for doc in docs:
+        index.add(doc)
+    elapsed = time.perf_counter() - start
+    stats = index.stats()
+    print(f"\n📊 Indexed {count} pages ({total_mb:.1f} MB) in {elapsed * 1000:.0f} ms "
+          f"({count / elapsed:.0f} pages/s), budget half the corpus")
+    print(f"  kept {stats['documents']} pages / {stats['chunks']} chunks / {stats['terms']} terms, "
+          f"pruned {stats['pruned']}")
+
+    start = time.perf_counter()
+    replaced = sum(index.add(page(rng, i)) for i in range(count - 100, count))
+    print(f"  re-crawled 100 pages (replace in place) in {(time.perf_counter() - start) * 1000:.0f} ms, {replaced} updated")
+
+    queries = [" ".join(rng.sample(TOPICS[rng.choice(list(TOPICS))], 4)) for _ in range(500)]
+    timings = []
+    for query in queries:
+        began = time.perf_counter()
+        hits = index.search(query, limit=5)
+        timings.append((time.perf_counter() - began) * 1000)
+    timings.sort()
+    print(f"  search p50 {statistics.median(timings):.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms "
+          f"({len(hits)} hits for last query)")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML cleaning: BeautifulSoup(..., 'html.parser').get_text() against
+services.html_cleaner on synthetic news-page HTML, checking outputs are identical
+
+Usage: python benchmarks/html_cleaning_bench.py [pages]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from bs4 import BeautifulSoup
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent))
+
+from services.html_cleaner import clean_texts, clean_texts_async, shutdown_process_pool
+
+WORDS = ("the government said on tuesday that vaccine supplies flooding ceasefire talks emissions "
+         "officials reported hospitals drought refugees border troops climate summit according to").split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 30))]
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), f"<a href=\"https://example.com/{rng.randint(1, 999)}\">{rng.choice(WORDS)}</a>")
+    if rng.random() < 0.2:
+        words.insert(rng.randrange(len(words)), rng.choice(["&amp;", "&nbsp;", "&#8217;s", "&quot;", "&mdash;"]))
+    return " ".join(words).capitalize() + "."
+
+
+def news_page(rng: random.Random) -> str:
+    """A scraped article page: head, scripts, nav, article body, related links, footer"""
+    paragraphs = "\n".join(
+        f"        <p>{' '.join(_sentence(rng) for _ in range(rng.randint(2, 6)))}</p>"
+        for _ in range(rng.randint(8, 30))
+    )
+    nav = "".join(f"<li><a href=\"/section/{i}\">Section {i}</a></li>" for i in range(rng.randint(10, 30)))
+    related = "".join(f"<li><a href=\"/story/{rng.randint(1, 10**6)}\">{_sentence(rng)}</a></li>" for _ in range(8))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{_sentence(rng)}</title>
+  <script type="application/ld+json">{{"@type": "NewsArticle", "headline": "x"}}</script>
+  <script>window.dataLayer = window.dataLayer || []; if (a < b && c > d) {{ track('view'); }}</script>
+  <style>.article p {{ margin: 0 0 1em; }} nav li {{ display: inline; }}</style>
+</head>
+<body>
+  <!-- header -->
+  <nav><ul>{nav}</ul></nav>
+  <main>
+    <article>
+      <h1>{_sentence(rng)}</h1>
+      <div class="byline">By <span>Staff Reporter</span> &middot; <time>{rng.randint(1, 28)} March 2024</time></div>
+      <figure><img src="/img/{rng.randint(1, 999)}.jpg" alt="photo"><figcaption>{_sentence(rng)}</figcaption></figure>
+      <div class="article">
+{paragraphs}
+      </div>
+    </article>
+    <aside><h2>Related</h2><ul>{related}</ul></aside>
+  </main>
+  <footer><p>&copy; 2024 Example News. All rights reserved.</p></footer>
+  <script src="/static/app.js"></script>
+</body>
+</html>"""
+
+
+def _legacy_clean(texts: List[str]) -> List[str]:
+    return [BeautifulSoup(text, 'html.parser').get_text().strip() for text in texts]
+
+
+def _timed(label: str, fn, texts: List[str]) -> List[str]:
+    start = time.perf_counter()
+    result = fn(texts)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<30} {elapsed * 1000:9.1f} ms  {len(texts) / elapsed:8.1f} pages/s")
+    return result
+
+
+def run(count: int):
+    rng = random.Random(count)
+    pages = [news_page(rng) for _ in range(count)]
+    plain = [_sentence(rng) for _ in range(count)]
+    total_mb = sum(len(page) for page in pages) / 1e6
+    print(f"\n📊 {count} news pages ({total_mb:.1f} MB of HTML)")
+
+    legacy = _timed("BeautifulSoup html.parser", _legacy_clean, pages)
+    fast = _timed("html_cleaner", clean_texts, pages)
+    pooled = _timed("html_cleaner, async/process pool", lambda texts: asyncio.run(clean_texts_async(texts)), pages)
+    print(f"  {'✅ identical output' if legacy == fast == pooled else '⚠️ outputs differ'}")
+
+    print(f"\n📊 {count} plain-text passages (no markup)")
+    legacy_plain = _timed("BeautifulSoup html.parser", _legacy_clean, plain)
+    fast_plain = _timed("html_cleaner", clean_texts, plain)
+    print(f"  {'✅ identical output' if legacy_plain == fast_plain else '⚠️ outputs differ'}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200]
+    try:
+        for size in sizes:
+            run(size)
+    finally:
+        shutdown_process_pool()
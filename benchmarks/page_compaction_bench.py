@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark page compaction: tokens handed to the model for Firecrawl-style news
+page markdown with and without PageCompactor, whether the paragraph that
+answers the claim survives, and compaction time per page
+
+Usage: python benchmarks/page_compaction_bench.py [pages] [token_budget]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent))
+
+from agents.tools.webcrawl_tool import PageCompactor, SiteDoc
+
+FILLER = ("the officials said on tuesday that according to reports new record people thousands "
+          "week year government city region minister agency data market season").split()
+CLAIMS = [
+    ("measles outbreak samoa vaccination rate", "The measles outbreak in Samoa spread after the vaccination rate fell to 31 percent."),
+    ("ceasefire gaza hostages exchange", "The ceasefire in Gaza began with an exchange of hostages and prisoners on Friday."),
+    ("arctic sea ice minimum record", "Arctic sea ice reached its second-lowest minimum extent on record in September."),
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(FILLER) for _ in range(rng.randint(12, 30))).capitalize() + "."
+
+
+def news_markdown(rng: random.Random, answer: str) -> str:
+    nav = "\n".join(f"- [Section {i}](https://example.com/section/{i})" for i in range(rng.randint(15, 40)))
+    related = "\n".join(f"- [{_sentence(rng)}](https://example.com/story/{rng.randint(1, 10**6)})" for _ in range(12))
+    paragraphs = [" ".join(_sentence(rng) for _ in range(rng.randint(3, 7))) for _ in range(rng.randint(20, 60))]
+    paragraphs.insert(rng.randrange(len(paragraphs)), f"{_sentence(rng)} {answer} {_sentence(rng)}")
+    return "\n\n".join([
+        "[Skip to content](#main)",
+        "Home | World | Politics | Business | Climate | Health | Sport",
+        nav,
+        "We use cookies to improve your experience. Accept all cookies",
+        f"![lead image](https://example.com/img/{rng.randint(1, 999)}.jpg)",
+        f"# {_sentence(rng)}",
+        "By Staff Reporter",
+        *paragraphs,
+        "## Related",
+        related,
+        "Subscribe to our newsletter",
+        "Home | World | Politics | Business | Climate | Health | Sport",
+        "© 2024 Example News. All rights reserved."
+    ])
+
+
+def run(count: int, budget: int):
+    rng = random.Random(count)
+    compactor = PageCompactor(token_budget=budget)
+    kept = 0
+    start = time.perf_counter()
+    for i in range(count):
+        query, answer = CLAIMS[i % len(CLAIMS)]
+        doc = SiteDoc(source_url=f"https://example.com/{i}", markdown=news_markdown(rng, answer))
+        compacted = compactor.compact(doc, query)
+        kept += answer in compacted.markdown
+    elapsed = time.perf_counter() - start
+
+    stats = compactor.stats()
+    print(f"\n📊 {count} pages, token budget {budget}")
+    print(f"  tokens per page   {stats['original_tokens'] / count:8.0f} -> {stats['returned_tokens'] / count:6.0f} "
+          f"({stats['saved_ratio']:.1%} saved)")
+    print(f"  answer retained   {kept}/{count}")
+    print(f"  compaction time   {elapsed / count * 1000:8.2f} ms per page")
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    run(pages, budget)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the MinHash/LSH similarity index against the old linear Jaccard scan
+
+Usage: python benchmarks/similarity_index_bench.py [sizes...]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent))
+
+from services.similarity_index import MinHashLSHIndex
+
+VOCABULARY = [f"term{i}" for i in range(50000)]
+KEYWORDS_PER_DOC = 20
+QUERIES = 200
+LINEAR_SCAN_LIMIT = 100000
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b)
+
+
+def _near_duplicate(keywords: frozenset, rng: random.Random) -> frozenset:
+    """Swap two keywords, which keeps Jaccard ~0.82 with the original"""
+    kept = rng.sample(sorted(keywords), len(keywords) - 2)
+    return frozenset(kept + rng.sample(VOCABULARY, 2))
+
+
+def run(size: int):
+    rng = random.Random(size)
+    docs = {f"v{i}": frozenset(rng.sample(VOCABULARY, KEYWORDS_PER_DOC)) for i in range(size)}
+
+    index = MinHashLSHIndex(threshold=0.7)
+    start = time.perf_counter()
+    for key, keywords in docs.items():
+        index.add(key, keywords)
+    build_s = time.perf_counter() - start
+
+    targets = rng.sample(list(docs), QUERIES)
+    queries = [_near_duplicate(docs[key], rng) for key in targets]
+
+    start = time.perf_counter()
+    hits = 0
+    for target, query in zip(targets, queries):
+        results = index.query(query, top_k=5)
+        hits += any(key == target for key, _ in results)
+    lsh_ms = (time.perf_counter() - start) * 1000 / QUERIES
+
+    print(f"\n📦 {size:,} stored verifications")
+    print(f"   build:       {build_s:.1f}s")
+    print(f"   LSH query:   {lsh_ms:.3f} ms/query (recall {hits / QUERIES:.1%})")
+
+    if size <= LINEAR_SCAN_LIMIT:
+        start = time.perf_counter()
+        for query in queries[:20]:
+            matches = [key for key, keywords in docs.items() if _jaccard(query, keywords) >= 0.7]
+            matches.sort()
+        linear_ms = (time.perf_counter() - start) * 1000 / 20
+        print(f"   linear scan: {linear_ms:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    probe = MinHashLSHIndex(threshold=0.7)
+    print(f"🔍 MinHash/LSH index: bands={probe.bands}, rows={probe.rows}")
+    for size in sizes:
+        run(size)
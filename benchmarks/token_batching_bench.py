@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark token-budget batching of passages: the old per-call encoder lookup
+against the shared encoder with encode_batch and the token count cache
+
+Usage: python benchmarks/token_batching_bench.py [passages]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import tiktoken
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent))
+
+from services import process_text
+
+SEPARATOR = "\n Next_line:"
+MAX_TOKENS = 6000
+WORDS = ("vaccine outbreak ceasefire sanctions emissions flooding heatwave treaty "
+         "hospital infection troops border drought wildfire carbon refugees").split()
+
+
+def _legacy_count_tokens(text: str) -> int:
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return len(encoding.encode(text))
+
+
+def _legacy_batch_texts_by_tokens(texts: List[str], max_tokens: int, separator: str) -> List[List[str]]:
+    batches: List[List[str]] = []
+    current_batch: List[str] = []
+    current_tokens = 0
+    sep_tokens = _legacy_count_tokens(separator)
+
+    for text in texts:
+        candidate_tokens = _legacy_count_tokens(text)
+        extra = sep_tokens if current_batch else 0
+        if current_batch and current_tokens + extra + candidate_tokens > max_tokens:
+            batches.append(current_batch)
+            current_batch = [text]
+            current_tokens = candidate_tokens
+        else:
+            if current_batch:
+                current_tokens += sep_tokens
+            current_batch.append(text)
+            current_tokens += candidate_tokens
+    if current_batch:
+        batches.append(current_batch)
+    return batches
+
+
+def _passages(count: int) -> List[str]:
+    rng = random.Random(count)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 120))) + f" ({i})"
+        for i in range(count)
+    ]
+
+
+def _timed(label: str, fn, texts: List[str]):
+    start = time.perf_counter()
+    batches = fn(texts, MAX_TOKENS, SEPARATOR)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms  {len(texts) / elapsed:10.0f} passages/s  {len(batches)} batches")
+    return batches
+
+
+def run(count: int):
+    texts = _passages(count)
+    # Load the encoding once up front so neither side pays the first download/parse
+    tiktoken.get_encoding("cl100k_base")
+
+    print(f"\n📊 {count} passages, {MAX_TOKENS}-token batches")
+    legacy = _timed("legacy (encoder per call)", _legacy_batch_texts_by_tokens, texts)
+    process_text._token_counts.clear()
+    cold = _timed("encode_batch, cold cache", process_text._batch_texts_by_tokens, texts)
+    warm = _timed("encode_batch, warm cache", process_text._batch_texts_by_tokens, texts)
+
+    if legacy == cold == warm:
+        print("  ✅ identical batches")
+    else:
+        print("  ⚠️ batches differ from the legacy implementation")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000]
+    for size in sizes:
+        run(size)
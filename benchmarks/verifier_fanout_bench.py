@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark verifier tail latency on identical inputs: one agent run over every
+passage against concurrent runs over passage groups
+
+Both modes drive the real pydantic-ai tool loop through ScheduledModel and one
+shared LLMScheduler, so concurrent requests contend for the same slots and rate
+budgets as in the server. Only the provider and the tools are simulated: a model
+request costs time per input and output token with log-normal jitter and
+occasional slow outliers, and the model searches once per passage before
+answering. Simulated seconds are scaled down and the scheduler's per-minute
+budgets scaled up to match.
+
+Usage: python benchmarks/verifier_fanout_bench.py [requests] [concurrent_requests]
+"""
+
+import asyncio
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+
+# Add the project root to Python path
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent))
+
+from agents.schema.output import FinalAgentOutput
+from configs.config import get_settings
+from models.scheduled import ScheduledModel
+from services.latency import LatencyTracker
+from services.llm_scheduler import LLMScheduler
+
+TIME_SCALE = 0.01
+FIRST_TOKEN_SECONDS = 0.8
+SECONDS_PER_INPUT_TOKEN = 0.0002
+SECONDS_PER_OUTPUT_TOKEN = 0.015
+OUTPUT_TOKENS_PER_TOOL_CALL = 30
+OUTPUT_TOKENS_PER_VERDICT = 40
+TOOL_SECONDS = 1.2
+OUTLIER_RATE = 0.05
+WORDS = ("vaccine outbreak ceasefire sanctions emissions flooding heatwave treaty "
+         "hospital infection troops border drought wildfire carbon refugees").split()
+# Stands in for the verifier's system prompt and the request summary every group repeats
+SYSTEM_PROMPT = " ".join(random.Random(0).choice(WORDS) for _ in range(1500))
+PASSAGE_LINE = re.compile(r"^(\d+)\. ", re.M)
+
+
+def _sample_inputs(requests: int) -> List[Dict[int, str]]:
+    rng = random.Random(requests)
+    inputs = []
+    for _ in range(requests):
+        passages = rng.randint(2, 12)
+        inputs.append({
+            index: " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 40)))
+            for index in range(passages)
+        })
+    return inputs
+
+
+def _simulated_seconds(rng: random.Random, base: float) -> float:
+    seconds = base * rng.lognormvariate(0, 0.35)
+    if rng.random() < OUTLIER_RATE:
+        seconds *= 3
+    return seconds * TIME_SCALE
+
+
+def _build_agent(rng: random.Random, scheduler: LLMScheduler) -> Agent:
+    async def respond(messages, info):
+        prompt = messages[0].parts[-1].content
+        passages = len(PASSAGE_LINE.findall(prompt))
+        searched = any(isinstance(part, ToolReturnPart) for message in messages for part in message.parts)
+        if not searched:
+            parts = [ToolCallPart("search_tool", {"query": f"passage {local}"}) for local in range(passages)]
+            output_tokens = OUTPUT_TOKENS_PER_TOOL_CALL * passages
+        else:
+            parts = [ToolCallPart(info.output_tools[0].name, {
+                "Correctness": True, "Out_of_domain": False, "misinfo_indices": [],
+                "rightinfo_indices": list(range(passages)), "confidence_score": "0.9", "sources": []
+            })]
+            output_tokens = OUTPUT_TOKENS_PER_VERDICT * passages
+        input_words = sum(len(str(getattr(part, "content", "")).split()) for message in messages for part in message.parts)
+        await asyncio.sleep(_simulated_seconds(
+            rng, FIRST_TOKEN_SECONDS + SECONDS_PER_INPUT_TOKEN * input_words + SECONDS_PER_OUTPUT_TOKEN * output_tokens
+        ))
+        return ModelResponse(parts=parts)
+
+    agent = Agent(
+        ScheduledModel(FunctionModel(respond), scheduler=scheduler),
+        system_prompt=SYSTEM_PROMPT,
+        output_type=FinalAgentOutput
+    )
+
+    @agent.tool_plain
+    async def search_tool(query: str) -> str:
+        await asyncio.sleep(_simulated_seconds(rng, TOOL_SECONDS))
+        return f"results for {query}"
+
+    return agent
+
+
+def _passage_groups(passages: Dict[int, str], fanout: bool) -> List[Dict[int, str]]:
+    """Same split as Claimradar_agent._passage_groups"""
+    verifier_settings = get_settings().verifier
+    if not fanout or len(passages) < verifier_settings.fanout_min_passages:
+        return [passages]
+    items = list(passages.items())
+    size = max(1, verifier_settings.fanout_group_size)
+    return [dict(items[start:start + size]) for start in range(0, len(items), size)]
+
+
+async def _verify(agent: Agent, passages: Dict[int, str], fanout: bool):
+    semaphore = asyncio.Semaphore(get_settings().verifier.fanout_concurrency)
+
+    async def run_group(group: Dict[int, str]):
+        async with semaphore:
+            numbered = "\n".join(f"{local}. {text}" for local, text in enumerate(group.values()))
+            await agent.run(f"NUMBERED PASSAGES TO ANALYZE:\n{numbered}")
+
+    async with asyncio.TaskGroup() as task_group:
+        for group in _passage_groups(passages, fanout):
+            task_group.create_task(run_group(group))
+
+
+async def run(requests: int, concurrent_requests: int):
+    llm_settings = get_settings().llm
+    verifier_settings = get_settings().verifier
+    inputs = _sample_inputs(requests)
+    tracker = LatencyTracker(window=requests)
+    print(f"\n📊 {requests} requests of 2-12 passages, {concurrent_requests} at a time "
+          f"(group size {verifier_settings.fanout_group_size}, fan-out concurrency {verifier_settings.fanout_concurrency}, "
+          f"LLM concurrency {llm_settings.max_concurrency})")
+
+    for label, fanout in (("single_run", False), ("fanout", True)):
+        # Same inputs and latency draws for both modes
+        rng = random.Random(requests)
+        scheduler = LLMScheduler(
+            max_concurrency=llm_settings.max_concurrency,
+            tokens_per_minute=llm_settings.tokens_per_minute / TIME_SCALE,
+            requests_per_minute=llm_settings.requests_per_minute / TIME_SCALE
+        )
+        agent = _build_agent(rng, scheduler)
+        gate = asyncio.Semaphore(concurrent_requests)
+
+        async def timed(passages: Dict[int, str]):
+            async with gate:
+                started = time.perf_counter()
+                await _verify(agent, passages, fanout)
+                tracker.record(label, (time.perf_counter() - started) / TIME_SCALE)
+
+        await asyncio.gather(*(timed(passages) for passages in inputs))
+
+    for label, stats in tracker.stats().items():
+        print(f"  {label:<12} p50 {stats['p50']:6.1f}s  p95 {stats['p95']:6.1f}s  "
+              f"p99 {stats['p99']:6.1f}s  max {stats['max']:6.1f}s")
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrent_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    asyncio.run(run(requests, concurrent_requests))
@@ -30,6 +30,25 @@ def load_secrets_from_json(secrets_file: str = "secrets.json") -> dict:
 # Load secrets once at module level
 _secrets = load_secrets_from_json()
 
+def _setting(section: str, key: str, env: str, default):
+    """secrets.json value, then the environment variable, then default; false and 0 are kept"""
+    value = _secrets.get(section, {}).get(key)
+    if value is None:
+        value = os.getenv(env)
+    return default if value is None or value == "" else value
+
+def _json_setting(section: str, key: str, env: str, default):
+    """Like _setting, with the environment variable holding JSON"""
+    value = _secrets.get(section, {}).get(key)
+    if value is None and os.getenv(env):
+        value = json.loads(os.getenv(env))
+    return default if value is None else value
+
+def _flag(section: str, key: str, env: str, default: bool) -> bool:
+    """Boolean setting from a JSON bool or a "1"/"true"/"yes" string"""
+    value = _setting(section, key, env, default)
+    return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+
 class DatabaseSettings(BaseSettings):
     postgres_connection_string: SecretStr = SecretStr(
         _secrets.get("database", {}).get("postgres_connection_string") or 
@@ -66,8 +85,99 @@ class Neo4jSettings(BaseSettings):
                      os.getenv("NEO4J_PASSWORD") or 
                      "password")
     database: str = (_secrets.get("neo4j", {}).get("database") or 
-                     os.getenv("NEO4J_DATABASE") or 
+                     os.getenv("NEO4J_DATABASE") or
                      "neo4j")
+    max_connection_pool_size: int = int(_setting("neo4j", "max_connection_pool_size",
+                                                 "NEO4J_MAX_CONNECTION_POOL_SIZE", 50))
+    connection_acquisition_timeout: float = float(_setting("neo4j", "connection_acquisition_timeout",
+                                                           "NEO4J_CONNECTION_ACQUISITION_TIMEOUT", 30.0))
+    max_transaction_retry_time: float = float(_setting("neo4j", "max_transaction_retry_time",
+                                                       "NEO4J_MAX_TRANSACTION_RETRY_TIME", 15.0))
+    write_batch_size: int = int(_setting("neo4j", "write_batch_size", "NEO4J_WRITE_BATCH_SIZE", 100))
+    write_flush_interval: float = float(_setting("neo4j", "write_flush_interval", "NEO4J_WRITE_FLUSH_INTERVAL", 1.0))
+    # Seconds between pulls of verifications written by other workers into the similarity index
+    similarity_refresh_interval: float = float(_setting("neo4j", "similarity_refresh_interval",
+                                                        "NEO4J_SIMILARITY_REFRESH_INTERVAL", 30.0))
+    # Also rank by keyword overlap in Neo4j when the in-process index has no match
+    similarity_db_fallback: bool = _flag("neo4j", "similarity_db_fallback", "NEO4J_SIMILARITY_DB_FALLBACK", False)
+
+class CacheSettings(BaseSettings):
+    verdict_cache_size: int = int(_setting("cache", "verdict_cache_size", "VERDICT_CACHE_SIZE", 10000))
+    verdict_cache_ttl: float = float(_setting("cache", "verdict_cache_ttl", "VERDICT_CACHE_TTL", 6 * 3600))
+    passage_cache_size: int = int(_setting("cache", "passage_cache_size", "PASSAGE_CACHE_SIZE", 50000))
+    search_cache_size: int = int(_setting("cache", "search_cache_size", "SEARCH_CACHE_SIZE", 5000))
+    search_cache_ttl: float = float(_setting("cache", "search_cache_ttl", "SEARCH_CACHE_TTL", 6 * 3600))
+    crawl_cache_dir: str = _setting("cache", "crawl_cache_dir", "CRAWL_CACHE_DIR", "data/crawl_cache")
+    crawl_cache_max_bytes: int = int(_setting("cache", "crawl_cache_max_bytes",
+                                              "CRAWL_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+    crawl_cache_ttl: float = float(_setting("cache", "crawl_cache_ttl", "CRAWL_CACHE_TTL", 24 * 3600))
+    # Per-domain TTLs in seconds; reference pages change slowly, news pages quickly
+    crawl_domain_ttls: dict = _json_setting("cache", "crawl_domain_ttls", "CRAWL_DOMAIN_TTLS", {
+        "who.int": 7 * 24 * 3600,
+        "un.org": 7 * 24 * 3600,
+        "nasa.gov": 7 * 24 * 3600,
+        "ipcc.ch": 30 * 24 * 3600,
+        "wikipedia.org": 24 * 3600,
+        "reuters.com": 3600,
+        "bbc.com": 3600,
+        "apnews.com": 3600
+    })
+
+class SearchSettings(BaseSettings):
+    connect_timeout: float = float(_setting("search", "connect_timeout", "SERPER_CONNECT_TIMEOUT", 3.0))
+    read_timeout: float = float(_setting("search", "read_timeout", "SERPER_READ_TIMEOUT", 10.0))
+    max_retries: int = int(_setting("search", "max_retries", "SERPER_MAX_RETRIES", 3))
+    backoff_base: float = float(_setting("search", "backoff_base", "SERPER_BACKOFF_BASE", 0.5))
+    max_backoff: float = float(_setting("search", "max_backoff", "SERPER_MAX_BACKOFF", 8.0))
+    max_connections: int = int(_setting("search", "max_connections", "SERPER_MAX_CONNECTIONS", 20))
+    concurrency: int = int(_setting("search", "concurrency", "SERPER_CONCURRENCY", 5))
+
+class CrawlSettings(BaseSettings):
+    max_concurrency: int = int(_setting("crawl", "max_concurrency", "CRAWL_MAX_CONCURRENCY", 8))
+    max_per_host: int = int(_setting("crawl", "max_per_host", "CRAWL_MAX_PER_HOST", 2))
+    url_timeout: float = float(_setting("crawl", "url_timeout", "CRAWL_URL_TIMEOUT", 30.0))
+    batch_timeout: float = float(_setting("crawl", "batch_timeout", "CRAWL_BATCH_TIMEOUT", 90.0))
+    # Default tokens of a crawled page handed to the model; 0 sends whole pages
+    compact_token_budget: int = int(_setting("crawl", "compact_token_budget", "CRAWL_COMPACT_TOKEN_BUDGET", 3000))
+
+class LLMSettings(BaseSettings):
+    max_concurrency: int = int(_setting("llm", "max_concurrency", "LLM_MAX_CONCURRENCY", 4))
+    tokens_per_minute: int = int(_setting("llm", "tokens_per_minute", "LLM_TOKENS_PER_MINUTE", 200000))
+    requests_per_minute: int = int(_setting("llm", "requests_per_minute", "LLM_REQUESTS_PER_MINUTE", 500))
+    output_token_estimate: int = int(_setting("llm", "output_token_estimate", "LLM_OUTPUT_TOKEN_ESTIMATE", 2048))
+    max_retries: int = int(_setting("llm", "max_retries", "LLM_MAX_RETRIES", 5))
+    backoff_base: float = float(_setting("llm", "backoff_base", "LLM_BACKOFF_BASE", 1.0))
+    max_backoff: float = float(_setting("llm", "max_backoff", "LLM_MAX_BACKOFF", 30.0))
+
+class JobSettings(BaseSettings):
+    workers: int = int(_setting("jobs", "workers", "JOB_WORKERS", 4))
+    queue_size: int = int(_setting("jobs", "queue_size", "JOB_QUEUE_SIZE", 1000))
+    # "neo4j" persists job status; "memory" keeps it in-process (tests, local runs)
+    store: str = _setting("jobs", "store", "JOB_STORE", "neo4j")
+
+class VerifierSettings(BaseSettings):
+    # Split unseen passages into groups verified by concurrent agent runs
+    fanout_enabled: bool = _flag("verifier", "fanout_enabled", "VERIFIER_FANOUT_ENABLED", True)
+    fanout_group_size: int = int(_setting("verifier", "fanout_group_size", "VERIFIER_FANOUT_GROUP_SIZE", 3))
+    fanout_concurrency: int = int(_setting("verifier", "fanout_concurrency", "VERIFIER_FANOUT_CONCURRENCY", 4))
+    # Below this many unseen passages a single run is cheaper than fanning out
+    fanout_min_passages: int = int(_setting("verifier", "fanout_min_passages", "VERIFIER_FANOUT_MIN_PASSAGES", 4))
+
+class DomainSettings(BaseSettings):
+    # Answer confidently out-of-domain inputs locally instead of running the agents
+    classifier_enabled: bool = _flag("domain", "classifier_enabled", "DOMAIN_CLASSIFIER_ENABLED", True)
+    # Out-of-domain probability at or above which the LLM is skipped; raise it to skip less
+    ood_threshold: float = float(_setting("domain", "ood_threshold", "DOMAIN_OOD_THRESHOLD", 0.9))
+    min_class_examples: int = int(_setting("domain", "min_class_examples", "DOMAIN_MIN_CLASS_EXAMPLES", 20))
+
+class EvidenceSettings(BaseSettings):
+    # Local BM25 index over crawled pages, searched before the web
+    enabled: bool = _flag("evidence", "enabled", "EVIDENCE_INDEX_ENABLED", True)
+    max_chunks: int = int(_setting("evidence", "max_chunks", "EVIDENCE_MAX_CHUNKS", 50000))
+    max_bytes: int = int(_setting("evidence", "max_bytes", "EVIDENCE_MAX_BYTES", 64 * 1024 * 1024))
+    chunk_words: int = int(_setting("evidence", "chunk_words", "EVIDENCE_CHUNK_WORDS", 200))
+    # Rebuild the index from the on-disk crawl cache at startup
+    warm_on_startup: bool = _flag("evidence", "warm_on_startup", "EVIDENCE_WARM_ON_STARTUP", True)
 
 class AppConfig(BaseSettings):
     project_name: str = "Claim Radar Application"
@@ -78,6 +188,14 @@ class AppConfig(BaseSettings):
 class Settings(BaseSettings):
     database: DatabaseSettings = DatabaseSettings()
     neo4j: Neo4jSettings = Neo4jSettings()
+    cache: CacheSettings = CacheSettings()
+    search: SearchSettings = SearchSettings()
+    crawl: CrawlSettings = CrawlSettings()
+    llm: LLMSettings = LLMSettings()
+    jobs: JobSettings = JobSettings()
+    verifier: VerifierSettings = VerifierSettings()
+    domain: DomainSettings = DomainSettings()
+    evidence: EvidenceSettings = EvidenceSettings()
     app_config: AppConfig = AppConfig()
     api_keys: APIKeys = APIKeys()
     # Add other settings as needed
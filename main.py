@@ -3,11 +3,18 @@ from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.openapi.utils import get_openapi
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.middleware.cors import CORSMiddleware
-import os, secrets, uvicorn
+import asyncio, os, secrets, uvicorn
 from configs.logfire_config import init_logging, setup_logger
 from routes import route
 from configs.config import get_settings
 from routes.route import router as ocr_router
+from services.async_neo4j_service import get_async_neo4j_service
+from agents.tools.search_tool import get_serper_client
+from services.html_cleaner import shutdown_process_pool
+from agents.core_agent import get_verifier_agent
+from agents.agent import get_summarizer_agent
+from agents.tools.evidence_index import warm_evidence_index
+from services.jobs import get_job_manager
 
 settings = get_settings()
 
@@ -54,6 +61,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def startup():
+    await get_async_neo4j_service().connect()
+    # Build the shared agents up front instead of on the first request
+    get_verifier_agent()
+    get_summarizer_agent()
+    get_job_manager().start()
+    if settings.evidence.warm_on_startup:
+        # Held on app.state so the task is not garbage collected mid-run
+        app.state.evidence_warmup = asyncio.create_task(warm_evidence_index())
+
+@app.on_event("shutdown")
+async def shutdown():
+    warmup = getattr(app.state, "evidence_warmup", None)
+    if warmup and not warmup.done():
+        warmup.cancel()
+    await get_job_manager().stop()
+    await get_async_neo4j_service().close()
+    await get_serper_client().close()
+    shutdown_process_pool()
+
 @app.get("/", status_code=200)
 def hello_world():
     return "Server is running!"
@@ -0,0 +1,57 @@
+from typing import List, Optional
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from configs.config import get_settings
+from services.llm_scheduler import LLMScheduler, get_llm_scheduler
+from services.process_text import _count_tokens_batch
+
+
+def _message_texts(messages: List[ModelMessage]) -> List[str]:
+    """Text of every prompt, tool call and tool result in a conversation"""
+    texts = []
+    for message in messages:
+        if getattr(message, "instructions", None):
+            texts.append(message.instructions)
+        for part in message.parts:
+            content = getattr(part, "content", None)
+            if content is None:
+                content = getattr(part, "args", None)
+            if content:
+                texts.append(content if isinstance(content, str) else str(content))
+    return texts
+
+
+class ScheduledModel(WrapperModel):
+    """Model whose every request goes through the LLM scheduler.
+
+    An agent run is a loop of model requests and tool calls. Scheduling each request
+    rather than the whole run holds a concurrency slot only while the provider works,
+    charges the rate buckets per request with the tokens actually sent, and retries
+    a rate-limited request without replaying the tools that came before it.
+    """
+
+    def __init__(self, wrapped: Model, scheduler: Optional[LLMScheduler] = None,
+                 output_token_estimate: Optional[int] = None):
+        super().__init__(wrapped)
+        self._scheduler = scheduler
+        self._output_token_estimate = output_token_estimate
+
+    @property
+    def scheduler(self) -> LLMScheduler:
+        return self._scheduler or get_llm_scheduler()
+
+    def estimate_tokens(self, messages: List[ModelMessage]) -> int:
+        output_estimate = self._output_token_estimate
+        if output_estimate is None:
+            output_estimate = get_settings().llm.output_token_estimate
+        texts = _message_texts(messages)
+        return (sum(_count_tokens_batch(texts)) if texts else 0) + output_estimate
+
+    async def request(self, messages: List[ModelMessage], model_settings: Optional[ModelSettings],
+                      model_request_parameters: ModelRequestParameters) -> ModelResponse:
+        return await self.scheduler.run(
+            lambda: self.wrapped.request(messages, model_settings, model_request_parameters),
+            estimated_tokens=self.estimate_tokens(messages)
+        )
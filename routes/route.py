@@ -3,15 +3,27 @@ from pydantic import Field
 from datetime import datetime
 from typing import List
 import os
-from schemas import DocumentStatus, AgentResponse
+import json
+import asyncio
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_jsonable_python
+from schemas import DocumentStatus, AgentResponse, JobStatus
 from configs.config import get_settings
-from agents.agent import Process_agent
-from agents.core_agent import Claimradar_agent
-from services.process_text import process_raw_text
+from services.pipeline import run_verification, inflight_stats
+from services.jobs import get_job_manager
+from services.async_neo4j_service import get_async_neo4j_service
+from agents.tools.webcrawl_tool import get_crawl_cache, get_page_compactor
+from agents.tools.crawler import get_crawler
+from agents.tools.evidence_index import get_evidence_index
+from agents.tools.search_tool import get_search_cache
+from services.llm_usage import get_usage_tracker
+from services.latency import get_latency_tracker
 router = APIRouter()
 
 settings = get_settings()
 
+SSE_KEEPALIVE_SECONDS = 15
+
 @router.post("/process_text", status_code=status.HTTP_201_CREATED)
 async def process(
     request: Request,
@@ -24,23 +36,118 @@ async def process(
     #text -> beautifulsoup -> .md -> LLM -> summary of the text ->system promptm + user recommended sources + Fixed recommended sources
 
     try:
-        processed_raw_texts = await process_raw_text(input_id, raw_texts)
-        process_agent = Process_agent()
-        summarized_md_path = await process_agent.summarize_texts_to_markdown(input_id=input_id, raw_texts=processed_raw_texts)
-        try:
-            agent_2 = Claimradar_agent()
-            response_data = await agent_2.claim_verifier(input_id=input_id, resources=resources, sensitivity=sensitivity, md_path=summarized_md_path, raw_texts=raw_texts)
-            
-        except Exception as e:
-            raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process raw text: {str(e)}"
-        )
+        # Cleaning, cache probes, evidence gathering and summarization run as one staged pipeline
+        response_data = await run_verification(input_id=input_id, raw_texts=raw_texts, resources=resources, sensitivity=sensitivity)
         return response_data
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process raw text: {str(e)}"
         )
-    
-   
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(to_jsonable_python(data))}\n\n"
+
+
+@router.post("/process_text/stream")
+async def process_stream(
+    raw_texts: List[str] = [],
+    input_id: str = '',
+    resources: List[str] = [],
+    sensitivity: int = 0
+):
+    """Same pipeline as /process_text, streamed as Server-Sent Events.
+
+    Emits cache_hit, out_of_domain, summarized and one passage event per verdict as it is
+    decided, then final with the aggregate result (or error).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def generate():
+        task = asyncio.create_task(run_verification(
+            input_id=input_id, raw_texts=raw_texts, resources=resources, sensitivity=sensitivity,
+            events=lambda event, data: queue.put_nowait((event, data))
+        ))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    break
+                yield _sse(*item)
+            if task.exception():
+                yield _sse("error", {"detail": f"Failed to process raw text: {task.exception()}"})
+            else:
+                yield _sse("final", task.result())
+        finally:
+            # Client went away: stop the pipeline
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED, response_model=JobStatus)
+async def submit_job(
+    raw_texts: List[str] = [],
+    input_id: str = '',
+    resources: List[str] = [],
+    sensitivity: int = 0
+):
+    """Queue a verification and return its job id immediately; poll GET /jobs/{job_id}"""
+    try:
+        return await get_job_manager().submit(input_id=input_id, raw_texts=raw_texts, resources=resources, sensitivity=sensitivity)
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job queue is full, retry later"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = await get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/verified_passages")
+async def search_verified_passages(query: str, limit: int = 10):
+    """Full-text search over passages of stored verifications"""
+    return await get_async_neo4j_service().search_verified_passages(query, limit=min(max(limit, 1), 100))
+
+
+@router.post("/domain_classifier/train")
+async def train_domain_classifier():
+    """Retrain the out-of-domain classifier on all stored verifications and return its evaluation report"""
+    report = await get_async_neo4j_service().train_domain_classifier()
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Not enough labelled verifications to train the domain classifier"
+        )
+    return report
+
+
+@router.get("/cache_stats")
+async def cache_stats():
+    return {
+        "verdict_cache": get_async_neo4j_service().verdict_cache.stats(),
+        "write_behind": get_async_neo4j_service().write_behind.stats(),
+        "crawl_cache": get_crawl_cache().stats(),
+        "search_cache": get_search_cache().stats(),
+        "crawler": get_crawler().stats(),
+        "evidence_index": get_evidence_index().stats(),
+        "page_compaction": get_page_compactor().stats(),
+        "prompt_cache": get_usage_tracker().stats(),
+        "in_flight_verifications": inflight_stats(),
+        "verifier_latency": get_latency_tracker().stats(),
+        "domain_classifier": get_async_neo4j_service().domain_classifier.stats()
+    }
@@ -9,6 +9,15 @@ class DocumentStatus(str, Enum):
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
 
+class JobStatus(BaseModel):
+    job_id: str
+    input_id: str
+    status: DocumentStatus
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
 class ContentType(str, Enum):
     PDF = "application/pdf"
 
@@ -0,0 +1,633 @@
+import asyncio
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Optional
+from neo4j import AsyncGraphDatabase, READ_ACCESS, WRITE_ACCESS
+from neo4j.exceptions import ConstraintError
+from configs.config import get_settings
+from services.domain_classifier import DomainClassifier
+from services.keyword_model import KeywordModel
+from services.lru_cache import LRUTTLCache
+from services.passage_verdicts import PassageVerdict
+from services.similarity_index import MinHashLSHIndex
+from services.write_behind import WriteBehindQueue
+from services.neo4j_queries import (
+    VerificationResult,
+    CONSTRAINTS,
+    MIGRATE_KEYWORDS_QUERY,
+    LOAD_SIMILARITY_INDEX_QUERY,
+    REFRESH_SIMILARITY_INDEX_QUERY,
+    SEED_KEYWORD_MODEL_QUERY,
+    DOMAIN_TRAINING_QUERY,
+    VERIFICATIONS_BY_ID_QUERY,
+    SIMILAR_BY_KEYWORDS_QUERY,
+    SEARCH_PASSAGES_QUERY,
+    STORE_VERIFICATION_QUERY,
+    STORE_VERIFICATIONS_BATCH_QUERY,
+    PASSAGE_VERDICTS_QUERY,
+    STORE_PASSAGE_VERDICTS_QUERY,
+    VERIFICATION_BY_HASH_QUERY,
+    VERIFICATION_BY_INPUT_HASH_QUERY,
+    STORE_JOB_QUERY,
+    JOB_BY_ID_QUERY,
+)
+
+
+async def _fetch_all(tx, query: str, params: Dict) -> List:
+    result = await tx.run(query, params)
+    return [record async for record in result]
+
+
+async def _fetch_single(tx, query: str, params: Dict):
+    result = await tx.run(query, params)
+    return await result.single()
+
+
+async def _execute(tx, query: str, params: Dict):
+    result = await tx.run(query, params)
+    return await result.consume()
+
+
+# Full-text candidates the database fallback ranks by keyword overlap
+SIMILARITY_CANDIDATES = 200
+
+# Seconds between saves of the keyword model's document frequencies
+KEYWORD_MODEL_SAVE_INTERVAL = 60
+# Seconds a verification may sit between its created_at stamp and its commit (write-behind, retries)
+WRITE_DELAY_MARGIN = 60
+
+
+class AsyncNeo4jService:
+    """Neo4j service on the async driver, safe to await from request handlers.
+
+    Queries run as managed transactions (execute_read/execute_write), which the
+    driver retries on transient errors for up to max_transaction_retry_time.
+    With a neo4j:// URI, reads are routed to followers/read replicas.
+
+    Stores go through a write-behind queue and are flushed in UNWIND batches;
+    reads consult the queue first so a stored verdict is visible immediately.
+    """
+
+    def __init__(self):
+        self.driver = None
+        self.keyword_model = KeywordModel(
+            path=Path(__file__).resolve().parents[1] / "data" / "keyword_df.npz"
+        )
+        self.similarity_index = MinHashLSHIndex(threshold=0.7)
+        domain_settings = get_settings().domain
+        self.domain_classifier = DomainClassifier(
+            path=Path(__file__).resolve().parents[1] / "data" / "domain_classifier.npz",
+            threshold=domain_settings.ood_threshold,
+            min_class_examples=domain_settings.min_class_examples
+        )
+        cache_settings = get_settings().cache
+        # L1 verdict cache keyed by text hash; keeps serving hot verdicts while Neo4j is down
+        self.verdict_cache = LRUTTLCache(
+            maxsize=cache_settings.verdict_cache_size,
+            ttl=cache_settings.verdict_cache_ttl
+        )
+        self.passage_cache = LRUTTLCache(
+            maxsize=cache_settings.passage_cache_size,
+            ttl=cache_settings.verdict_cache_ttl
+        )
+        self.settings = get_settings().neo4j
+        self._connect_lock = asyncio.Lock()
+        self._connect_attempted = False
+        self.write_behind = WriteBehindQueue(
+            self._store_batch,
+            batch_size=self.settings.write_batch_size,
+            flush_interval=self.settings.write_flush_interval
+        )
+        self._persist_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Start of the last similarity index load; later verifications are pulled in by refreshes
+        self._similarity_synced_at: Optional[datetime] = None
+
+    def extract_keywords(self, text: str) -> List[str]:
+        """Extract keywords from text using corpus-level TF-IDF"""
+        return self.extract_keywords_batch([text])[0]
+
+    def extract_keywords_batch(self, texts: List[str]) -> List[List[str]]:
+        """Extract keywords for many texts in one vectorized call"""
+        try:
+            # Clean and preprocess text
+            cleaned_texts = [(text or "").lower().strip() for text in texts]
+            return self.keyword_model.extract(cleaned_texts)
+        except Exception as e:
+            print(f"Keyword extraction error: {e}")
+            return [[] for _ in texts]
+
+    def calculate_text_hash(self, text: str) -> str:
+        """Create a hash of the raw text for exact matching"""
+        return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _escape_lucene(text: str) -> str:
+        """Escape Lucene query syntax so raw passages can be used as queries"""
+        return re.sub(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)', r'\\\1', text)
+
+    @classmethod
+    def _keyword_query(cls, keywords: List[str]) -> str:
+        """Full-text query matching any of the keywords"""
+        return " OR ".join(cls._escape_lucene(keyword) for keyword in keywords)
+
+    @staticmethod
+    def _verification_from_record(record, similarity: Optional[float] = None) -> Dict:
+        verification = {
+            'input_id': record['v.input_id'],
+            'correctness': record['v.correctness'],
+            'out_of_domain': record['v.out_of_domain'],
+            'misinfo': record['v.misinfo'],
+            'rightinfo': record['v.rightinfo'],
+            'confidence_score': record['v.confidence_score'],
+            'sources': record['v.sources'],
+            'created_at': record['v.created_at']
+        }
+        if similarity is not None:
+            verification['similarity'] = similarity
+        return verification
+
+    @staticmethod
+    def _passage_from_record(record) -> Dict:
+        return {
+            'input_id': record['node.input_id'],
+            'score': record['score'],
+            'correctness': record['node.correctness'],
+            'misinfo': record['node.misinfo'],
+            'rightinfo': record['node.rightinfo'],
+            'confidence_score': record['node.confidence_score'],
+            'sources': record['node.sources']
+        }
+
+    @staticmethod
+    def _store_params(result: VerificationResult) -> Dict:
+        return {
+            'input_id': result.input_id,
+            'keywords': list(dict.fromkeys(result.keywords)),
+            'correctness': result.correctness,
+            'out_of_domain': result.out_of_domain,
+            'misinfo': result.misinfo,
+            'rightinfo': result.rightinfo,
+            'confidence_score': result.confidence_score,
+            'sources': result.sources,
+            'created_at': result.created_at.isoformat(),
+            'raw_text_hash': result.raw_text_hash,
+            'input_hash': result.input_hash
+        }
+
+    @staticmethod
+    def _verification_from_result(result: VerificationResult, similarity: Optional[float] = None) -> Dict:
+        verification = {
+            'input_id': result.input_id,
+            'correctness': result.correctness,
+            'out_of_domain': result.out_of_domain,
+            'misinfo': result.misinfo,
+            'rightinfo': result.rightinfo,
+            'confidence_score': result.confidence_score,
+            'sources': result.sources,
+            'created_at': result.created_at.isoformat()
+        }
+        if similarity is not None:
+            verification['similarity'] = similarity
+        return verification
+
+    @staticmethod
+    def _passage_verdict_from_record(record) -> PassageVerdict:
+        return PassageVerdict(
+            passage_hash=record['p.passage_hash'],
+            text=record['p.text'],
+            is_misinfo=record['p.is_misinfo'],
+            out_of_domain=record['p.out_of_domain'],
+            confidence_score=record['p.confidence_score'],
+            sources=record['p.sources'],
+            created_at=record['p.created_at']
+        )
+
+    @staticmethod
+    def _input_cache_key(input_hash: str) -> str:
+        return f"input:{input_hash}"
+
+    def remember_input_hash(self, input_hash: Optional[str], verification: Dict):
+        """Associate a raw-input key with a verdict served from another cache tier"""
+        if input_hash and verification:
+            self.verdict_cache.set(self._input_cache_key(input_hash), dict(verification))
+
+    def _index_stored_verification(self, result: VerificationResult):
+        """Keep the in-process similarity index and keyword model in step with Neo4j"""
+        self.similarity_index.add(result.input_id, result.keywords)
+        self.keyword_model.update([f"{result.misinfo} {result.rightinfo}"])
+
+    async def connect(self) -> bool:
+        """Connect to Neo4j and prepare schema, migrations and in-process indexes"""
+        async with self._connect_lock:
+            if self._connect_attempted:
+                return self.driver is not None
+            self._connect_attempted = True
+
+            try:
+                self.driver = AsyncGraphDatabase.driver(
+                    self.settings.uri,
+                    auth=(self.settings.username, self.settings.password),
+                    max_connection_pool_size=self.settings.max_connection_pool_size,
+                    connection_acquisition_timeout=self.settings.connection_acquisition_timeout,
+                    max_transaction_retry_time=self.settings.max_transaction_retry_time
+                )
+                await self.driver.verify_connectivity()
+                print("✅ Connected to Neo4j successfully (async)")
+            except Exception as e:
+                print(f"❌ Failed to connect to Neo4j: {e}")
+                if self.driver:
+                    await self.driver.close()
+                self.driver = None
+                return False
+
+        await self._create_constraints()
+        await self._migrate_keyword_nodes()
+        await self._load_similarity_index()
+        await self._load_keyword_model()
+        await self._load_domain_classifier()
+        self.write_behind.start()
+        self._persist_task = asyncio.create_task(self._persist_keyword_model())
+        self._refresh_task = asyncio.create_task(self._refresh_similarity_index())
+        return True
+
+    async def _ensure_connected(self) -> bool:
+        if not self._connect_attempted:
+            await self.connect()
+        return self.driver is not None
+
+    def _session(self, access_mode: str):
+        return self.driver.session(database=self.settings.database, default_access_mode=access_mode)
+
+    async def _read(self, work, *args):
+        async with self._session(READ_ACCESS) as session:
+            return await session.execute_read(work, *args)
+
+    async def _write(self, work, *args):
+        async with self._session(WRITE_ACCESS) as session:
+            return await session.execute_write(work, *args)
+
+    async def _create_constraints(self):
+        """Create unique constraints for better performance"""
+        async with self._session(WRITE_ACCESS) as session:
+            for constraint in CONSTRAINTS:
+                try:
+                    result = await session.run(constraint)
+                    await result.consume()
+                except Exception as e:
+                    print(f"Constraint creation warning: {e}")
+
+    async def _migrate_keyword_nodes(self, batch_size: int = 1000):
+        """Move legacy keyword list properties onto shared Keyword nodes"""
+        try:
+            total = 0
+            while True:
+                record = await self._write(_fetch_single, MIGRATE_KEYWORDS_QUERY, {'batch_size': batch_size})
+                if not record['migrated']:
+                    break
+                total += record['migrated']
+            if total:
+                print(f"✅ Migrated keywords of {total} verifications to Keyword nodes")
+        except Exception as e:
+            print(f"Keyword migration warning: {e}")
+
+    async def _load_similarity_index(self):
+        """Rebuild the in-process similarity index from stored verifications"""
+        try:
+            self.similarity_index.clear()
+            self._similarity_synced_at = datetime.now()
+            # Streamed outside a managed transaction so large graphs are not buffered in memory
+            async with self._session(READ_ACCESS) as session:
+                result = await session.run(LOAD_SIMILARITY_INDEX_QUERY)
+                async for record in result:
+                    self.similarity_index.add(record['v.input_id'], record['keywords'])
+            print(f"✅ Loaded {len(self.similarity_index)} verifications into similarity index")
+        except Exception as e:
+            print(f"Similarity index load warning: {e}")
+
+    async def _refresh_similarity_index(self):
+        """Add verifications stored by other workers since the last load or refresh"""
+        while True:
+            await asyncio.sleep(self.settings.similarity_refresh_interval)
+            synced_at = self._similarity_synced_at or datetime.now()
+            self._similarity_synced_at = datetime.now()
+            # created_at is stamped before the write-behind flush, so look back a margin;
+            # re-adding a verification to the index is idempotent
+            since = (synced_at - timedelta(seconds=WRITE_DELAY_MARGIN)).isoformat()
+            try:
+                records = await self._read(_fetch_all, REFRESH_SIMILARITY_INDEX_QUERY, {'since': since})
+                for record in records:
+                    self.similarity_index.add(record['v.input_id'], record['keywords'])
+            except Exception as e:
+                self._similarity_synced_at = synced_at
+                print(f"Similarity index refresh warning: {e}")
+
+    async def _load_keyword_model(self, batch_size: int = 1000):
+        """Seed document frequencies from stored verifications when no saved model exists"""
+        if self.keyword_model.n_docs:
+            return
+
+        try:
+            async with self._session(READ_ACCESS) as session:
+                result = await session.run(SEED_KEYWORD_MODEL_QUERY)
+                batch = []
+                async for record in result:
+                    batch.append(record['text'])
+                    if len(batch) >= batch_size:
+                        self.keyword_model.update(batch, save=False)
+                        batch = []
+                self.keyword_model.update(batch, save=False)
+            await asyncio.to_thread(self.keyword_model.save)
+            print(f"✅ Seeded keyword model from {self.keyword_model.n_docs} verifications")
+        except Exception as e:
+            print(f"Keyword model seed warning: {e}")
+
+    async def _load_domain_classifier(self):
+        """Train the domain classifier from stored verifications when no saved model exists"""
+        if self.domain_classifier.trained or not get_settings().domain.classifier_enabled:
+            return
+        await self.train_domain_classifier()
+
+    async def train_domain_classifier(self) -> Optional[Dict]:
+        """Fit the domain classifier on every stored verification and return its evaluation report"""
+        if not await self._ensure_connected():
+            return None
+
+        try:
+            keyword_lists, labels = [], []
+            async with self._session(READ_ACCESS) as session:
+                result = await session.run(DOMAIN_TRAINING_QUERY)
+                async for record in result:
+                    keyword_lists.append(record['keywords'])
+                    labels.append(bool(record['out_of_domain']))
+            return await asyncio.to_thread(self.domain_classifier.fit, keyword_lists, labels)
+        except Exception as e:
+            print(f"Domain classifier training warning: {e}")
+            return None
+
+    async def find_similar_verifications(self, keywords: List[str], threshold: float = 0.7, top_k: int = 5) -> List[Dict]:
+        """Find similar verifications based on keyword overlap"""
+        if not keywords or not await self._ensure_connected():
+            return []
+
+        keywords = list(dict.fromkeys(keywords))
+        # The in-process index answers every lookup; other workers' verifications reach it
+        # through the periodic refresh, so a miss costs no database round trip
+        matches = self.similarity_index.query(keywords, threshold=threshold, top_k=top_k)
+        if not matches and not self.settings.similarity_db_fallback:
+            return []
+
+        try:
+            if matches:
+                similarities = dict(matches)
+                stored_verifications = []
+                # Results still waiting in the write-behind queue are served from memory
+                for input_id, similarity in matches:
+                    pending = self.write_behind.get_by_input_id(input_id)
+                    if pending:
+                        stored_verifications.append(self._verification_from_result(pending, similarity))
+                        del similarities[input_id]
+                if similarities:
+                    records = await self._read(_fetch_all, VERIFICATIONS_BY_ID_QUERY, {'input_ids': list(similarities)})
+                    stored_verifications.extend(
+                        self._verification_from_record(record, similarities[record['v.input_id']])
+                        for record in records
+                    )
+            else:
+                records = await self._read(_fetch_all, SIMILAR_BY_KEYWORDS_QUERY, {
+                    'query': self._keyword_query(keywords),
+                    'candidates': SIMILARITY_CANDIDATES,
+                    'keywords': keywords,
+                    'keyword_count': len(keywords),
+                    'threshold': threshold,
+                    'top_k': top_k
+                })
+                stored_verifications = [
+                    self._verification_from_record(record, record['similarity'])
+                    for record in records
+                ]
+
+            # Sort by similarity score
+            stored_verifications.sort(key=lambda x: x['similarity'], reverse=True)
+            return stored_verifications
+
+        except Exception as e:
+            print(f"Error finding similar verifications: {e}")
+            return []
+
+    async def search_verified_passages(self, text: str, limit: int = 10) -> List[Dict]:
+        """Full-text search over stored misinfo/rightinfo passages"""
+        if not text.strip() or not await self._ensure_connected():
+            return []
+
+        try:
+            records = await self._read(_fetch_all, SEARCH_PASSAGES_QUERY, {
+                'query': self._escape_lucene(text),
+                'limit': limit
+            })
+            return [self._passage_from_record(record) for record in records]
+        except Exception as e:
+            print(f"Error searching verified passages: {e}")
+            return []
+
+    async def store_verification(self, result: VerificationResult) -> bool:
+        """Queue verification result for a batched write to Neo4j"""
+        self.verdict_cache.set(result.raw_text_hash, self._verification_from_result(result))
+        self.remember_input_hash(result.input_hash, self._verification_from_result(result))
+        if not await self._ensure_connected():
+            return False
+
+        try:
+            if self.write_behind.running:
+                await self.write_behind.put(result)
+            else:
+                await self._write(_execute, STORE_VERIFICATION_QUERY, self._store_params(result))
+                print(f"✅ Stored verification {result.input_id} in Neo4j")
+        except Exception as e:
+            print(f"❌ Error storing verification: {e}")
+            return False
+
+        # Best effort and in memory only; the keyword model is saved on a timer
+        try:
+            self._index_stored_verification(result)
+        except Exception as e:
+            print(f"⚠️ Could not index verification {result.input_id}: {e}")
+        return True
+
+    async def _store_batch(self, results: List[VerificationResult]):
+        """Flush a write-behind batch with a single UNWIND query"""
+        rows = [self._store_params(result) for result in results]
+        try:
+            await self._write(_execute, STORE_VERIFICATIONS_BATCH_QUERY, {'rows': rows})
+        except ConstraintError:
+            # One conflicting row (e.g. a reused input_id) should not sink the whole batch
+            for row in rows:
+                try:
+                    await self._write(_execute, STORE_VERIFICATIONS_BATCH_QUERY, {'rows': [row]})
+                except ConstraintError as e:
+                    print(f"❌ Skipping verification {row['input_id']}: {e}")
+        print(f"✅ Stored {len(rows)} verifications in Neo4j")
+
+    async def get_verification_by_hash(self, text_hash: str) -> Optional[Dict]:
+        """Get verification by exact text hash match"""
+        cached = self.verdict_cache.get(text_hash)
+        if cached:
+            return dict(cached)
+
+        pending = self.write_behind.get_by_hash(text_hash)
+        if pending:
+            return self._verification_from_result(pending)
+
+        if not await self._ensure_connected():
+            return None
+
+        try:
+            record = await self._read(_fetch_single, VERIFICATION_BY_HASH_QUERY, {'text_hash': text_hash})
+            if record:
+                verification = self._verification_from_record(record)
+                self.verdict_cache.set(text_hash, verification)
+                return dict(verification)
+            return None
+
+        except Exception as e:
+            print(f"Error getting verification by hash: {e}")
+            return None
+
+    async def get_verification_by_input_hash(self, input_hash: str) -> Optional[Dict]:
+        """Get verification by canonical raw-input hash, before any summarization"""
+        cached = self.verdict_cache.get(self._input_cache_key(input_hash))
+        if cached:
+            return dict(cached)
+
+        if not await self._ensure_connected():
+            return None
+
+        try:
+            record = await self._read(_fetch_single, VERIFICATION_BY_INPUT_HASH_QUERY, {'input_hash': input_hash})
+            if record:
+                verification = self._verification_from_record(record)
+                self.remember_input_hash(input_hash, verification)
+                return dict(verification)
+            return None
+
+        except Exception as e:
+            print(f"Error getting verification by input hash: {e}")
+            return None
+
+    async def get_passage_verdicts(self, hashes: List[str]) -> Dict[str, PassageVerdict]:
+        """Look up cached per-passage verdicts by normalized passage hash"""
+        verdicts: Dict[str, PassageVerdict] = {}
+        missing = []
+        for passage_hash in dict.fromkeys(hashes):
+            cached = self.passage_cache.get(passage_hash)
+            if cached:
+                verdicts[passage_hash] = cached
+            else:
+                missing.append(passage_hash)
+
+        if not missing or not await self._ensure_connected():
+            return verdicts
+
+        try:
+            records = await self._read(_fetch_all, PASSAGE_VERDICTS_QUERY, {'hashes': missing})
+            for record in records:
+                verdict = self._passage_verdict_from_record(record)
+                self.passage_cache.set(verdict.passage_hash, verdict)
+                verdicts[verdict.passage_hash] = verdict
+        except Exception as e:
+            print(f"Error getting passage verdicts: {e}")
+        return verdicts
+
+    async def store_passage_verdicts(self, verdicts: List[PassageVerdict]) -> bool:
+        """Store per-passage verdicts so later requests can skip those passages"""
+        for verdict in verdicts:
+            self.passage_cache.set(verdict.passage_hash, verdict)
+        if not verdicts or not await self._ensure_connected():
+            return False
+
+        rows = [
+            {**verdict.model_dump(), 'created_at': verdict.created_at.isoformat()}
+            for verdict in verdicts
+        ]
+        try:
+            await self._write(_execute, STORE_PASSAGE_VERDICTS_QUERY, {'rows': rows})
+            return True
+        except Exception as e:
+            print(f"❌ Error storing passage verdicts: {e}")
+            return False
+
+    async def store_job(self, job: Dict) -> bool:
+        """Persist a job's current status; the result is stored as a JSON string"""
+        if not await self._ensure_connected():
+            return False
+        params = {
+            **job,
+            'created_at': job['created_at'].isoformat(),
+            'updated_at': job['updated_at'].isoformat(),
+            'result': json.dumps(job['result']) if job.get('result') is not None else None
+        }
+        try:
+            await self._write(_execute, STORE_JOB_QUERY, params)
+            return True
+        except Exception as e:
+            print(f"❌ Error storing job {job['job_id']}: {e}")
+            return False
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        """Load a persisted job by id"""
+        if not await self._ensure_connected():
+            return None
+        try:
+            record = await self._read(_fetch_single, JOB_BY_ID_QUERY, {'job_id': job_id})
+        except Exception as e:
+            print(f"Error getting job {job_id}: {e}")
+            return None
+        if not record:
+            return None
+        return {
+            'job_id': record['j.job_id'],
+            'input_id': record['j.input_id'],
+            'status': record['j.status'],
+            'created_at': datetime.fromisoformat(record['j.created_at']),
+            'updated_at': datetime.fromisoformat(record['j.updated_at']),
+            'result': json.loads(record['j.result']) if record['j.result'] else None,
+            'error': record['j.error']
+        }
+
+    async def _persist_keyword_model(self):
+        """Save keyword document frequencies on a timer instead of on every stored verification"""
+        while True:
+            await asyncio.sleep(KEYWORD_MODEL_SAVE_INTERVAL)
+            try:
+                await asyncio.to_thread(self.keyword_model.save_if_dirty)
+            except Exception as e:
+                print(f"Keyword model save warning: {e}")
+
+    async def close(self):
+        """Drain queued writes, persist the keyword model and close Neo4j connection"""
+        for task in (self._persist_task, self._refresh_task):
+            if task:
+                task.cancel()
+        self._persist_task = self._refresh_task = None
+        try:
+            await asyncio.to_thread(self.keyword_model.save_if_dirty)
+        except Exception as e:
+            print(f"Keyword model save warning: {e}")
+        if self.driver:
+            await self.write_behind.stop()
+            await self.driver.close()
+            self.driver = None
+
+
+# Global instance; connect() is awaited from the application startup hook
+_async_neo4j_service: Optional[AsyncNeo4jService] = None
+
+def get_async_neo4j_service() -> AsyncNeo4jService:
+    """Get the global async Neo4j service instance"""
+    global _async_neo4j_service
+    if _async_neo4j_service is None:
+        _async_neo4j_service = AsyncNeo4jService()
+    return _async_neo4j_service
@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from agents.schema.output import FinalAgentOutput
+
+# Thresholds every evaluation report covers, alongside the configured one
+REPORT_THRESHOLDS = (0.5, 0.7, 0.8, 0.9, 0.95, 0.99)
+# What the model is trained on; saved weights built from anything else are ignored
+FEATURES = "keywords"
+
+
+def evaluate(labels: Sequence[bool], probabilities: Sequence[float], thresholds: Sequence[float]) -> Dict:
+    """Score out-of-domain probabilities against known labels at each threshold.
+
+    in_domain_skipped is the costly error: an in-domain input that would get the
+    canned out-of-domain answer instead of being verified.
+    """
+    labels = np.asarray(labels, dtype=bool)
+    probabilities = np.asarray(probabilities, dtype=float)
+    in_domain = int((~labels).sum())
+    report = {
+        'examples': int(labels.size),
+        'out_of_domain': int(labels.sum()),
+        'roc_auc': float(roc_auc_score(labels, probabilities)) if 0 < labels.sum() < labels.size else None,
+        'thresholds': {}
+    }
+    for threshold in sorted(set(thresholds)):
+        skipped = probabilities >= threshold
+        true_skips = int((skipped & labels).sum())
+        report['thresholds'][f"{threshold:.2f}"] = {
+            'skipped_fraction': float(skipped.mean()) if labels.size else 0.0,
+            'precision': true_skips / int(skipped.sum()) if skipped.any() else None,
+            'recall': true_skips / int(labels.sum()) if labels.any() else None,
+            'in_domain_skipped': int((skipped & ~labels).sum()),
+            'in_domain_skipped_rate': int((skipped & ~labels).sum()) / in_domain if in_domain else 0.0
+        }
+    return report
+
+
+def out_of_domain_output(probability: float) -> FinalAgentOutput:
+    """The verifier's fixed out-of-domain answer, with the classifier's confidence"""
+    return FinalAgentOutput(
+        Correctness=True,
+        Out_of_domain=True,
+        misinfo_indices=[],
+        rightinfo_indices=[],
+        confidence_score=f"{probability:.2f}",
+        sources=[]
+    )
+
+
+def _document(keywords: Sequence[str]) -> str:
+    # Keyword order carries no meaning, so it must not change the features
+    return " ".join(sorted(set(keywords)))
+
+
+class DomainClassifier:
+    """Logistic regression over hashed keywords that flags out-of-domain inputs without an LLM call.
+
+    It is trained on the keywords stored with each verification and scores the
+    keywords extracted from a new input, so both sides use one representation.
+    Stateless hashing means only the weight vector is stored, so predictions
+    take milliseconds on CPU and the model reloads from a single .npz file.
+    """
+
+    def __init__(self, path: Optional[Path] = None, threshold: float = 0.9, n_features: int = 2 ** 18,
+                 min_class_examples: int = 20):
+        self.path = Path(path) if path else None
+        self.threshold = threshold
+        self.n_features = n_features
+        self.min_class_examples = min_class_examples
+        self._vectorizer = HashingVectorizer(
+            n_features=n_features,
+            stop_words='english',
+            ngram_range=(1, 1),
+            binary=True,
+            alternate_sign=False,
+            norm='l2'
+        )
+        self._weights: Optional[Tuple[np.ndarray, float]] = None
+        self.report: Optional[Dict] = None
+        self.trained_at: Optional[str] = None
+        self.predictions = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def trained(self) -> bool:
+        return self._weights is not None
+
+    def _load(self):
+        """Load saved weights if present"""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with np.load(self.path) as saved:
+                meta = json.loads(str(saved['meta']))
+                if saved['coef'].shape == (self.n_features,) and meta.get('features') == FEATURES:
+                    self._weights = (saved['coef'].astype(np.float64), float(saved['intercept']))
+                    self.report, self.trained_at = meta.get('report'), meta.get('trained_at')
+        except Exception as e:
+            print(f"Domain classifier load warning: {e}")
+
+    def save(self):
+        """Persist weights and the last evaluation report atomically"""
+        if not self.path or not self._weights:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        coef, intercept = self._weights
+        meta = json.dumps({'report': self.report, 'trained_at': self.trained_at, 'features': FEATURES})
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, coef=coef, intercept=intercept, meta=meta)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _estimator() -> LogisticRegression:
+        # Balanced weights: stored verifications are mostly in-domain
+        return LogisticRegression(class_weight='balanced', max_iter=1000)
+
+    def fit(self, keyword_lists: List[List[str]], labels: List[bool], save: bool = True) -> Optional[Dict]:
+        """Evaluate on a held-out split, then train on everything; returns the report or None if data is too thin"""
+        labels = np.asarray(labels, dtype=bool)
+        out_of_domain = int(labels.sum())
+        # The stratified split needs at least one example of each class on both sides
+        needed = max(self.min_class_examples, 2)
+        if min(out_of_domain, labels.size - out_of_domain) < needed:
+            print(f"⚠️ Domain classifier not trained: {out_of_domain} out-of-domain and "
+                  f"{labels.size - out_of_domain} in-domain examples, need {needed} of each")
+            return None
+
+        features = self._vectorizer.transform([_document(keywords) for keywords in keyword_lists])
+        train_x, test_x, train_y, test_y = train_test_split(
+            features, labels, test_size=max(round(labels.size * 0.25), 2), stratify=labels, random_state=0
+        )
+        held_out = self._estimator().fit(train_x, train_y)
+        report = evaluate(test_y, held_out.predict_proba(test_x)[:, 1], REPORT_THRESHOLDS + (self.threshold,))
+        report['threshold'] = self.threshold
+
+        estimator = self._estimator().fit(features, labels)
+        with self._lock:
+            self._weights = (estimator.coef_.ravel().astype(np.float64), float(estimator.intercept_[0]))
+            self.report = report
+            self.trained_at = datetime.now().isoformat()
+        if save:
+            self.save()
+        roc_auc = f"{report['roc_auc']:.3f}" if report['roc_auc'] is not None else "n/a"
+        print(f"✅ Trained domain classifier on {labels.size} verifications (held-out ROC AUC {roc_auc})")
+        return report
+
+    def probability(self, keywords: Sequence[str]) -> Optional[float]:
+        """Probability that an input with these keywords is out of domain, or None before the model is trained"""
+        weights = self._weights
+        if weights is None or not keywords:
+            return None
+        coef, intercept = weights
+        score = self._vectorizer.transform([_document(keywords)]) @ coef + intercept
+        return float(1.0 / (1.0 + np.exp(-score[0])))
+
+    def predict(self, keywords: Sequence[str]) -> Tuple[bool, Optional[float]]:
+        """Whether an input with these keywords is confidently out of domain, with the underlying probability"""
+        probability = self.probability(keywords)
+        skip = probability is not None and probability >= self.threshold
+        with self._lock:
+            self.predictions += probability is not None
+            self.skipped += skip
+        return skip, probability
+
+    def stats(self) -> Dict:
+        return {
+            'trained': self.trained,
+            'trained_at': self.trained_at,
+            'threshold': self.threshold,
+            'predictions': self.predictions,
+            'skipped': self.skipped,
+            'report': self.report
+        }
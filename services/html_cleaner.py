@@ -0,0 +1,207 @@
+import asyncio
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import List, Optional
+from bs4 import BeautifulSoup
+from bs4.builder import HTMLParserTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+# Tag rules taken from the builder BeautifulSoup(..., 'html.parser') uses, so both paths agree
+_builder = HTMLParserTreeBuilder()
+_EMPTY_ELEMENT_TAGS = frozenset(_builder.empty_element_tags or ())
+_PRESERVE_WHITESPACE_TAGS = frozenset(_builder.preserve_whitespace_tags)
+# Strings inside these tags (script, style, template, ...) are not part of get_text()
+_STRING_CONTAINER_TAGS = frozenset(_builder.string_containers)
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+_DECIMAL_REFERENCE = re.compile("^([0-9]+)(.*)")
+_HEX_REFERENCE = re.compile("^([0-9a-f]+)(.*)")
+
+# Batches above this many characters are cleaned in worker processes; a tenth of it goes to a thread
+PROCESS_POOL_MIN_CHARS = 1_000_000
+_POOL_WORKERS = os.cpu_count() or 1
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+class _TextExtractor(HTMLParser):
+    """Streams the text BeautifulSoup's get_text() would return, without building a tree.
+
+    Uses the same tokenizer as bs4's html.parser builder and mirrors its
+    tag stack, whitespace collapsing and string-container rules.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts: List[str] = []
+        self._data: List[str] = []
+        self._stack: List[str] = []
+        self._containers: List[int] = []
+        self._preserve: List[int] = []
+        self._already_closed: List[str] = []
+
+    def _end_data(self, keep: bool = True):
+        if not self._data:
+            return
+        data = "".join(self._data)
+        self._data = []
+        if not keep:
+            return
+        if not self._preserve and not data.strip(_ASCII_SPACES):
+            data = "\n" if "\n" in data else " "
+        if not self._containers:
+            self.parts.append(data)
+
+    def _push(self, tag: str):
+        self._stack.append(tag)
+        if tag in _PRESERVE_WHITESPACE_TAGS:
+            self._preserve.append(len(self._stack))
+        if tag in _STRING_CONTAINER_TAGS:
+            self._containers.append(len(self._stack))
+
+    def _pop_to(self, tag: str):
+        if tag not in self._stack:
+            return
+        while self._stack:
+            depth = len(self._stack)
+            popped = self._stack.pop()
+            if self._preserve and self._preserve[-1] == depth:
+                self._preserve.pop()
+            if self._containers and self._containers[-1] == depth:
+                self._containers.pop()
+            if popped == tag:
+                break
+
+    def handle_starttag(self, tag, attrs, handle_empty_element: bool = True):
+        self._end_data()
+        self._push(tag)
+        if tag in _EMPTY_ELEMENT_TAGS and handle_empty_element:
+            self.handle_endtag(tag, check_already_closed=False)
+            self._already_closed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag, check_already_closed=False)
+
+    def handle_endtag(self, tag, check_already_closed: bool = True):
+        if check_already_closed and tag in self._already_closed:
+            self._already_closed.remove(tag)
+            return
+        self._end_data()
+        self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        base, reference = 10, _DECIMAL_REFERENCE
+        if name.startswith(("x", "X")):
+            name, base, reference = name[1:], 16, _HEX_REFERENCE
+        extra = ""
+        try:
+            number = int(name, base)
+        except ValueError:
+            match = reference.search(name)
+            number = int(match.group(1), base) if match else None
+            extra = match.group(2) if match else name
+        if number is not None:
+            self.handle_data(UnicodeDammit.numeric_character_reference(number)[0])
+        self.handle_data(extra)
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else "&%s" % name)
+
+    def _handle_special(self, data: str, keep: bool):
+        # Comments, doctypes and processing instructions are separate strings that get_text() skips
+        self._end_data()
+        self._data.append(data)
+        self._end_data(keep=keep)
+
+    def handle_comment(self, data):
+        self._handle_special(data, keep=False)
+
+    def handle_decl(self, decl):
+        self._handle_special(decl, keep=False)
+
+    def handle_pi(self, data):
+        self._handle_special(data, keep=False)
+
+    def unknown_decl(self, data):
+        # CDATA sections are kept as text; other declarations are not
+        is_cdata = data.upper().startswith("CDATA[")
+        self._end_data()
+        self._data.append(data[len("CDATA["):] if is_cdata else data)
+        if is_cdata:
+            # CData keeps its own type even inside a string container, but is still whitespace-collapsed
+            containers, self._containers = self._containers, []
+            self._end_data()
+            self._containers = containers
+        else:
+            self._end_data(keep=False)
+
+    def text(self) -> str:
+        self._end_data()
+        return "".join(self.parts)
+
+
+def _parse_html(markup: str) -> str:
+    return BeautifulSoup(markup, 'html.parser').get_text().strip()
+
+
+def html_to_text(markup: str) -> str:
+    """Same result as BeautifulSoup(markup, 'html.parser').get_text().strip(), faster"""
+    # Without tags or entities there is nothing to parse
+    if "<" not in markup and "&" not in markup:
+        return markup.strip()
+    extractor = _TextExtractor()
+    try:
+        extractor.feed(markup)
+        extractor.close()
+    except AssertionError:
+        # Markup html.parser rejects: let BeautifulSoup raise or recover exactly as before
+        return _parse_html(markup)
+    return extractor.text().strip()
+
+
+def clean_texts(texts: List[str]) -> List[str]:
+    return [html_to_text(text) for text in texts]
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=_POOL_WORKERS)
+    return _process_pool
+
+
+async def clean_texts_async(texts: List[str]) -> List[str]:
+    """Clean texts off the event loop: inline when small, across worker processes when large"""
+    total_chars = sum(len(text) for text in texts)
+    if total_chars < PROCESS_POOL_MIN_CHARS // 10:
+        return clean_texts(texts)
+    if total_chars < PROCESS_POOL_MIN_CHARS:
+        return await asyncio.to_thread(clean_texts, texts)
+
+    pool = _get_process_pool()
+    loop = asyncio.get_running_loop()
+    # Roughly equal-sized chunks keep every worker busy
+    workers = _POOL_WORKERS
+    chunk_chars = total_chars / workers
+    chunks: List[List[str]] = [[]]
+    size = 0
+    for text in texts:
+        if size >= chunk_chars and len(chunks) < workers:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(text)
+        size += len(text)
+    results = await asyncio.gather(*[loop.run_in_executor(pool, clean_texts, chunk) for chunk in chunks])
+    return [text for chunk in results for text in chunk]
+
+
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
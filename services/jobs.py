@@ -0,0 +1,163 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from pydantic_core import to_jsonable_python
+from configs.config import get_settings
+from schemas import DocumentStatus, JobStatus
+from services.async_neo4j_service import get_async_neo4j_service
+from services.lru_cache import LRUTTLCache
+
+
+class InMemoryJobStore:
+    """Keeps job status in-process; the stand-in for tests and local runs"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 24 * 3600):
+        self._jobs = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def save(self, job: JobStatus):
+        self._jobs.set(job.job_id, job.model_dump())
+
+    async def get(self, job_id: str) -> Optional[JobStatus]:
+        job = self._jobs.get(job_id)
+        return JobStatus.model_validate(job) if job else None
+
+
+class Neo4jJobStore(InMemoryJobStore):
+    """Persists every status transition to Neo4j, keeping a local copy for fast polling"""
+
+    async def save(self, job: JobStatus):
+        await super().save(job)
+        await get_async_neo4j_service().store_job(job.model_dump())
+
+    async def get(self, job_id: str) -> Optional[JobStatus]:
+        job = await super().get(job_id)
+        if job:
+            return job
+        # Submitted to (or finished on) another worker process
+        stored = await get_async_neo4j_service().get_job(job_id)
+        return JobStatus.model_validate(stored) if stored else None
+
+
+class InMemoryJobQueue:
+    """Bounded local queue of job ids, standing in for an external broker"""
+
+    def __init__(self, maxsize: int = 1000):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, job_id: str, params: Dict):
+        """Enqueue without waiting; raises asyncio.QueueFull when the backlog is full"""
+        self._queue.put_nowait((job_id, params))
+
+    async def get(self):
+        return await self._queue.get()
+
+    def task_done(self):
+        self._queue.task_done()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class JobManager:
+    """Runs submitted verifications on a fixed pool of worker tasks.
+
+    Each job moves PENDING -> PROCESSING -> COMPLETED/FAILED, and every
+    transition is written to the job store so clients can poll it.
+    """
+
+    def __init__(self, runner: Callable[..., Awaitable[Any]], store: InMemoryJobStore,
+                 queue: InMemoryJobQueue, workers: int = 4):
+        self.runner = runner
+        self.store = store
+        self.queue = queue
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+            print(f"✅ Started {self.workers} job workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _update(self, job: JobStatus, status: DocumentStatus, **fields) -> JobStatus:
+        job = job.model_copy(update={'status': status, 'updated_at': datetime.now(), **fields})
+        try:
+            await self.store.save(job)
+        except Exception as e:
+            print(f"⚠️ Could not persist job {job.job_id} as {status.value}: {e}")
+        return job
+
+    async def submit(self, input_id: str, **params) -> JobStatus:
+        """Record a PENDING job and queue it; raises asyncio.QueueFull when saturated"""
+        now = datetime.now()
+        job = JobStatus(
+            job_id=uuid.uuid4().hex,
+            input_id=input_id,
+            status=DocumentStatus.PENDING,
+            created_at=now,
+            updated_at=now
+        )
+        # Saved before queueing so a worker never picks up a job it cannot find
+        await self.store.save(job)
+        try:
+            self.queue.put(job.job_id, {'input_id': input_id, **params})
+        except asyncio.QueueFull:
+            await self._update(job, DocumentStatus.FAILED, error="Job queue is full")
+            raise
+        return job
+
+    async def get(self, job_id: str) -> Optional[JobStatus]:
+        return await self.store.get(job_id)
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id, params = await self.queue.get()
+            try:
+                job = await self.store.get(job_id)
+                if job is None:
+                    continue
+                job = await self._update(job, DocumentStatus.PROCESSING)
+                try:
+                    result = await self.runner(**params)
+                except asyncio.CancelledError:
+                    await self._update(job, DocumentStatus.FAILED, error="Cancelled during shutdown")
+                    raise
+                except Exception as e:
+                    print(f"❌ Job {job_id} failed: {e}")
+                    await self._update(job, DocumentStatus.FAILED, error=str(e))
+                else:
+                    # Cached hits come back as dicts, fresh runs as models
+                    await self._update(job, DocumentStatus.COMPLETED, result=to_jsonable_python(result))
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'workers': len(self._tasks), 'queued': self.queue.qsize()}
+
+
+_job_manager: Optional[JobManager] = None
+
+def get_job_manager() -> JobManager:
+    """Get the process-wide job manager running the verification pipeline"""
+    global _job_manager
+    if _job_manager is None:
+        from services.pipeline import run_verification
+        job_settings = get_settings().jobs
+        store = InMemoryJobStore() if job_settings.store == "memory" else Neo4jJobStore()
+        _job_manager = JobManager(
+            runner=run_verification,
+            store=store,
+            queue=InMemoryJobQueue(maxsize=job_settings.queue_size),
+            workers=job_settings.workers
+        )
+    return _job_manager
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+
+
+def _identity(tokens: List[str]) -> List[str]:
+    return tokens
+
+
+class KeywordModel:
+    """Incremental corpus-level TF-IDF keyword extractor backed by hashed document frequencies"""
+
+    def __init__(self, path: Optional[Path] = None, n_features: int = 2 ** 18, top_n: int = 20):
+        self.path = Path(path) if path else None
+        self.n_features = n_features
+        self.top_n = top_n
+        self._analyzer = CountVectorizer(stop_words='english', ngram_range=(1, 2)).build_analyzer()
+        self._hasher = HashingVectorizer(
+            n_features=n_features,
+            analyzer=_identity,
+            alternate_sign=False,
+            norm=None
+        )
+        self.doc_freq = np.zeros(n_features, dtype=np.int32)
+        self.n_docs = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load saved document-frequency counts if present"""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with np.load(self.path) as saved:
+                if saved['doc_freq'].shape == self.doc_freq.shape:
+                    self.doc_freq = saved['doc_freq'].astype(np.int32)
+                    self.n_docs = int(saved['n_docs'])
+        except Exception as e:
+            print(f"Keyword model load warning: {e}")
+
+    def save(self):
+        """Persist document-frequency counts atomically"""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            # A temp file per write, replaced under the lock, so concurrent saves never share a path
+            with tempfile.NamedTemporaryFile(dir=self.path.parent, prefix=self.path.name, suffix=".tmp",
+                                             delete=False) as f:
+                tmp_path = f.name
+                try:
+                    np.savez(f, doc_freq=self.doc_freq, n_docs=self.n_docs)
+                except BaseException:
+                    f.close()
+                    os.unlink(tmp_path)
+                    raise
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def save_if_dirty(self):
+        """Persist only if documents were added since the last save"""
+        if self._dirty:
+            self.save()
+
+    def _tokenize(self, texts: Iterable[str]) -> List[List[str]]:
+        return [self._analyzer(text or "") for text in texts]
+
+    def update(self, texts: Iterable[str], save: bool = False):
+        """Add documents to the corpus document-frequency counts; persisted by save(), not per update"""
+        token_lists = [tokens for tokens in self._tokenize(texts) if tokens]
+        if not token_lists:
+            return
+        counts = self._hasher.transform(token_lists)
+        counts.data[:] = 1
+        with self._lock:
+            self.doc_freq += np.asarray(counts.sum(axis=0), dtype=np.int32).ravel()
+            self.n_docs += len(token_lists)
+            self._dirty = True
+        if save:
+            self.save()
+
+    def idf(self) -> np.ndarray:
+        """Smoothed IDF, matching TfidfVectorizer(smooth_idf=True)"""
+        with self._lock:
+            return np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1.0
+
+    def extract(self, texts: List[str]) -> List[List[str]]:
+        """Top TF-IDF keywords for each text, transformed in one vectorized call"""
+        token_lists = self._tokenize(texts)
+        if not any(token_lists):
+            return [[] for _ in token_lists]
+
+        tfidf = self._hasher.transform(token_lists).multiply(self.idf()).tocsr()
+
+        # Map hashed columns back to terms by hashing each distinct term once
+        vocabulary = list({token for tokens in token_lists for token in tokens})
+        columns = self._hasher.transform([[token] for token in vocabulary]).indices
+        column_terms = {}
+        for column, token in zip(columns, vocabulary):
+            column_terms.setdefault(column, token)
+
+        keywords = []
+        for row in range(tfidf.shape[0]):
+            start, end = tfidf.indptr[row], tfidf.indptr[row + 1]
+            scores = tfidf.data[start:end]
+            top = np.argsort(-scores, kind='stable')[:self.top_n]
+            keywords.append([
+                column_terms[tfidf.indices[start + i]] for i in top if scores[i] > 0
+            ])
+        return keywords
@@ -0,0 +1,44 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies per label, reported as percentiles"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(label, deque(maxlen=self.window)).append(seconds)
+
+    @staticmethod
+    def _percentile(ordered, fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {label: sorted(samples) for label, samples in self._samples.items() if samples}
+        return {
+            label: {
+                'count': len(ordered),
+                'p50': self._percentile(ordered, 0.50),
+                'p95': self._percentile(ordered, 0.95),
+                'p99': self._percentile(ordered, 0.99),
+                'max': ordered[-1]
+            }
+            for label, ordered in snapshot.items()
+        }
+
+
+_latency_tracker: Optional[LatencyTracker] = None
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the process-wide latency tracker"""
+    global _latency_tracker
+    if _latency_tracker is None:
+        _latency_tracker = LatencyTracker()
+    return _latency_tracker
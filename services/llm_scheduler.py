@@ -0,0 +1,118 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from configs.config import get_settings
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        # Serializes waiters so a large request is not starved by small ones
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1):
+        # A request larger than the bucket would wait forever; let it through on a full bucket
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True for HTTP 429 from OpenAI or pydantic-ai, whichever layer raised it"""
+    status_code = getattr(error, "status_code", None)
+    return status_code == 429 or type(error).__name__ == "RateLimitError"
+
+
+class LLMScheduler:
+    """Process-wide gate for LLM calls.
+
+    Calls wait for a concurrency slot and for room in the requests-per-minute
+    and tokens-per-minute buckets, and are retried with jittered backoff when
+    the provider still answers 429.
+    """
+
+    def __init__(self, max_concurrency: int = 4, tokens_per_minute: int = 200000,
+                 requests_per_minute: int = 500, max_retries: int = 5,
+                 backoff_base: float = 1.0, max_backoff: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._requests = TokenBucket(requests_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.in_flight = 0
+        self.waiting = 0
+        self.rate_limited = 0
+
+    def _backoff(self, attempt: int) -> float:
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay * random.uniform(0.5, 1.5), self.max_backoff)
+
+    async def run(self, call: Callable[[], Awaitable[Any]], estimated_tokens: int = 0) -> Any:
+        """Run call() once a slot and budget are free, retrying it on rate limits"""
+        for attempt in range(self.max_retries + 1):
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+            try:
+                await self._requests.acquire(1)
+                await self._tokens.acquire(estimated_tokens)
+                self.in_flight += 1
+                try:
+                    return await call()
+                finally:
+                    self.in_flight -= 1
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                self.rate_limited += 1
+                delay = self._backoff(attempt)
+                print(f"⚠️ LLM rate limited (attempt {attempt + 1}), retrying in {delay:.1f}s")
+            finally:
+                self._semaphore.release()
+            # Back off without holding a slot so other calls can proceed
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'rate_limited': self.rate_limited
+        }
+
+
+_llm_scheduler: Optional[LLMScheduler] = None
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the process-wide LLM call scheduler"""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        llm_settings = get_settings().llm
+        _llm_scheduler = LLMScheduler(
+            max_concurrency=llm_settings.max_concurrency,
+            tokens_per_minute=llm_settings.tokens_per_minute,
+            requests_per_minute=llm_settings.requests_per_minute,
+            max_retries=llm_settings.max_retries,
+            backoff_base=llm_settings.backoff_base,
+            max_backoff=llm_settings.max_backoff
+        )
+    return _llm_scheduler
@@ -0,0 +1,51 @@
+import threading
+from typing import Any, Dict, Optional
+
+
+def _input_tokens(usage: Any) -> int:
+    # pydantic-ai renamed request_tokens to input_tokens; accept either
+    return getattr(usage, "input_tokens", None) or getattr(usage, "request_tokens", None) or 0
+
+
+def _cached_tokens(usage: Any) -> int:
+    cached = getattr(usage, "cache_read_tokens", None)
+    if cached:
+        return cached
+    # Older releases only expose OpenAI's prompt_tokens_details.cached_tokens through details
+    return (getattr(usage, "details", None) or {}).get("cached_tokens", 0)
+
+
+class UsageTracker:
+    """Per-agent token totals, including how much of the prompt the provider served from its prefix cache"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._agents: Dict[str, Dict[str, int]] = {}
+
+    def record(self, agent_name: str, usage: Any):
+        input_tokens, cached_tokens = _input_tokens(usage), _cached_tokens(usage)
+        with self._lock:
+            totals = self._agents.setdefault(agent_name, {'runs': 0, 'input_tokens': 0, 'cached_tokens': 0})
+            totals['runs'] += 1
+            totals['input_tokens'] += input_tokens
+            totals['cached_tokens'] += cached_tokens
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    **totals,
+                    'cached_ratio': totals['cached_tokens'] / totals['input_tokens'] if totals['input_tokens'] else 0.0
+                }
+                for name, totals in self._agents.items()
+            }
+
+
+_usage_tracker: Optional[UsageTracker] = None
+
+def get_usage_tracker() -> UsageTracker:
+    """Get the process-wide LLM usage tracker"""
+    global _usage_tracker
+    if _usage_tracker is None:
+        _usage_tracker = UsageTracker()
+    return _usage_tracker
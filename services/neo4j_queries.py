@@ -0,0 +1,184 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class VerificationResult(BaseModel):
+    """Model for storing verification results in Neo4j"""
+    input_id: str
+    keywords: List[str]
+    correctness: bool
+    out_of_domain: bool
+    misinfo: str
+    rightinfo: str
+    confidence_score: str
+    sources: List[str]
+    created_at: datetime
+    raw_text_hash: str
+    input_hash: Optional[str] = None
+
+
+# Cypher used by AsyncNeo4jService
+CONSTRAINTS = [
+    "CREATE CONSTRAINT input_id_unique IF NOT EXISTS FOR (v:Verification) REQUIRE v.input_id IS UNIQUE",
+    "CREATE CONSTRAINT raw_text_hash_unique IF NOT EXISTS FOR (v:Verification) REQUIRE v.raw_text_hash IS UNIQUE",
+    "CREATE CONSTRAINT keyword_name_unique IF NOT EXISTS FOR (k:Keyword) REQUIRE k.name IS UNIQUE",
+    "CREATE CONSTRAINT passage_hash_unique IF NOT EXISTS FOR (p:Passage) REQUIRE p.passage_hash IS UNIQUE",
+    "CREATE INDEX verification_input_hash IF NOT EXISTS FOR (v:Verification) ON (v.input_hash)",
+    "CREATE INDEX verification_created_at IF NOT EXISTS FOR (v:Verification) ON (v.created_at)",
+    "CREATE CONSTRAINT job_id_unique IF NOT EXISTS FOR (j:Job) REQUIRE j.job_id IS UNIQUE",
+    "CREATE FULLTEXT INDEX verification_passages IF NOT EXISTS FOR (v:Verification) ON EACH [v.misinfo, v.rightinfo]"
+]
+
+MIGRATE_KEYWORDS_QUERY = """
+MATCH (v:Verification)
+WHERE v.keywords IS NOT NULL
+WITH v LIMIT $batch_size
+FOREACH (kw IN v.keywords |
+    MERGE (k:Keyword {name: kw})
+    MERGE (v)-[:HAS_KEYWORD]->(k))
+SET v.keyword_count = size(v.keywords)
+REMOVE v.keywords
+RETURN count(v) AS migrated
+"""
+
+LOAD_SIMILARITY_INDEX_QUERY = """
+MATCH (v:Verification)-[:HAS_KEYWORD]->(k:Keyword)
+RETURN v.input_id, collect(k.name) AS keywords
+"""
+
+# created_at is an ISO timestamp, so string order is time order
+REFRESH_SIMILARITY_INDEX_QUERY = """
+MATCH (v:Verification)
+WHERE v.created_at >= $since
+MATCH (v)-[:HAS_KEYWORD]->(k:Keyword)
+RETURN v.input_id, collect(k.name) AS keywords
+"""
+
+SEED_KEYWORD_MODEL_QUERY = """
+MATCH (v:Verification)
+RETURN coalesce(v.misinfo, '') + ' ' + coalesce(v.rightinfo, '') AS text
+"""
+
+DOMAIN_TRAINING_QUERY = """
+MATCH (v:Verification)
+WHERE v.out_of_domain IS NOT NULL
+MATCH (v)-[:HAS_KEYWORD]->(k:Keyword)
+WITH v, collect(k.name) AS keywords
+RETURN keywords, v.out_of_domain AS out_of_domain
+"""
+
+VERIFICATIONS_BY_ID_QUERY = """
+MATCH (v:Verification)
+WHERE v.input_id IN $input_ids
+RETURN v.input_id, v.correctness, v.out_of_domain, v.misinfo,
+       v.rightinfo, v.confidence_score, v.sources, v.created_at
+"""
+
+# Candidates come from the full-text index over verified passages, then are
+# ranked by shared Keyword nodes inside the database
+SIMILAR_BY_KEYWORDS_QUERY = """
+CALL db.index.fulltext.queryNodes('verification_passages', $query) YIELD node
+WITH node AS v LIMIT $candidates
+MATCH (v)-[:HAS_KEYWORD]->(k:Keyword)
+WHERE k.name IN $keywords
+WITH v, count(k) AS overlap
+WITH v, toFloat(overlap) / (v.keyword_count + $keyword_count - overlap) AS similarity
+WHERE similarity >= $threshold
+RETURN v.input_id, similarity, v.correctness, v.out_of_domain, v.misinfo,
+       v.rightinfo, v.confidence_score, v.sources, v.created_at
+ORDER BY similarity DESC
+LIMIT $top_k
+"""
+
+SEARCH_PASSAGES_QUERY = """
+CALL db.index.fulltext.queryNodes('verification_passages', $query) YIELD node, score
+RETURN node.input_id, node.correctness, node.misinfo, node.rightinfo,
+       node.confidence_score, node.sources, score
+LIMIT $limit
+"""
+
+STORE_VERIFICATION_QUERY = """
+CREATE (v:Verification {
+    input_id: $input_id,
+    keyword_count: size($keywords),
+    correctness: $correctness,
+    out_of_domain: $out_of_domain,
+    misinfo: $misinfo,
+    rightinfo: $rightinfo,
+    confidence_score: $confidence_score,
+    sources: $sources,
+    created_at: $created_at,
+    raw_text_hash: $raw_text_hash,
+    input_hash: $input_hash
+})
+FOREACH (kw IN $keywords |
+    MERGE (k:Keyword {name: kw})
+    MERGE (v)-[:HAS_KEYWORD]->(k))
+"""
+
+# Write-behind batches; MERGE on the hash keeps a replayed batch idempotent
+STORE_VERIFICATIONS_BATCH_QUERY = """
+UNWIND $rows AS row
+MERGE (v:Verification {raw_text_hash: row.raw_text_hash})
+ON CREATE SET
+    v.input_id = row.input_id,
+    v.keyword_count = size(row.keywords),
+    v.correctness = row.correctness,
+    v.out_of_domain = row.out_of_domain,
+    v.misinfo = row.misinfo,
+    v.rightinfo = row.rightinfo,
+    v.confidence_score = row.confidence_score,
+    v.sources = row.sources,
+    v.created_at = row.created_at,
+    v.input_hash = row.input_hash
+FOREACH (kw IN row.keywords |
+    MERGE (k:Keyword {name: kw})
+    MERGE (v)-[:HAS_KEYWORD]->(k))
+"""
+
+VERIFICATION_BY_INPUT_HASH_QUERY = """
+MATCH (v:Verification {input_hash: $input_hash})
+RETURN v.input_id, v.correctness, v.out_of_domain,
+       v.misinfo, v.rightinfo, v.confidence_score, v.sources, v.created_at
+LIMIT 1
+"""
+
+PASSAGE_VERDICTS_QUERY = """
+MATCH (p:Passage)
+WHERE p.passage_hash IN $hashes
+RETURN p.passage_hash, p.text, p.is_misinfo, p.out_of_domain,
+       p.confidence_score, p.sources, p.created_at
+"""
+
+STORE_PASSAGE_VERDICTS_QUERY = """
+UNWIND $rows AS row
+MERGE (p:Passage {passage_hash: row.passage_hash})
+SET p.text = row.text,
+    p.is_misinfo = row.is_misinfo,
+    p.out_of_domain = row.out_of_domain,
+    p.confidence_score = row.confidence_score,
+    p.sources = row.sources,
+    p.created_at = row.created_at
+"""
+
+STORE_JOB_QUERY = """
+MERGE (j:Job {job_id: $job_id})
+SET j.input_id = $input_id,
+    j.status = $status,
+    j.created_at = $created_at,
+    j.updated_at = $updated_at,
+    j.result = $result,
+    j.error = $error
+"""
+
+JOB_BY_ID_QUERY = """
+MATCH (j:Job {job_id: $job_id})
+RETURN j.job_id, j.input_id, j.status, j.created_at, j.updated_at, j.result, j.error
+"""
+
+VERIFICATION_BY_HASH_QUERY = """
+MATCH (v:Verification {raw_text_hash: $text_hash})
+RETURN v.input_id, v.correctness, v.out_of_domain,
+       v.misinfo, v.rightinfo, v.confidence_score, v.sources, v.created_at
+"""
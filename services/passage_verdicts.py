@@ -0,0 +1,118 @@
+import hashlib
+import re
+import unicodedata
+from datetime import datetime
+from typing import Dict, Iterable, List, Sequence, Tuple
+from pydantic import BaseModel
+from agents.schema.output import FinalAgentOutput
+
+
+class PassageVerdict(BaseModel):
+    """Verdict for a single normalized passage, reusable across requests"""
+    passage_hash: str
+    text: str
+    is_misinfo: bool
+    out_of_domain: bool
+    confidence_score: str
+    sources: List[str]
+    created_at: datetime
+
+
+def normalize_passage(text: str) -> str:
+    """Unicode-normalize, casefold and collapse whitespace so trivially different copies match"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+def passage_hash(text: str) -> str:
+    return hashlib.sha256(normalize_passage(text).encode("utf-8")).hexdigest()
+
+
+def distinct_passages(passages: Sequence[str], skip: Iterable[int] = ()) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
+    """Non-blank passages to verify, keyed by index, keeping the first of each repeated passage.
+
+    Also returns a map from each kept index to the later indices holding the same passage.
+    Indices in skip (e.g. already cached) are left out.
+    """
+    skip = set(skip)
+    distinct: Dict[int, str] = {}
+    duplicates: Dict[int, List[int]] = {}
+    first_index: Dict[str, int] = {}
+    for index, passage in enumerate(passages):
+        if index in skip or not normalize_passage(passage):
+            continue
+        key = passage_hash(passage)
+        if key in first_index:
+            duplicates.setdefault(first_index[key], []).append(index)
+        else:
+            first_index[key] = index
+            distinct[index] = passage
+    return distinct, duplicates
+
+
+def expand_indices(indices: Iterable[int], duplicates: Dict[int, List[int]]) -> List[int]:
+    """Indices plus the indices of their repeated copies, sorted"""
+    return sorted({position for index in indices for position in [index] + duplicates.get(index, [])})
+
+
+def _confidence(value: str) -> float:
+    try:
+        return min(max(float(value), 0.0), 1.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def merge_outputs(parts: Sequence[FinalAgentOutput], weights: Sequence[int]) -> FinalAgentOutput:
+    """Combine outputs that already use global indices into one result.
+
+    Content is correct only if every part is, and out of domain only if every
+    part is; confidence is the passage-weighted mean; sources keep first-seen order.
+    With no parts (every passage blank) the result is in domain, correct and has zero confidence.
+    """
+    total = sum(weights) or 1
+    confidence = sum(_confidence(part.confidence_score) * weight for part, weight in zip(parts, weights)) / total
+    return FinalAgentOutput(
+        Correctness=all(part.Correctness for part in parts),
+        Out_of_domain=bool(parts) and all(part.Out_of_domain for part in parts),
+        misinfo_indices=sorted({i for part in parts for i in part.misinfo_indices}),
+        rightinfo_indices=sorted({i for part in parts for i in part.rightinfo_indices}),
+        confidence_score=f"{confidence:.2f}",
+        sources=list(dict.fromkeys(source for part in parts for source in part.sources))
+    )
+
+
+def output_from_verdicts(verdicts: Dict[int, PassageVerdict]) -> FinalAgentOutput:
+    """Build an agent-shaped output from cached verdicts keyed by global passage index"""
+    parts = [
+        FinalAgentOutput(
+            Correctness=not verdict.is_misinfo,
+            Out_of_domain=verdict.out_of_domain,
+            misinfo_indices=[index] if verdict.is_misinfo else [],
+            rightinfo_indices=[] if verdict.is_misinfo else [index],
+            confidence_score=verdict.confidence_score,
+            sources=verdict.sources
+        )
+        for index, verdict in sorted(verdicts.items())
+    ]
+    return merge_outputs(parts, [1] * len(parts))
+
+
+def verdicts_from_output(output: FinalAgentOutput, passages: Dict[int, str]) -> List[PassageVerdict]:
+    """Split an agent output over the given passages into per-passage verdicts"""
+    misinfo = set(output.misinfo_indices)
+    rightinfo = set(output.rightinfo_indices)
+    now = datetime.now()
+    return [
+        PassageVerdict(
+            passage_hash=passage_hash(text),
+            text=text,
+            is_misinfo=index in misinfo,
+            out_of_domain=output.Out_of_domain,
+            confidence_score=output.confidence_score,
+            sources=output.sources,
+            created_at=now
+        )
+        for index, text in passages.items()
+        # Passages the agent left unclassified are not cached
+        if index in misinfo or index in rightinfo
+    ]
@@ -0,0 +1,161 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+from agents.agent import Process_agent
+from agents.core_agent import Claimradar_agent
+from agents.tools.crawler import get_crawler
+from agents.tools.search_tool import search_web_async
+from services.process_text import process_raw_text, canonical_input_hash
+from services.async_neo4j_service import get_async_neo4j_service
+from services.single_flight import AsyncSingleFlight
+from services.domain_classifier import out_of_domain_output
+from configs.config import get_settings
+
+# Number of top raw-text keywords that make up the speculative search query
+SPECULATIVE_QUERY_TERMS = 6
+
+# Verifications in flight, keyed by canonical input hash
+_inflight_verifications = AsyncSingleFlight()
+
+
+class StageTimer:
+    """Records how long each pipeline stage took, relative to the request start"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    async def track(self, name: str, coro):
+        began = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.stages[name] = time.perf_counter() - began
+
+    def report(self, input_id: str):
+        total = time.perf_counter() - self.start
+        stages = ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.stages.items())
+        print(f"⏱️ Pipeline for {input_id}: total={total:.2f}s ({stages})")
+
+
+async def _speculative_search(keywords_task: asyncio.Task) -> List[Dict]:
+    """Search the web on the top raw-text keywords so the verifier starts with leads"""
+    keywords = await keywords_task
+    if not keywords:
+        return []
+    return await search_web_async(" ".join(keywords[:SPECULATIVE_QUERY_TERMS]), limit=5)
+
+
+async def run_verification(input_id: str, raw_texts: List[str], resources: List[str], sensitivity: int,
+                           events: Optional[Callable[[str, Dict], None]] = None):
+    """Clean, summarize and verify raw texts as a staged async pipeline.
+
+    Everything that only needs the cleaned texts (keyword extraction, the
+    similarity probe, a speculative search and the resource prefetch) runs
+    alongside summarization, so latency tracks the longest stage.
+    events, if given, is called with (event, data) as stages finish.
+    """
+    neo4j_service = get_async_neo4j_service()
+    timer = StageTimer()
+
+    # Stage 1: HTML cleaning and the exact-input cache
+    processed_raw_texts = await timer.track("clean", process_raw_text(input_id, raw_texts))
+    input_hash = canonical_input_hash(processed_raw_texts, resources, sensitivity) if processed_raw_texts else None
+    if input_hash:
+        cached_result = await neo4j_service.get_verification_by_input_hash(input_hash)
+        if cached_result:
+            print(f"🎯 Found cached match for raw input of {input_id}")
+            if events:
+                events("cache_hit", {"level": "input"})
+            return cached_result
+
+    if not input_hash:
+        return await _summarize_and_verify(input_id, raw_texts, resources, sensitivity, events,
+                                           processed_raw_texts, input_hash, timer)
+
+    def on_join():
+        # An identical input is already being verified: wait for its result instead of rerunning
+        print(f"🔄 Coalesced {input_id} with an in-flight verification of the same input")
+        if events:
+            events("cache_hit", {"level": "in_flight"})
+
+    return await _inflight_verifications.do(input_hash, lambda: _summarize_and_verify(
+        input_id, raw_texts, resources, sensitivity, events, processed_raw_texts, input_hash, timer
+    ), on_join=on_join)
+
+
+async def _summarize_and_verify(input_id: str, raw_texts: List[str], resources: List[str], sensitivity: int,
+                                events: Optional[Callable[[str, Dict], None]], processed_raw_texts: list,
+                                input_hash: Optional[str], timer: StageTimer):
+    neo4j_service = get_async_neo4j_service()
+
+    # One cleaned passage per input text; the verifier's indices refer to this list
+    cleaned_passages = [" ".join(str(x) for x in item) for item in processed_raw_texts]
+    cleaned_text = "\n".join(cleaned_passages)
+
+    # Keywords of the cleaned input feed the domain check, the similarity probe and the speculative search
+    keywords_task = asyncio.create_task(
+        timer.track("keywords", asyncio.to_thread(neo4j_service.extract_keywords, cleaned_text))
+    )
+
+    # Confidently out-of-domain inputs get the verifier's fixed answer without any LLM call
+    if get_settings().domain.classifier_enabled:
+        # Scored on keywords, the same representation the classifier is trained on
+        out_of_domain, probability = await timer.track(
+            "domain", asyncio.to_thread(neo4j_service.domain_classifier.predict, await keywords_task)
+        )
+        if out_of_domain:
+            print(f"🎯 Classified {input_id} as out of domain locally (p={probability:.2f})")
+            if events:
+                events("out_of_domain", {"probability": round(probability, 3)})
+            timer.report(input_id)
+            return out_of_domain_output(probability)
+
+    # Stage 2: summary-independent work starts together with summarization
+    async def similarity_probe():
+        return await neo4j_service.find_similar_verifications(await keywords_task, threshold=0.7)
+
+    summary_task = asyncio.create_task(timer.track("summarize", Process_agent().summarize_texts_to_markdown(
+        input_id=input_id, raw_texts=processed_raw_texts
+    )))
+    probe_task = asyncio.create_task(timer.track("similarity_probe", similarity_probe()))
+    search_task = asyncio.create_task(timer.track("speculative_search", _speculative_search(keywords_task)))
+    # Crawl the user-trusted resources while the summary is being written
+    prefetch = asyncio.create_task(timer.track("prefetch", get_crawler().fetch_many(resources))) if resources else None
+    tasks = [keywords_task, summary_task, probe_task, search_task] + ([prefetch] if prefetch else [])
+
+    try:
+        # A similar past verification makes the summary unnecessary
+        await asyncio.wait({summary_task, probe_task}, return_when=asyncio.FIRST_COMPLETED)
+        if probe_task.done() and not probe_task.exception() and probe_task.result():
+            similar = probe_task.result()[0]
+            print(f"🎯 Found similar verification for raw input of {input_id}")
+            neo4j_service.remember_input_hash(input_hash, similar)
+            if events:
+                events("cache_hit", {"level": "raw_similarity"})
+            return similar
+
+        summarized_md_path = await summary_task
+        if events:
+            events("summarized", {"seconds": round(timer.stages.get("summarize", 0.0), 3)})
+
+        # Stage 3: verification with whatever evidence is ready
+        # The probe ran on the same keywords the verifier would extract, so both are handed over,
+        # the probe still pending if the summary finished first
+        agent_2 = Claimradar_agent()
+        return await timer.track("verify", agent_2.claim_verifier(
+            input_id=input_id, resources=resources, sensitivity=sensitivity, md_path=summarized_md_path,
+            passages=cleaned_passages, input_hash=input_hash,
+            prefetched_resources=prefetch, preliminary_search=search_task,
+            keywords=await keywords_task, similarity_probe=probe_task, events=events
+        ))
+    finally:
+        # Unused when a cache answered the request
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        timer.report(input_id)
+
+
+def inflight_stats() -> Dict[str, int]:
+    return _inflight_verifications.stats()
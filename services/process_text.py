@@ -1,29 +1,113 @@
 import asyncio
+import hashlib
+import os
 from pathlib import Path
-from typing import List
-from bs4 import BeautifulSoup
+from typing import List, Optional, Sequence, Tuple
 import tiktoken
+from services.passage_verdicts import normalize_passage
+from services.lru_cache import LRUTTLCache
+from services.html_cleaner import clean_texts_async
 
 
 async def process_raw_text(input_id: str, texts: list) -> list:
-    # text -> beautifulsoup -> parsed text list
+    # text -> html cleaner -> parsed text list
     # input_id is passed to track the list by callers; not used here
     if not isinstance(texts, list):
         raise ValueError("texts must be a list of strings")
     result = []
     if input_id:
-        for item in texts:
-            text_item = "" if item is None else str(item)
-            soup = BeautifulSoup(text_item, 'html.parser')
-            parsed_text = soup.get_text().strip()
+        text_items = ["" if item is None else str(item) for item in texts]
+        # Same text as BeautifulSoup(..., 'html.parser').get_text().strip(), off the event loop for big batches
+        for parsed_text in await clean_texts_async(text_items):
             result.append([parsed_text])
 
     return result
 
 
+def canonical_input_hash(processed_texts: list, resources: Sequence[str] = (), sensitivity: Optional[int] = None) -> str:
+    """Key for a request's cleaned texts and verification options, computed before any LLM call.
+
+    Texts keep their order because verdicts refer to passages by index;
+    resources are a set, so their order does not matter.
+    """
+    flattened = [
+        normalize_passage(" ".join(str(x) for x in item) if isinstance(item, list) else str(item))
+        for item in processed_texts
+    ]
+    canonical = "\x1e".join([
+        "\x1f".join(flattened),
+        "\x1f".join(sorted({resource.strip() for resource in resources or () if resource and resource.strip()})),
+        "" if sensitivity is None else str(sensitivity)
+    ])
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# Shared encoder and per-text token counts; both are expensive to rebuild per call
+_ENCODING_NAME = "cl100k_base"
+_encoding = None
+# encode_batch fans out over threads; more threads than cores only adds contention
+_ENCODE_THREADS = min(8, os.cpu_count() or 1)
+_token_counts = LRUTTLCache(maxsize=100000, ttl=None)
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding(_ENCODING_NAME)
+    return _encoding
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def _count_tokens_batch(texts: List[str]) -> List[int]:
+    """Token counts for texts, encoding only the ones not seen before in one encode_batch call"""
+    keys = [_text_key(text) for text in texts]
+    counts = [_token_counts.get(key) for key in keys]
+    missing = [i for i, count in enumerate(counts) if count is None]
+    if missing:
+        encoding = _get_encoding()
+        if _ENCODE_THREADS > 1:
+            encoded = encoding.encode_ordinary_batch([texts[i] for i in missing], num_threads=_ENCODE_THREADS)
+        else:
+            # On one core the thread pool is pure overhead
+            encoded = [encoding.encode_ordinary(texts[i]) for i in missing]
+        for i, tokens in zip(missing, encoded):
+            counts[i] = len(tokens)
+            _token_counts.set(keys[i], counts[i])
+    return counts
+
+
 def _count_tokens(text: str) -> int:
-    encoding = tiktoken.get_encoding("cl100k_base")
-    return len(encoding.encode(text))
+    return _count_tokens_batch([text])[0]
+
+
+def _split_text_by_tokens(text: str, max_tokens: int) -> List[Tuple[str, int]]:
+    """Cut a text that alone exceeds max_tokens into (piece, token_count) chunks"""
+    encoding = _get_encoding()
+    token_bytes = encoding.decode_tokens_bytes(encoding.encode_ordinary(text))
+
+    def decodes(start: int, end: int) -> bool:
+        try:
+            b"".join(token_bytes[start:end]).decode("utf-8")
+            return True
+        except UnicodeDecodeError:
+            return False
+
+    pieces = []
+    start = 0
+    while start < len(token_bytes):
+        # A multi-byte character can span tokens; end each piece on a character boundary
+        end = min(start + max_tokens, len(token_bytes))
+        while end > start + 1 and not decodes(start, end):
+            end -= 1
+        # No boundary inside the budget (tiny max_tokens): run on to the end of the character
+        while end < len(token_bytes) and not decodes(start, end):
+            end += 1
+        pieces.append((b"".join(token_bytes[start:end]).decode("utf-8"), end - start))
+        start = end
+    return pieces
 
 
 def _batch_texts_by_tokens(texts: List[str], max_tokens: int, separator: str) -> List[List[str]]:
@@ -32,8 +116,12 @@ def _batch_texts_by_tokens(texts: List[str], max_tokens: int, separator: str) ->
     current_tokens = 0
     sep_tokens = _count_tokens(separator)
 
-    for text in texts:
-        candidate_tokens = _count_tokens(text)
+    items: List[Tuple[str, int]] = []
+    for text, count in zip(texts, _count_tokens_batch(texts)):
+        # A single oversized text would otherwise become an over-budget batch on its own
+        items.extend(_split_text_by_tokens(text, max_tokens) if count > max_tokens else [(text, count)])
+
+    for text, candidate_tokens in items:
         extra = sep_tokens if current_batch else 0
         if current_batch and current_tokens + extra + candidate_tokens > max_tokens:
             batches.append(current_batch)
@@ -47,4 +135,3 @@ def _batch_texts_by_tokens(texts: List[str], max_tokens: int, separator: str) ->
     if current_batch:
         batches.append(current_batch)
     return batches
-
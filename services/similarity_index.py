@@ -0,0 +1,129 @@
+import hashlib
+import struct
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) minimising false positives + false negatives around the threshold"""
+
+    def _integrate(f, lo: float, hi: float, steps: int = 200) -> float:
+        step = (hi - lo) / steps
+        return sum(f(lo + (i + 0.5) * step) for i in range(steps)) * step
+
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        max_rows = num_perm // bands
+        for rows in range(1, max_rows + 1):
+            false_positive = _integrate(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+            false_negative = _integrate(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+            error = false_positive + false_negative
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashLSHIndex:
+    """In-process MinHash/LSH index over keyword sets for sub-linear Jaccard lookups"""
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 128, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(self.bands)]
+        self._keywords: Dict[str, FrozenSet[str]] = {}
+        self._band_keys: Dict[str, List[bytes]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keywords
+
+    @staticmethod
+    def _hash_keyword(keyword: str) -> int:
+        return struct.unpack("<I", hashlib.sha1(keyword.encode("utf-8")).digest()[:4])[0]
+
+    def signature(self, keywords: Iterable[str]) -> np.ndarray:
+        """Compute the MinHash signature of a keyword set"""
+        hashes = np.array([self._hash_keyword(kw) for kw in set(keywords)], dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            permuted = np.bitwise_and((np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME, _MAX_HASH)
+        return permuted.min(axis=0)
+
+    def _band_hashes(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: str, keywords: Iterable[str]) -> None:
+        """Insert or replace the keyword set stored under key"""
+        keyword_set = frozenset(keywords)
+        if not keyword_set:
+            return
+        band_keys = self._band_hashes(self.signature(keyword_set))
+        with self._lock:
+            if key in self._keywords:
+                self.remove(key)
+            for bucket, band_key in zip(self._buckets, band_keys):
+                bucket.setdefault(band_key, set()).add(key)
+            self._keywords[key] = keyword_set
+            self._band_keys[key] = band_keys
+
+    def remove(self, key: str) -> None:
+        """Drop key from the index if present"""
+        with self._lock:
+            band_keys = self._band_keys.pop(key, None)
+            self._keywords.pop(key, None)
+            if band_keys is None:
+                return
+            for bucket, band_key in zip(self._buckets, band_keys):
+                members = bucket.get(band_key)
+                if members is None:
+                    continue
+                members.discard(key)
+                if not members:
+                    del bucket[band_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets = [{} for _ in range(self.bands)]
+            self._keywords.clear()
+            self._band_keys.clear()
+
+    def query(self, keywords: Iterable[str], threshold: Optional[float] = None,
+              top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return (key, jaccard) pairs at or above threshold, best first"""
+        keyword_set = frozenset(keywords)
+        if not keyword_set:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        band_keys = self._band_hashes(self.signature(keyword_set))
+
+        with self._lock:
+            candidates: Set[str] = set()
+            for bucket, band_key in zip(self._buckets, band_keys):
+                candidates.update(bucket.get(band_key, ()))
+
+            # LSH only yields candidates; confirm them with the exact Jaccard score
+            scored = []
+            for key in candidates:
+                stored = self._keywords[key]
+                similarity = len(keyword_set & stored) / len(keyword_set | stored)
+                if similarity >= threshold:
+                    scored.append((key, similarity))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:top_k] if top_k is not None else scored
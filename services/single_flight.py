@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class AsyncSingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller (leader) runs the coroutine; callers arriving while it is
+    in flight await the same result or exception. If the leader is cancelled,
+    waiting followers retry instead of failing with its cancellation.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], on_join: Callable[[], None] = None) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            if on_join:
+                on_join()
+            try:
+                # shield: a cancelled follower must not cancel the leader's run
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.do(key, fn, on_join)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else waited for is not logged as unobserved
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {'in_flight': len(self._inflight), 'coalesced': self.coalesced}
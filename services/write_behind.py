@@ -0,0 +1,122 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+from services.neo4j_queries import VerificationResult
+
+
+class WriteBehindQueue:
+    """Buffers verification results and flushes them to Neo4j in batches.
+
+    A flush runs when batch_size results are pending or flush_interval seconds
+    have passed. Pending results stay readable through get_by_hash /
+    get_by_input_id until they are written, so callers read their own writes.
+    At most max_pending results are held; a batch that fails max_attempts
+    flushes in a row moves to dead_letters so it cannot block the queue.
+    """
+
+    def __init__(self, flush: Callable[[List[VerificationResult]], Awaitable[None]],
+                 batch_size: int = 100, flush_interval: float = 1.0, max_pending: int = 10000,
+                 max_attempts: int = 5):
+        self._flush_batch = flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._attempts: Dict[str, int] = {}
+        self.dead_letters: Deque[VerificationResult] = deque(maxlen=max_pending)
+        self.failed_flushes = 0
+        # Keyed by raw_text_hash; dicts keep insertion order, so batches go out oldest first
+        self._pending: Dict[str, VerificationResult] = {}
+        self._hash_by_input_id: Dict[str, str] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background flush loop on the running event loop"""
+        if not self.running:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, result: VerificationResult):
+        """Queue a result for the next batch; raises asyncio.QueueFull when the backlog cannot be flushed"""
+        if result.raw_text_hash not in self._pending and len(self._pending) >= self.max_pending:
+            # Backpressure: flush inline rather than growing without bound
+            await self.flush()
+            if len(self._pending) >= self.max_pending:
+                raise asyncio.QueueFull(f"{len(self._pending)} verifications already waiting for Neo4j")
+        self._pending[result.raw_text_hash] = result
+        self._hash_by_input_id[result.input_id] = result.raw_text_hash
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def get_by_hash(self, text_hash: str) -> Optional[VerificationResult]:
+        return self._pending.get(text_hash)
+
+    def get_by_input_id(self, input_id: str) -> Optional[VerificationResult]:
+        text_hash = self._hash_by_input_id.get(input_id)
+        return self._pending.get(text_hash) if text_hash else None
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _discard(self, result: VerificationResult):
+        # Only drop entries that were not replaced while the batch was in flight
+        if self._pending.get(result.raw_text_hash) is result:
+            del self._pending[result.raw_text_hash]
+            self._attempts.pop(result.raw_text_hash, None)
+            if self._hash_by_input_id.get(result.input_id) == result.raw_text_hash:
+                del self._hash_by_input_id[result.input_id]
+
+    async def flush(self):
+        """Write all pending results; failed batches are retried on later flushes, up to max_attempts"""
+        async with self._flush_lock:
+            while self._pending:
+                batch = list(self._pending.values())[:self.batch_size]
+                try:
+                    await self._flush_batch(batch)
+                except Exception as e:
+                    self.failed_flushes += 1
+                    dead = []
+                    for result in batch:
+                        attempts = self._attempts[result.raw_text_hash] = self._attempts.get(result.raw_text_hash, 0) + 1
+                        if attempts >= self.max_attempts:
+                            dead.append(result)
+                    for result in dead:
+                        self._discard(result)
+                        self.dead_letters.append(result)
+                    print(f"❌ Write-behind flush failed, {len(self._pending)} results kept queued, "
+                          f"{len(dead)} moved to dead letters: {e}")
+                    return
+                for result in batch:
+                    self._discard(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self._pending),
+            'dead_letters': len(self.dead_letters),
+            'failed_flushes': self.failed_flushes
+        }
+
+    async def stop(self):
+        """Stop the flush loop and drain everything still queued"""
+        self._closing = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+        await self.flush()
@@ -0,0 +1,85 @@
+import asyncio
+
+from services.async_neo4j_service import AsyncNeo4jService
+
+
+def _service() -> AsyncNeo4jService:
+    service = AsyncNeo4jService()
+    reads = []
+
+    async def connected():
+        return True
+
+    async def read(work, query, params):
+        reads.append((query, params))
+        return []
+
+    service._ensure_connected = connected
+    service._read = read
+    service.reads = reads
+    return service
+
+
+def test_similarity_miss_does_not_query_neo4j():
+    service = _service()
+    service.settings = service.settings.model_copy(update={'similarity_db_fallback': False})
+    service.similarity_index.add("stored", ["flood", "river", "rain", "dam"])
+
+    assert asyncio.run(service.find_similar_verifications(["football", "league", "striker"])) == []
+    assert service.reads == []
+
+
+def test_similarity_miss_can_fall_back_to_neo4j():
+    service = _service()
+    service.settings = service.settings.model_copy(update={'similarity_db_fallback': True})
+
+    assert asyncio.run(service.find_similar_verifications(["football", "league"])) == []
+    [(query, params)] = service.reads
+    # Candidates come from the full-text index over verified passages
+    assert "verification_passages" in query
+    assert params['query'] == "football OR league"
+
+
+def test_verified_passage_search_escapes_lucene_syntax():
+    service = _service()
+    assert asyncio.run(service.search_verified_passages("covid-19: (fake)?", limit=3)) == []
+    [(query, params)] = service.reads
+    assert "verification_passages" in query
+    assert params == {'query': r"covid\-19\: \(fake\)\?", 'limit': 3}
+
+
+def test_domain_classifier_trains_on_one_row_per_verification():
+    service = _service()
+    rows = [
+        {'keywords': ["flood", "river"], 'out_of_domain': False},
+        {'keywords': ["drought", "river"], 'out_of_domain': False},
+        {'keywords': ["football", "league"], 'out_of_domain': True}
+    ]
+    queries, fitted = [], []
+
+    class Result:
+        def __aiter__(self):
+            async def records():
+                for row in rows:
+                    yield row
+            return records()
+
+    class Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+        async def run(self, query):
+            queries.append(query)
+            return Result()
+
+    service._session = lambda access_mode: Session()
+    service.domain_classifier.fit = lambda keyword_lists, labels: fitted.append((keyword_lists, labels)) or {}
+
+    asyncio.run(service.train_domain_classifier())
+    [query] = queries
+    # Keywords are collected per verification, not per out_of_domain class
+    assert "WITH v, collect(k.name) AS keywords" in query
+    assert fitted == [([row['keywords'] for row in rows], [False, False, True])]
@@ -0,0 +1,44 @@
+from services.domain_classifier import DomainClassifier, evaluate
+
+IN_DOMAIN = [["flood", "rain", "river"], ["vaccine", "outbreak", "hospital"], ["wildfire", "drought", "heat"],
+             ["troops", "border", "ceasefire"]]
+OUT_OF_DOMAIN = [["football", "striker", "league"], ["album", "concert", "tour"], ["recipe", "baking", "oven"],
+                 ["smartphone", "launch", "camera"]]
+
+
+def _fit(classifier: DomainClassifier, in_domain, out_of_domain):
+    return classifier.fit(in_domain + out_of_domain, [False] * len(in_domain) + [True] * len(out_of_domain),
+                          save=False)
+
+
+def test_too_few_examples_per_class_is_not_trained():
+    classifier = DomainClassifier(min_class_examples=1)
+    # One example of a class cannot be split into train and held-out parts
+    assert _fit(classifier, IN_DOMAIN, OUT_OF_DOMAIN[:1]) is None
+    assert not classifier.trained
+    assert classifier.predict(["football"]) == (False, None)
+
+
+def test_small_balanced_data_trains():
+    classifier = DomainClassifier(min_class_examples=2, threshold=0.5)
+    report = _fit(classifier, IN_DOMAIN[:2], OUT_OF_DOMAIN[:2])
+    assert report is not None and report['examples'] == 2
+    assert classifier.trained
+
+
+def test_keyword_order_does_not_change_prediction(tmp_path):
+    classifier = DomainClassifier(path=tmp_path / "model.npz", min_class_examples=2)
+    _fit(classifier, IN_DOMAIN, OUT_OF_DOMAIN)
+    assert classifier.probability(["league", "football"]) == classifier.probability(["football", "league"])
+    assert classifier.probability(["football", "league"]) > classifier.probability(["flood", "river"])
+    assert classifier.probability([]) is None
+
+    classifier.save()
+    reloaded = DomainClassifier(path=tmp_path / "model.npz")
+    assert reloaded.probability(["football", "league"]) == classifier.probability(["football", "league"])
+
+
+def test_evaluate_without_both_classes_has_no_roc_auc():
+    report = evaluate([False, False], [0.2, 0.9], [0.5])
+    assert report['roc_auc'] is None
+    assert report['thresholds']['0.50']['in_domain_skipped'] == 1
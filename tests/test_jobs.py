@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from schemas import DocumentStatus
+from services.jobs import InMemoryJobQueue, InMemoryJobStore, JobManager
+
+
+async def _wait_for(manager: JobManager, job_id: str, status: DocumentStatus, timeout: float = 2.0):
+    async def poll():
+        while True:
+            job = await manager.get(job_id)
+            if job and job.status == status:
+                return job
+            await asyncio.sleep(0.005)
+    return await asyncio.wait_for(poll(), timeout)
+
+
+def test_job_runs_to_completion():
+    async def scenario():
+        calls = []
+
+        async def runner(**params):
+            calls.append(params)
+            return {'verdict': params['input_id']}
+
+        manager = JobManager(runner, InMemoryJobStore(), InMemoryJobQueue(), workers=2)
+        manager.start()
+        try:
+            job = await manager.submit("doc-1", sensitivity=3)
+            assert job.status == DocumentStatus.PENDING
+            done = await _wait_for(manager, job.job_id, DocumentStatus.COMPLETED)
+        finally:
+            await manager.stop()
+        return calls, done
+
+    calls, done = asyncio.run(scenario())
+    assert calls == [{'input_id': "doc-1", 'sensitivity': 3}]
+    assert done.result == {'verdict': "doc-1"}
+    assert done.updated_at >= done.created_at
+
+
+def test_failed_runner_marks_job_failed():
+    async def scenario():
+        async def runner(**params):
+            raise RuntimeError("llm down")
+
+        manager = JobManager(runner, InMemoryJobStore(), InMemoryJobQueue(), workers=1)
+        manager.start()
+        try:
+            job = await manager.submit("doc-1")
+            return await _wait_for(manager, job.job_id, DocumentStatus.FAILED)
+        finally:
+            await manager.stop()
+
+    assert asyncio.run(scenario()).error == "llm down"
+
+
+class RecordingStore(InMemoryJobStore):
+    """Job store that also keeps every saved status in order"""
+
+    def __init__(self):
+        super().__init__()
+        self.saved = []
+
+    async def save(self, job):
+        await super().save(job)
+        self.saved.append((job.input_id, job.status, job.error))
+
+
+def test_full_queue_rejects_and_records_failure():
+    async def scenario():
+        async def runner(**params):
+            return None
+
+        store = RecordingStore()
+        # Not started, so nothing drains the one-slot queue
+        manager = JobManager(runner, store, InMemoryJobQueue(maxsize=1), workers=1)
+        await manager.submit("doc-1")
+        with pytest.raises(asyncio.QueueFull):
+            await manager.submit("doc-2")
+        return store.saved, manager.stats()
+
+    saved, stats = asyncio.run(scenario())
+    assert saved == [
+        ("doc-1", DocumentStatus.PENDING, None),
+        ("doc-2", DocumentStatus.PENDING, None),
+        ("doc-2", DocumentStatus.FAILED, "Job queue is full")
+    ]
+    assert stats == {'workers': 0, 'queued': 1}
+
+
+def test_stop_marks_running_job_failed():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def runner(**params):
+            started.set()
+            await asyncio.sleep(60)
+
+        manager = JobManager(runner, InMemoryJobStore(), InMemoryJobQueue(), workers=1)
+        manager.start()
+        job = await manager.submit("doc-1")
+        await asyncio.wait_for(started.wait(), 2)
+        await manager.stop()
+        return manager, await manager.get(job.job_id)
+
+    manager, job = asyncio.run(scenario())
+    assert not manager.running
+    assert job.status == DocumentStatus.FAILED
+    assert job.error == "Cancelled during shutdown"
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+
+from services.llm_scheduler import LLMScheduler, TokenBucket, is_rate_limited
+
+
+class RateLimitError(Exception):
+    """Stand-in for the provider's 429 error, matched by class name"""
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _flaky_call(failures: int, error: Exception):
+    calls = []
+
+    async def call():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise error
+        return "ok"
+    return call, calls
+
+
+def test_token_bucket_waits_for_refill():
+    async def scenario():
+        # 1200 per minute is 20 tokens a second
+        bucket = TokenBucket(rate_per_minute=1200, capacity=2)
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire(1)
+        return time.monotonic() - started
+
+    # Two tokens come from the full bucket, two more take ~0.1s to refill
+    assert 0.08 <= asyncio.run(scenario()) < 1.0
+
+
+def test_token_bucket_lets_oversized_request_through():
+    async def scenario():
+        bucket = TokenBucket(rate_per_minute=60, capacity=10)
+        await asyncio.wait_for(bucket.acquire(1000), timeout=1)
+        return bucket.tokens
+
+    assert asyncio.run(scenario()) == pytest.approx(0, abs=0.1)
+
+
+def test_is_rate_limited():
+    assert is_rate_limited(RateLimitError())
+    assert is_rate_limited(StatusError(429))
+    assert not is_rate_limited(StatusError(500))
+    assert not is_rate_limited(ValueError())
+
+
+def test_scheduler_retries_rate_limited_calls():
+    scheduler = LLMScheduler(max_retries=3, backoff_base=0.001, max_backoff=0.01)
+    call, calls = _flaky_call(2, StatusError(429))
+    assert asyncio.run(scheduler.run(call)) == "ok"
+    assert len(calls) == 3
+    assert scheduler.rate_limited == 2
+    assert scheduler.in_flight == 0 and scheduler.waiting == 0
+
+
+def test_scheduler_gives_up_after_max_retries():
+    scheduler = LLMScheduler(max_retries=2, backoff_base=0.001, max_backoff=0.01)
+    call, calls = _flaky_call(10, RateLimitError())
+    with pytest.raises(RateLimitError):
+        asyncio.run(scheduler.run(call))
+    assert len(calls) == 3
+
+
+def test_scheduler_does_not_retry_other_errors():
+    scheduler = LLMScheduler(max_retries=3, backoff_base=0.001)
+    call, calls = _flaky_call(1, StatusError(500))
+    with pytest.raises(StatusError):
+        asyncio.run(scheduler.run(call))
+    assert len(calls) == 1
+    assert scheduler.rate_limited == 0
+
+
+def test_scheduler_bounds_concurrency():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            peak = max(peak, scheduler.in_flight)
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(scheduler.run(call) for _ in range(6)))
+        return peak
+
+    assert asyncio.run(scenario()) == 2
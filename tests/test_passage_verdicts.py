@@ -0,0 +1,61 @@
+from agents.schema.output import FinalAgentOutput
+from services.passage_verdicts import distinct_passages, expand_indices, merge_outputs, passage_hash
+
+
+def _output(correct: bool, misinfo, rightinfo, confidence: str, sources=()) -> FinalAgentOutput:
+    return FinalAgentOutput(
+        Correctness=correct,
+        Out_of_domain=False,
+        misinfo_indices=list(misinfo),
+        rightinfo_indices=list(rightinfo),
+        confidence_score=confidence,
+        sources=list(sources)
+    )
+
+
+def test_merge_combines_groups_with_weighted_confidence():
+    merged = merge_outputs(
+        [_output(True, [], [0, 1], "0.90", ["a"]), _output(False, [3], [2], "0.60", ["a", "b"])],
+        [2, 2]
+    )
+    assert merged.Correctness is False
+    assert merged.misinfo_indices == [3]
+    assert merged.rightinfo_indices == [0, 1, 2]
+    assert merged.confidence_score == "0.75"
+    assert merged.sources == ["a", "b"]
+
+
+def test_merge_with_no_parts_is_safe():
+    merged = merge_outputs([], [])
+    assert merged.Correctness is True
+    assert merged.Out_of_domain is False
+    assert merged.misinfo_indices == [] and merged.rightinfo_indices == []
+    assert merged.confidence_score == "0.00"
+
+
+def test_passage_hash_matches_trivially_different_copies():
+    assert passage_hash("  Floods  in\nTown ") == passage_hash("floods in town")
+    assert passage_hash("floods in town") != passage_hash("floods in city")
+
+
+def test_distinct_passages_skips_blank_cached_and_repeated():
+    passages = ["Floods in town", "  ", "Rain tomorrow", "floods  in TOWN", "Cached claim", "Rain tomorrow"]
+    distinct, duplicates = distinct_passages(passages, skip=[4])
+    assert distinct == {0: "Floods in town", 2: "Rain tomorrow"}
+    assert duplicates == {0: [3], 2: [5]}
+
+
+def test_fanout_merge_covers_repeated_passages():
+    passages = ["a claim", "b claim", "a claim", "", "c claim", "b claim"]
+    distinct, duplicates = distinct_passages(passages)
+    assert list(distinct) == [0, 1, 4]
+    # Two groups verified separately, already mapped to global indices
+    groups = [
+        _output(False, expand_indices([1], duplicates), expand_indices([0], duplicates), "0.80"),
+        _output(True, [], expand_indices([4], duplicates), "0.50")
+    ]
+    merged = merge_outputs(groups, [len(groups[0].misinfo_indices + groups[0].rightinfo_indices), 1])
+    assert merged.misinfo_indices == [1, 5]
+    assert merged.rightinfo_indices == [0, 2, 4]
+    assert merged.Correctness is False
+    assert merged.confidence_score == "0.74"
@@ -0,0 +1,26 @@
+import asyncio
+
+from services.process_text import canonical_input_hash, process_raw_text
+
+
+def test_process_raw_text_cleans_each_text():
+    processed = asyncio.run(process_raw_text("doc-1", ["<p>Floods in <b>town</b></p>", None]))
+    assert processed == [["Floods in town"], [""]]
+    assert asyncio.run(process_raw_text("", ["text"])) == []
+
+
+def test_input_hash_ignores_case_and_spacing():
+    assert canonical_input_hash([["Floods  in Town"]]) == canonical_input_hash([["floods in town"]])
+
+
+def test_input_hash_depends_on_passage_order():
+    assert canonical_input_hash([["first"], ["second"]]) != canonical_input_hash([["second"], ["first"]])
+
+
+def test_input_hash_depends_on_options():
+    texts = [["floods in town"]]
+    base = canonical_input_hash(texts, ["https://a.org", "https://b.org"], 3)
+    assert base == canonical_input_hash(texts, ["https://b.org", "https://a.org"], 3)
+    assert base != canonical_input_hash(texts, ["https://a.org"], 3)
+    assert base != canonical_input_hash(texts, ["https://a.org", "https://b.org"], 5)
+    assert canonical_input_hash(texts) != canonical_input_hash(texts, [], 0)
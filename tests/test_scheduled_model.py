@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+
+import models.scheduled as scheduled
+from models.scheduled import ScheduledModel
+from services.llm_scheduler import LLMScheduler
+
+
+class RateLimitError(Exception):
+    """Stand-in for the provider's 429 error, matched by class name"""
+
+
+class RecordingScheduler(LLMScheduler):
+    def __init__(self):
+        super().__init__(max_concurrency=1, backoff_base=0.001)
+        self.estimates = []
+
+    async def run(self, call, estimated_tokens: int = 0):
+        self.estimates.append(estimated_tokens)
+        return await super().run(call, estimated_tokens=estimated_tokens)
+
+
+@pytest.fixture(autouse=True)
+def word_counts(monkeypatch):
+    # Word counts stand in for tiktoken, which needs its encoding files
+    monkeypatch.setattr(scheduled, "_count_tokens_batch", lambda texts: [len(text.split()) for text in texts])
+
+
+def _tool_agent(scheduler: LLMScheduler, rate_limited_requests: int = 0):
+    """Agent whose model calls lookup once, then answers; the answering request is rate limited first"""
+    state = {"requests": 0, "tool_calls": 0, "in_flight_during_tool": None}
+
+    def respond(messages, info):
+        state["requests"] += 1
+        if len(messages) == 1:
+            return ModelResponse(parts=[ToolCallPart("lookup", {"claim": "sea levels rise"})])
+        if state["requests"] <= 1 + rate_limited_requests:
+            raise RateLimitError("429")
+        return ModelResponse(parts=[TextPart("verified")])
+
+    agent = Agent(ScheduledModel(FunctionModel(respond), scheduler=scheduler, output_token_estimate=10))
+
+    @agent.tool_plain
+    def lookup(claim: str) -> str:
+        state["tool_calls"] += 1
+        state["in_flight_during_tool"] = scheduler.in_flight
+        return "tide gauges show a rise"
+
+    return agent, state
+
+
+def test_each_model_request_is_scheduled_without_holding_a_slot_during_tools():
+    scheduler = RecordingScheduler()
+    agent, state = _tool_agent(scheduler)
+
+    result = asyncio.run(agent.run("check this claim"))
+
+    assert result.output == "verified"
+    assert len(scheduler.estimates) == 2
+    # The second request carries the tool call and its result, so it is estimated larger
+    assert scheduler.estimates[0] == 3 + 10 and scheduler.estimates[1] > scheduler.estimates[0]
+    assert state["in_flight_during_tool"] == 0
+
+
+def test_rate_limited_request_is_retried_without_replaying_tools():
+    scheduler = RecordingScheduler()
+    agent, state = _tool_agent(scheduler, rate_limited_requests=1)
+
+    result = asyncio.run(agent.run("check this claim"))
+
+    assert result.output == "verified"
+    assert state["tool_calls"] == 1
+    assert scheduler.rate_limited == 1
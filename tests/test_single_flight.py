@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from services.single_flight import AsyncSingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    async def scenario():
+        flight = AsyncSingleFlight()
+        runs, joins = [], []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.02)
+            return "verdict"
+
+        results = await asyncio.gather(*(flight.do("key", work, on_join=lambda: joins.append(1)) for _ in range(5)))
+        return flight, results, runs, joins
+
+    flight, results, runs, joins = asyncio.run(scenario())
+    assert results == ["verdict"] * 5
+    assert len(runs) == 1 and len(joins) == 4
+    assert flight.stats() == {'in_flight': 0, 'coalesced': 4}
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = AsyncSingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        return await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2)))
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_leader_exception_reaches_followers():
+    async def scenario():
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("llm failed")
+
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True), flight
+
+    results, flight = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+def test_follower_retries_when_leader_is_cancelled():
+    async def scenario():
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return len(runs)
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        # The follower becomes the new leader and runs the work itself
+        return await follower, runs, flight
+
+    result, runs, flight = asyncio.run(scenario())
+    assert result == 2 and len(runs) == 2
+    assert len(flight) == 0
+
+
+def test_cancelled_follower_does_not_cancel_leader():
+    async def scenario():
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.03)
+            return "verdict"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.005)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(scenario()) == "verdict"
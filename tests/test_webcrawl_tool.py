@@ -0,0 +1,30 @@
+import pytest
+
+import agents.tools.webcrawl_tool as webcrawl_tool
+from agents.tools.webcrawl_tool import PageCompactor, SiteDoc, strip_boilerplate
+
+
+@pytest.fixture(autouse=True)
+def word_counts(monkeypatch):
+    # Word counts stand in for tiktoken, which needs its encoding files
+    monkeypatch.setattr(webcrawl_tool, "_count_tokens_batch", lambda texts: [len(text.split()) for text in texts])
+
+
+def test_repeated_content_lines_are_kept():
+    markdown = "Did the dam fail?\n\n- Yes\n- No\n- Yes\n- No"
+    assert strip_boilerplate(markdown) == markdown
+
+
+def test_repeated_link_lines_are_dropped():
+    markdown = "[World](/world) news from the flood zone\n\nRiver levels rose overnight.\n\n[World](/world) news from the flood zone"
+    assert strip_boilerplate(markdown) == "[World](/world) news from the flood zone\n\nRiver levels rose overnight."
+
+
+def test_page_of_only_chrome_is_not_emptied():
+    markdown = "[Home](/) [World](/world) [Climate](/climate)\n\nSubscribe to our newsletter\n\nRead more"
+    doc = SiteDoc(source_url="https://example.org", markdown=markdown)
+
+    compacted = PageCompactor(token_budget=100).compact(doc, "flood")
+
+    assert compacted.markdown == markdown
+    assert compacted.metadata['compaction']['chunks_returned'] == 1
@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from services.neo4j_queries import VerificationResult
+from services.write_behind import WriteBehindQueue
+
+
+def _result(n: int) -> VerificationResult:
+    return VerificationResult(
+        input_id=f"input-{n}",
+        keywords=["flood"],
+        correctness=True,
+        out_of_domain=False,
+        misinfo="",
+        rightinfo="passage",
+        confidence_score="0.9",
+        sources=[],
+        created_at=datetime.now(),
+        raw_text_hash=f"hash-{n}"
+    )
+
+
+class FlakyStore:
+    """Flush target that fails the first `failures` calls"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches = []
+
+    async def __call__(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("neo4j unavailable")
+        self.batches.append([result.raw_text_hash for result in batch])
+
+
+def test_flush_writes_in_batches_and_serves_pending_reads():
+    async def scenario():
+        store = FlakyStore()
+        queue = WriteBehindQueue(store, batch_size=2)
+        for n in range(3):
+            await queue.put(_result(n))
+        assert queue.get_by_hash("hash-1").input_id == "input-1"
+        assert queue.get_by_input_id("input-2").raw_text_hash == "hash-2"
+        await queue.flush()
+        assert store.batches == [["hash-0", "hash-1"], ["hash-2"]]
+        assert len(queue) == 0 and queue.get_by_input_id("input-2") is None
+
+    asyncio.run(scenario())
+
+
+def test_failed_flush_keeps_results_for_retry():
+    async def scenario():
+        store = FlakyStore(failures=1)
+        queue = WriteBehindQueue(store, batch_size=10)
+        await queue.put(_result(0))
+        await queue.flush()
+        assert len(queue) == 1 and queue.stats()['failed_flushes'] == 1
+        await queue.flush()
+        assert store.batches == [["hash-0"]] and len(queue) == 0
+
+    asyncio.run(scenario())
+
+
+def test_batch_failing_max_attempts_moves_to_dead_letters():
+    async def scenario():
+        store = FlakyStore(failures=3)
+        queue = WriteBehindQueue(store, batch_size=1, max_attempts=3)
+        await queue.put(_result(0))
+        await queue.put(_result(1))
+        for _ in range(3):
+            await queue.flush()
+        # The poisoned head batch no longer blocks the one behind it
+        assert [result.raw_text_hash for result in queue.dead_letters] == ["hash-0"]
+        await queue.flush()
+        assert store.batches == [["hash-1"]] and len(queue) == 0
+
+    asyncio.run(scenario())
+
+
+def test_put_is_bounded_when_flush_fails():
+    async def scenario():
+        queue = WriteBehindQueue(FlakyStore(failures=100), batch_size=10, max_pending=2)
+        await queue.put(_result(0))
+        await queue.put(_result(1))
+        with pytest.raises(asyncio.QueueFull):
+            await queue.put(_result(2))
+        # Replacing an already queued result does not grow the queue
+        await queue.put(_result(1))
+        assert len(queue) == 2
+
+    asyncio.run(scenario())
+
+
+def test_store_verification_queues_even_if_indexing_fails():
+    from services.async_neo4j_service import AsyncNeo4jService
+
+    async def scenario():
+        service = AsyncNeo4jService()
+
+        async def connected():
+            return True
+
+        def broken_index(result):
+            raise RuntimeError("index unavailable")
+
+        service._ensure_connected = connected
+        service._index_stored_verification = broken_index
+        store = FlakyStore()
+        service.write_behind = WriteBehindQueue(store)
+        service.write_behind.start()
+        assert await service.store_verification(_result(0)) is True
+        await service.write_behind.stop()
+        assert store.batches == [["hash-0"]]
+
+    asyncio.run(scenario())